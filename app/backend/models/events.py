@@ -27,6 +27,17 @@ class ProgressUpdateEvent(BaseEvent):
     status: str
 
 
+class TimingEvent(BaseEvent):
+    """Event containing the timing of a finished graph node or ticker analysis"""
+
+    type: Literal["TIMING"] = "TIMING"
+    agent: Optional[str] = None
+    ticker: Optional[str] = None
+    kind: str
+    duration_ms: float
+    totals: Dict[str, Any]
+
+
 class ErrorEvent(BaseEvent):
     """Event indicating an error occurred"""
 
@@ -3,10 +3,11 @@ from fastapi.responses import StreamingResponse
 import asyncio
 
 from app.backend.models.schemas import ErrorResponse, HedgeFundRequest
-from app.backend.models.events import StartEvent, ProgressUpdateEvent, ErrorEvent, CompleteEvent
-from app.backend.services.graphy import create_graph, parse_hedge_fund_response, run_graph_async
+from app.backend.models.events import StartEvent, ProgressUpdateEvent, ErrorEvent, CompleteEvent, TimingEvent
+from app.backend.services.graphy import get_compiled_graph, parse_hedge_fund_response, run_graph_async
 from app.backend.services.portfolio import create_portfolio
 from src.utils.progress import progress
+from src.utils.tracing import Tracer
 
 router = APIRouter(prefix="/hedge-fund")
 
@@ -27,9 +28,8 @@ async def run_hedge_fund(request: HedgeFundRequest):
         # Create the portfolio
         portfolio = create_portfolio(request.initial_cash, request.margin_requirement, request.tickers)
 
-        # Construct agent graph
-        graph = create_graph(request.selected_agents)
-        graph = graph.compile()
+        # Get the agent graph, compiled once per selection of agents
+        graph = get_compiled_graph(request.selected_agents)
 
         # Log a test progress update for debugging
         progress.update_status("system", None, "Preparing hedge fund run")
@@ -52,6 +52,15 @@ async def run_hedge_fund(request: HedgeFundRequest):
             # Register our handler with the progress tracker
             progress.register_handler(progress_handler)
 
+            # Stream the timing of each node and ticker as it finishes
+            tracer = Tracer()
+
+            @tracer.register_handler
+            def timing_handler(span):
+                if span.kind in ("node", "ticker"):
+                    event = TimingEvent(agent=span.node, ticker=span.ticker, kind=span.kind, duration_ms=round(span.duration_ms, 3), totals=span.totals())
+                    progress_queue.put_nowait(event)
+
             try:
                 # Start the graph execution in a background task
                 run_task = asyncio.create_task(
@@ -63,6 +72,7 @@ async def run_hedge_fund(request: HedgeFundRequest):
                         end_date=request.end_date,
                         model_name=request.model_name,
                         model_provider=model_provider,
+                        tracer=tracer,
                     )
                 )
                 # Send initial message
@@ -90,6 +100,8 @@ async def run_hedge_fund(request: HedgeFundRequest):
                     data={
                         "decisions": parse_hedge_fund_response(result.get("messages", [])[-1].content),
                         "analyst_signals": result.get("data", {}).get("analyst_signals", {}),
+                        "skipped_agents": result.get("data", {}).get("skipped_agents", {}),
+                        "timing": tracer.to_dict(),
                     }
                 )
                 yield final_data.to_sse()
@@ -1,13 +1,17 @@
-import asyncio
+import functools
 import json
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
+from src.graph.prefetch import PREFETCH_NODE, create_prefetch_node
 from src.main import start
-from src.utils.analysts import ANALYST_CONFIG
+from src.utils.analysts import ANALYST_CONFIG, get_analyst_node, get_data_requirements
 from src.graph.state import AgentState
+from src.utils.parallel import run_sync
+from src.utils.tracing import Tracer, traced_node
+from src.utils.deadline import DEFAULT_RUN_TIMEOUT, deadline_scope, run_deadlines, skip_on_deadline
 
 
 # Helper function to create the agent graph
@@ -16,22 +20,23 @@ def create_graph(selected_agents: list[str]) -> StateGraph:
     graph = StateGraph(AgentState)
     graph.add_node("start_node", start)
 
-    # Get analyst nodes from the configuration
-    analyst_nodes = {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+    # Fetch the data every selected agent needs once, in parallel, before they run
+    graph.add_node(PREFETCH_NODE, traced_node(PREFETCH_NODE, skip_on_deadline(PREFETCH_NODE, create_prefetch_node(get_data_requirements(selected_agents)))))
+    graph.add_edge("start_node", PREFETCH_NODE)
 
     # Add selected analyst nodes
     for agent_name in selected_agents:
-        node_name, node_func = analyst_nodes[agent_name]
-        graph.add_node(node_name, node_func)
-        graph.add_edge("start_node", node_name)
+        node_name, node_func = get_analyst_node(agent_name)
+        graph.add_node(node_name, traced_node(node_name, skip_on_deadline(node_name, node_func)))
+        graph.add_edge(PREFETCH_NODE, node_name)
 
     # Always add risk and portfolio management (for now)
-    graph.add_node("risk_management_agent", risk_management_agent)
-    graph.add_node("portfolio_management_agent", portfolio_management_agent)
+    graph.add_node("risk_management_agent", traced_node("risk_management_agent", skip_on_deadline("risk_management_agent", risk_management_agent, deadline_key="deadline")))
+    graph.add_node("portfolio_management_agent", traced_node("portfolio_management_agent", portfolio_management_agent))
 
     # Connect selected agents to risk management
     for agent_name in selected_agents:
-        node_name = analyst_nodes[agent_name][0]
+        node_name = f"{agent_name}_agent"
         graph.add_edge(node_name, "risk_management_agent")
 
     # Connect the risk management agent to the portfolio management agent
@@ -45,13 +50,29 @@ def create_graph(selected_agents: list[str]) -> StateGraph:
     return graph
 
 
-async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider):
-    """Async wrapper for run_graph to work with asyncio."""
-    # Use run_in_executor to run the synchronous function in a separate thread
-    # so it doesn't block the event loop
-    loop = asyncio.get_running_loop()
-    result = await loop.run_in_executor(None, lambda: run_graph(graph, portfolio, tickers, start_date, end_date, model_name, model_provider))  # Use default executor
-    return result
+def get_compiled_graph(selected_agents: list[str]):
+    """Return the compiled graph for a selection of agents, compiling each distinct selection only once."""
+    return _compile_graph(frozenset(selected_agents))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_graph(selected_agents: frozenset[str]):
+    # Add nodes in the configured analyst order, whatever order the selection came in; unknown keys still fail in create_graph
+    return create_graph([key for key in ANALYST_CONFIG if key in selected_agents] + sorted(selected_agents - ANALYST_CONFIG.keys())).compile()
+
+
+async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, tracer: Tracer | None = None, timeout: float | None = DEFAULT_RUN_TIMEOUT):
+    """Run the graph on the running event loop, so concurrent runs do not each need a thread.
+
+    If a tracer is given, the run's timing spans are recorded in it. With a
+    timeout (seconds), agents that do not finish in time are skipped.
+    """
+    initial_state = _initial_state(portfolio, tickers, start_date, end_date, model_name, model_provider, timeout)
+    with deadline_scope(initial_state["metadata"]["deadline"]):
+        if tracer is None:
+            return await graph.ainvoke(initial_state)
+        with tracer.activate():
+            return await graph.ainvoke(initial_state)
 
 
 def run_graph(
@@ -62,33 +83,39 @@ def run_graph(
     end_date: str,
     model_name: str,
     model_provider: str,
+    timeout: float | None = DEFAULT_RUN_TIMEOUT,
 ) -> dict:
     """
     Run the graph with the given portfolio, tickers,
     start date, end date, show reasoning, model name,
     and model provider.
     """
-    return graph.invoke(
-        {
-            "messages": [
-                HumanMessage(
-                    content="Make trading decisions based on the provided data.",
-                )
-            ],
-            "data": {
-                "tickers": tickers,
-                "portfolio": portfolio,
-                "start_date": start_date,
-                "end_date": end_date,
-                "analyst_signals": {},
-            },
-            "metadata": {
-                "show_reasoning": False,
-                "model_name": model_name,
-                "model_provider": model_provider,
-            },
+    # The agents are async, so run the graph on an event loop of its own
+    return run_sync(run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, timeout=timeout))
+
+
+def _initial_state(portfolio: dict, tickers: list[str], start_date: str, end_date: str, model_name: str, model_provider: str, timeout: float | None) -> dict:
+    return {
+        "messages": [
+            HumanMessage(
+                content="Make trading decisions based on the provided data.",
+            )
+        ],
+        "data": {
+            "tickers": tickers,
+            "portfolio": portfolio,
+            "start_date": start_date,
+            "end_date": end_date,
+            "analyst_signals": {},
+            "skipped_agents": {},
+        },
+        "metadata": {
+            "show_reasoning": False,
+            "model_name": model_name,
+            "model_provider": model_provider,
+            **run_deadlines(timeout),
         },
-    )
+    }
 
 
 def parse_hedge_fund_response(response):
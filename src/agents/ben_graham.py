@@ -1,22 +1,47 @@
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.api import aget_financial_metrics, aget_market_cap, asearch_line_items, asearch_line_items_batch
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
 import math
 
 
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "earnings_per_share",
+    "revenue",
+    "net_income",
+    "book_value_per_share",
+    "total_assets",
+    "total_liabilities",
+    "current_assets",
+    "current_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=10),
+    DataRequest("line_items", period="annual", limit=10, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+]
+
+
 class BenGrahamSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
     reasoning: str
 
 
-def ben_graham_agent(state: AgentState):
+async def ben_graham_agent(state: AgentState):
     """
     Analyzes stocks using Benjamin Graham's classic value-investing principles:
     1. Earnings stability over multiple years.
@@ -29,17 +54,20 @@ def ben_graham_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    graham_analysis = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("ben_graham_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=10)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("ben_graham_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=10)
 
         progress.update_status("ben_graham_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(ticker, ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"], end_date, period="annual", limit=10)
+        financial_line_items = await asearch_line_items(ticker, LINE_ITEMS, end_date, period="annual", limit=10)
 
         progress.update_status("ben_graham_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         # Perform sub-analyses
         progress.update_status("ben_graham_agent", ticker, "Analyzing earnings stability")
@@ -65,29 +93,33 @@ def ben_graham_agent(state: AgentState):
 
         analysis_data[ticker] = {"signal": signal, "score": total_score, "max_score": max_possible_score, "earnings_analysis": earnings_analysis, "strength_analysis": strength_analysis, "valuation_analysis": valuation_analysis}
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("ben_graham_agent", ticker, analysis_data[ticker], bullish_at=0.7 * max_possible_score, bearish_at=0.3 * max_possible_score, complete=bool(metrics and financial_line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("ben_graham_agent", ticker, "Generating Ben Graham analysis")
-        graham_output = generate_graham_output(
+        graham_output = await generate_graham_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        graham_analysis[ticker] = {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning}
-
         progress.update_status("ben_graham_agent", ticker, "Done")
 
-    # Wrap results in a single message for the chain
-    message = HumanMessage(content=json.dumps(graham_analysis), name="ben_graham_agent")
+        return {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning, "decision_path": "llm"}
+
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("ben_graham_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    graham_analysis = dict(zip(tickers, results))
 
     # Optionally display reasoning
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(graham_analysis, "Ben Graham Agent")
 
-    # Store signals in the overall state
-    state["data"]["analyst_signals"]["ben_graham_agent"] = graham_analysis
-
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"ben_graham_agent": graham_analysis}}}
 
 
 def analyze_earnings_stability(metrics: list, financial_line_items: list) -> dict:
@@ -275,7 +307,7 @@ def analyze_valuation_graham(financial_line_items: list, market_cap: float) -> d
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_graham_output(
+async def generate_graham_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -335,7 +367,7 @@ def generate_graham_output(
     def create_default_ben_graham_signal():
         return BenGrahamSignal(signal="neutral", confidence=0.0, reasoning="Error in generating analysis; defaulting to neutral.")
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
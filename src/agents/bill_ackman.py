@@ -1,13 +1,37 @@
-from langchain_openai import ChatOpenAI
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.api import aget_financial_metrics, aget_market_cap, asearch_line_items, asearch_line_items_batch
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
+
+
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "revenue",
+    "operating_margin",
+    "debt_to_equity",
+    "free_cash_flow",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+    # Optional: intangible_assets if available
+    # "intangible_assets"
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=5),
+    DataRequest("line_items", period="annual", limit=5, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+]
 
 
 class BillAckmanSignal(BaseModel):
@@ -16,7 +40,7 @@ class BillAckmanSignal(BaseModel):
     reasoning: str
 
 
-def bill_ackman_agent(state: AgentState):
+async def bill_ackman_agent(state: AgentState):
     """
     Analyzes stocks using Bill Ackman's investing principles and LLM reasoning.
     Fetches multiple periods of data for a more robust long-term view.
@@ -27,35 +51,27 @@ def bill_ackman_agent(state: AgentState):
     tickers = data["tickers"]
     
     analysis_data = {}
-    ackman_analysis = {}
     
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("bill_ackman_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=5)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("bill_ackman_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=5)
         
         progress.update_status("bill_ackman_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust long-term view.
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "revenue",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                # Optional: intangible_assets if available
-                # "intangible_assets"
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5
         )
         
         progress.update_status("bill_ackman_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
         
         progress.update_status("bill_ackman_agent", ticker, "Analyzing business quality")
         quality_analysis = analyze_business_quality(metrics, financial_line_items)
@@ -96,39 +112,38 @@ def bill_ackman_agent(state: AgentState):
             "valuation_analysis": valuation_analysis
         }
         
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("bill_ackman_agent", ticker, analysis_data[ticker], bullish_at=0.7 * max_possible_score, bearish_at=0.3 * max_possible_score, complete=bool(metrics and financial_line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("bill_ackman_agent", ticker, "Generating Bill Ackman analysis")
-        ackman_output = generate_ackman_output(
+        ackman_output = await generate_ackman_output(
             ticker=ticker, 
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
         
-        ackman_analysis[ticker] = {
+        progress.update_status("bill_ackman_agent", ticker, "Done")
+
+        return {
             "signal": ackman_output.signal,
             "confidence": ackman_output.confidence,
-            "reasoning": ackman_output.reasoning
+            "reasoning": ackman_output.reasoning,
+            "decision_path": "llm",
         }
-        
-        progress.update_status("bill_ackman_agent", ticker, "Done")
-    
-    # Wrap results in a single message for the chain
-    message = HumanMessage(
-        content=json.dumps(ackman_analysis),
-        name="bill_ackman_agent"
-    )
-    
+
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("bill_ackman_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    ackman_analysis = dict(zip(tickers, results))
+
     # Show reasoning if requested
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(ackman_analysis, "Bill Ackman Agent")
     
-    # Add signals to the overall state
-    state["data"]["analyst_signals"]["bill_ackman_agent"] = ackman_analysis
-
-    return {
-        "messages": [message],
-        "data": state["data"]
-    }
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"bill_ackman_agent": ackman_analysis}}}
 
 
 def analyze_business_quality(metrics: list, financial_line_items: list) -> dict:
@@ -393,7 +408,7 @@ def analyze_valuation(financial_line_items: list, market_cap: float) -> dict:
     }
 
 
-def generate_ackman_output(
+async def generate_ackman_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -456,7 +471,7 @@ def generate_ackman_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt, 
         model_name=model_name, 
         model_provider=model_provider, 
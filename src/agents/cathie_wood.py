@@ -1,12 +1,39 @@
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.api import aget_financial_metrics, aget_market_cap, asearch_line_items, asearch_line_items_batch
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
+
+
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "revenue",
+    "gross_margin",
+    "operating_margin",
+    "debt_to_equity",
+    "free_cash_flow",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+    "research_and_development",
+    "capital_expenditure",
+    "operating_expense",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=5),
+    DataRequest("line_items", period="annual", limit=5, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+]
 
 
 class CathieWoodSignal(BaseModel):
@@ -15,7 +42,7 @@ class CathieWoodSignal(BaseModel):
     reasoning: str
 
 
-def cathie_wood_agent(state: AgentState):
+async def cathie_wood_agent(state: AgentState):
     """
     Analyzes stocks using Cathie Wood's investing principles and LLM reasoning.
     1. Prioritizes companies with breakthrough technologies or business models
@@ -28,37 +55,27 @@ def cathie_wood_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    cw_analysis = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("cathie_wood_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=5)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("cathie_wood_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("cathie_wood_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust view.
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "revenue",
-                "gross_margin",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                "research_and_development",
-                "capital_expenditure",
-                "operating_expense",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("cathie_wood_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         progress.update_status("cathie_wood_agent", ticker, "Analyzing disruptive potential")
         disruptive_analysis = analyze_disruptive_potential(metrics, financial_line_items)
@@ -82,26 +99,32 @@ def cathie_wood_agent(state: AgentState):
 
         analysis_data[ticker] = {"signal": signal, "score": total_score, "max_score": max_possible_score, "disruptive_analysis": disruptive_analysis, "innovation_analysis": innovation_analysis, "valuation_analysis": valuation_analysis}
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("cathie_wood_agent", ticker, analysis_data[ticker], bullish_at=0.7 * max_possible_score, bearish_at=0.3 * max_possible_score, complete=bool(metrics and financial_line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("cathie_wood_agent", ticker, "Generating Cathie Wood analysis")
-        cw_output = generate_cathie_wood_output(
+        cw_output = await generate_cathie_wood_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        cw_analysis[ticker] = {"signal": cw_output.signal, "confidence": cw_output.confidence, "reasoning": cw_output.reasoning}
-
         progress.update_status("cathie_wood_agent", ticker, "Done")
 
-    message = HumanMessage(content=json.dumps(cw_analysis), name="cathie_wood_agent")
+        return {"signal": cw_output.signal, "confidence": cw_output.confidence, "reasoning": cw_output.reasoning, "decision_path": "llm"}
+
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("cathie_wood_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    cw_analysis = dict(zip(tickers, results))
 
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(cw_analysis, "Cathie Wood Agent")
 
-    state["data"]["analyst_signals"]["cathie_wood_agent"] = cw_analysis
-
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"cathie_wood_agent": cw_analysis}}}
 
 
 def analyze_disruptive_potential(metrics: list, financial_line_items: list) -> dict:
@@ -356,7 +379,7 @@ def analyze_cathie_wood_valuation(financial_line_items: list, market_cap: float)
     return {"score": score, "details": "; ".join(details), "intrinsic_value": intrinsic_value, "margin_of_safety": margin_of_safety}
 
 
-def generate_cathie_wood_output(
+async def generate_cathie_wood_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -420,7 +443,7 @@ def generate_cathie_wood_output(
     def create_default_cathie_wood_signal():
         return CathieWoodSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -1,12 +1,43 @@
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items, get_insider_trades, get_company_news
+from src.tools.api import aget_financial_metrics, aget_market_cap, asearch_line_items, asearch_line_items_batch, aget_insider_trades, aget_company_news
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
+
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "revenue",
+    "net_income",
+    "operating_income",
+    "return_on_invested_capital",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+    "research_and_development",
+    "goodwill_and_intangible_assets",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=10),
+    DataRequest("line_items", period="annual", limit=10, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+    DataRequest("insider_trades", limit=100),
+    DataRequest("company_news", limit=100),
+]
+
 
 class CharlieMungerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
@@ -14,7 +45,7 @@ class CharlieMungerSignal(BaseModel):
     reasoning: str
 
 
-def charlie_munger_agent(state: AgentState):
+async def charlie_munger_agent(state: AgentState):
     """
     Analyzes stocks using Charlie Munger's investing principles and mental models.
     Focuses on moat strength, management quality, predictability, and valuation.
@@ -24,42 +55,30 @@ def charlie_munger_agent(state: AgentState):
     tickers = data["tickers"]
     
     analysis_data = {}
-    munger_analysis = {}
     
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("charlie_munger_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=10)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("charlie_munger_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
         
         progress.update_status("charlie_munger_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "operating_income",
-                "return_on_invested_capital",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "research_and_development",
-                "goodwill_and_intangible_assets",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=10  # Munger examines long-term trends
         )
         
         progress.update_status("charlie_munger_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
         
         progress.update_status("charlie_munger_agent", ticker, "Fetching insider trades")
         # Munger values management with skin in the game
-        insider_trades = get_insider_trades(
+        insider_trades = await aget_insider_trades(
             ticker,
             end_date,
             # Look back 2 years for insider trading patterns
@@ -69,7 +88,7 @@ def charlie_munger_agent(state: AgentState):
         
         progress.update_status("charlie_munger_agent", ticker, "Fetching company news")
         # Munger avoids businesses with frequent negative press
-        company_news = get_company_news(
+        company_news = await aget_company_news(
             ticker,
             end_date,
             # Look back 1 year for news
@@ -120,39 +139,38 @@ def charlie_munger_agent(state: AgentState):
             "news_sentiment": analyze_news_sentiment(company_news) if company_news else "No news data available"
         }
         
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("charlie_munger_agent", ticker, analysis_data[ticker], bullish_at=7.5, bearish_at=4.5, complete=bool(metrics and financial_line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("charlie_munger_agent", ticker, "Generating Charlie Munger analysis")
-        munger_output = generate_munger_output(
+        munger_output = await generate_munger_output(
             ticker=ticker, 
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
         
-        munger_analysis[ticker] = {
+        progress.update_status("charlie_munger_agent", ticker, "Done")
+
+        return {
             "signal": munger_output.signal,
             "confidence": munger_output.confidence,
-            "reasoning": munger_output.reasoning
+            "reasoning": munger_output.reasoning,
+            "decision_path": "llm",
         }
-        
-        progress.update_status("charlie_munger_agent", ticker, "Done")
-    
-    # Wrap results in a single message for the chain
-    message = HumanMessage(
-        content=json.dumps(munger_analysis),
-        name="charlie_munger_agent"
-    )
-    
+
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("charlie_munger_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    munger_analysis = dict(zip(tickers, results))
+
     # Show reasoning if requested
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(munger_analysis, "Charlie Munger Agent")
     
-    # Add signals to the overall state
-    state["data"]["analyst_signals"]["charlie_munger_agent"] = munger_analysis
-
-    return {
-        "messages": [message],
-        "data": state["data"]
-    }
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"charlie_munger_agent": munger_analysis}}}
 
 
 def analyze_moat_strength(metrics: list, financial_line_items: list) -> dict:
@@ -659,7 +677,7 @@ def analyze_news_sentiment(news_items: list) -> str:
     return f"Qualitative review of {len(news_items)} recent news items would be needed"
 
 
-def generate_munger_output(
+async def generate_munger_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -734,7 +752,7 @@ def generate_munger_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt, 
         model_name=model_name, 
         model_provider=model_provider, 
@@ -1,26 +1,29 @@
-from langchain_core.messages import HumanMessage
+from src.data.requirements import DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
-import json
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
 
-from src.tools.api import get_financial_metrics
+from src.tools.api import aget_financial_metrics
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="ttm", limit=10),
+]
 
 
 ##### Fundamental Agent #####
-def fundamentals_agent(state: AgentState):
+async def fundamentals_agent(state: AgentState):
     """Analyzes fundamental data and generates trading signals for multiple tickers."""
     data = state["data"]
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Initialize fundamental analysis for each ticker
-    fundamental_analysis = {}
-
-    for ticker in tickers:
+    async def analyze_ticker(ticker: str) -> dict | None:
         progress.update_status("fundamentals_agent", ticker, "Fetching financial metrics")
 
         # Get the financial metrics
-        financial_metrics = get_financial_metrics(
+        financial_metrics = await aget_financial_metrics(
             ticker=ticker,
             end_date=end_date,
             period="ttm",
@@ -29,7 +32,7 @@ def fundamentals_agent(state: AgentState):
 
         if not financial_metrics:
             progress.update_status("fundamentals_agent", ticker, "Failed: No financial metrics found")
-            continue
+            return None
 
         # Pull the most recent financial metrics
         metrics = financial_metrics[0]
@@ -132,28 +135,21 @@ def fundamentals_agent(state: AgentState):
         total_signals = len(signals)
         confidence = round(max(bullish_signals, bearish_signals) / total_signals, 2) * 100
 
-        fundamental_analysis[ticker] = {
+        progress.update_status("fundamentals_agent", ticker, "Done")
+
+        return {
             "signal": overall_signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
 
-        progress.update_status("fundamentals_agent", ticker, "Done")
-
-    # Create the fundamental analysis message
-    message = HumanMessage(
-        content=json.dumps(fundamental_analysis),
-        name="fundamentals_agent",
-    )
+    # Analyze tickers concurrently; results come back in ticker order, without the ones that failed
+    results = await arun_per_ticker(memoize_signals("fundamentals_agent", state, analyze_ticker, uses_llm=False), tickers)
+    fundamental_analysis = {ticker: result for ticker, result in zip(tickers, results) if result is not None}
 
     # Print the reasoning if the flag is set
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(fundamental_analysis, "Fundamental Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["fundamentals_agent"] = fundamental_analysis
-
-    return {
-        "messages": [message],
-        "data": data,
-    }
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"fundamentals_agent": fundamental_analysis}}}
@@ -1,6 +1,5 @@
 """거시경제 분석 에이전트"""
 import json
-from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
@@ -78,24 +77,11 @@ def macro_economic_agent(state: AgentState):
         }
     }
     
-    message = HumanMessage(
-        content=json.dumps(result),
-        name="macro_economic_agent"
-    )
-    
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(result, "Macro Economic Agent")
     
     # 시그널 저장
-    for ticker, signal_data in signals.signals.items():
-        if ticker not in state["data"]["analyst_signals"]:
-            state["data"]["analyst_signals"][ticker] = {}
-        state["data"]["analyst_signals"]["macro_economic_agent"] = signals.signals
-    
-    return {
-        "messages": state["messages"] + [message],
-        "data": state["data"]
-    }
+    return {"data": {"analyst_signals": {"macro_economic_agent": signals.signals}}}
 
 
 def analyze_macro_conditions(
@@ -4,26 +4,51 @@ from datetime import datetime, timedelta
 import json
 from typing_extensions import Literal
 
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
-from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
 from src.tools.api import (
-    get_company_news,
-    get_financial_metrics,
-    get_insider_trades,
-    get_market_cap,
-    search_line_items,
+    aget_company_news,
+    aget_financial_metrics,
+    aget_insider_trades,
+    aget_market_cap,
+    asearch_line_items,
+    asearch_line_items_batch,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
 from src.utils.progress import progress
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
 
 __all__ = [
     "MichaelBurrySignal",
     "michael_burry_agent",
 ]
 
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "total_debt",
+    "cash_and_equivalents",
+    "total_assets",
+    "total_liabilities",
+    "outstanding_shares",
+    "issuance_or_purchase_of_equity_shares",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="ttm", limit=5),
+    DataRequest("line_items", line_items=tuple(LINE_ITEMS)),
+    DataRequest("insider_trades", limit=1000, lookback_days=365),
+    DataRequest("company_news", limit=250, lookback_days=365),
+    MARKET_CAP,
+]
+
 ###############################################################################
 # Pydantic output model
 ###############################################################################
@@ -42,7 +67,7 @@ class MichaelBurrySignal(BaseModel):
 ###############################################################################
 
 
-def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine here)
+async def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine here)
     """Analyse stocks using Michael Burry's deep‑value, contrarian framework."""
 
     data = state["data"]
@@ -53,39 +78,33 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
     start_date = (datetime.fromisoformat(end_date) - timedelta(days=365)).date().isoformat()
 
     analysis_data: dict[str, dict] = {}
-    burry_analysis: dict[str, dict] = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("michael_burry_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date)
+
+    async def analyze_ticker(ticker: str) -> dict:
         # ------------------------------------------------------------------
         # Fetch raw data
         # ------------------------------------------------------------------
         progress.update_status("michael_burry_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching line items")
-        line_items = search_line_items(
+        line_items = await asearch_line_items(
             ticker,
-            [
-                "free_cash_flow",
-                "net_income",
-                "total_debt",
-                "cash_and_equivalents",
-                "total_assets",
-                "total_liabilities",
-                "outstanding_shares",
-                "issuance_or_purchase_of_equity_shares",
-            ],
+            LINE_ITEMS,
             end_date,
         )
 
         progress.update_status("michael_burry_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date=end_date, start_date=start_date)
+        insider_trades = await aget_insider_trades(ticker, end_date=end_date, start_date=start_date)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching company news")
-        news = get_company_news(ticker, end_date=end_date, start_date=start_date, limit=250)
+        news = await aget_company_news(ticker, end_date=end_date, start_date=start_date, limit=250)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         # ------------------------------------------------------------------
         # Run sub‑analyses
@@ -139,33 +158,41 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
             "market_cap": market_cap,
         }
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("michael_burry_agent", ticker, analysis_data[ticker], bullish_at=0.7 * max_score, bearish_at=0.3 * max_score, complete=bool(metrics and line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("michael_burry_agent", ticker, "Generating LLM output")
-        burry_output = _generate_burry_output(
+        burry_output = await _generate_burry_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        burry_analysis[ticker] = {
+        progress.update_status("michael_burry_agent", ticker, "Done")
+
+        return {
             "signal": burry_output.signal,
             "confidence": burry_output.confidence,
             "reasoning": burry_output.reasoning,
+            "decision_path": "llm",
         }
 
-        progress.update_status("michael_burry_agent", ticker, "Done")
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("michael_burry_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    burry_analysis: dict[str, dict] = dict(zip(tickers, results))
 
     # ----------------------------------------------------------------------
     # Return to the graph
     # ----------------------------------------------------------------------
-    message = HumanMessage(content=json.dumps(burry_analysis), name="michael_burry_agent")
 
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(burry_analysis, "Michael Burry Agent")
 
-    state["data"]["analyst_signals"]["michael_burry_agent"] = burry_analysis
-
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"michael_burry_agent": burry_analysis}}}
 
 
 ###############################################################################
@@ -323,7 +350,7 @@ def _analyze_contrarian_sentiment(news):
 # LLM generation
 ###############################################################################
 
-def _generate_burry_output(
+async def _generate_burry_output(
     ticker: str,
     analysis_data: dict,
     *,
@@ -378,7 +405,7 @@ def _generate_burry_output(
     def create_default_michael_burry_signal():
         return MichaelBurrySignal(signal="neutral", confidence=0.0, reasoning="Parsing error – defaulting to neutral")
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
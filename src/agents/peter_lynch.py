@@ -1,19 +1,50 @@
+from src.data.requirements import MARKET_CAP, PRICES, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
-    get_insider_trades,
-    get_company_news,
-    get_prices,
+    aget_financial_metrics,
+    aget_market_cap,
+    asearch_line_items,
+    asearch_line_items_batch,
+    aget_insider_trades,
+    aget_company_news,
+    aget_prices,
 )
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
+
+
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "revenue",
+    "earnings_per_share",
+    "net_income",
+    "operating_income",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=5),
+    DataRequest("line_items", period="annual", limit=5, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+    DataRequest("insider_trades", limit=50),
+    DataRequest("company_news", limit=50),
+    PRICES,
+]
 
 
 class PeterLynchSignal(BaseModel):
@@ -25,7 +56,7 @@ class PeterLynchSignal(BaseModel):
     reasoning: str
 
 
-def peter_lynch_agent(state: AgentState):
+async def peter_lynch_agent(state: AgentState):
     """
     Analyzes stocks using Peter Lynch's investing principles:
       - Invest in what you know (clear, understandable businesses).
@@ -46,46 +77,36 @@ def peter_lynch_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    lynch_analysis = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("peter_lynch_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=5)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("peter_lynch_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("peter_lynch_agent", ticker, "Gathering financial line items")
         # Relevant line items for Peter Lynch's approach
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("peter_lynch_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         progress.update_status("peter_lynch_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date, start_date=None, limit=50)
+        insider_trades = await aget_insider_trades(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("peter_lynch_agent", ticker, "Fetching company news")
-        company_news = get_company_news(ticker, end_date, start_date=None, limit=50)
+        company_news = await aget_company_news(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("peter_lynch_agent", ticker, "Fetching recent price data for reference")
-        prices = get_prices(ticker, start_date=start_date, end_date=end_date)
+        prices = await aget_prices(ticker, start_date=start_date, end_date=end_date)
 
         # Perform sub-analyses:
         progress.update_status("peter_lynch_agent", ticker, "Analyzing growth")
@@ -135,32 +156,37 @@ def peter_lynch_agent(state: AgentState):
             "insider_activity": insider_activity,
         }
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("peter_lynch_agent", ticker, analysis_data[ticker], bullish_at=7.5, bearish_at=4.5, complete=bool(metrics and financial_line_items and market_cap and prices))
+        if decided is not None:
+            return decided
+
         progress.update_status("peter_lynch_agent", ticker, "Generating Peter Lynch analysis")
-        lynch_output = generate_lynch_output(
+        lynch_output = await generate_lynch_output(
             ticker=ticker,
             analysis_data=analysis_data[ticker],
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        lynch_analysis[ticker] = {
+        progress.update_status("peter_lynch_agent", ticker, "Done")
+
+        return {
             "signal": lynch_output.signal,
             "confidence": lynch_output.confidence,
             "reasoning": lynch_output.reasoning,
+            "decision_path": "llm",
         }
 
-        progress.update_status("peter_lynch_agent", ticker, "Done")
-
-    # Wrap up results
-    message = HumanMessage(content=json.dumps(lynch_analysis), name="peter_lynch_agent")
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("peter_lynch_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    lynch_analysis = dict(zip(tickers, results))
 
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(lynch_analysis, "Peter Lynch Agent")
 
-    # Save signals to state
-    state["data"]["analyst_signals"]["peter_lynch_agent"] = lynch_analysis
-
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"peter_lynch_agent": lynch_analysis}}}
 
 
 def analyze_lynch_growth(financial_line_items: list) -> dict:
@@ -436,7 +462,7 @@ def analyze_insider_activity(insider_trades: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_lynch_output(
+async def generate_lynch_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -496,7 +522,7 @@ def generate_lynch_output(
             reasoning="Error in analysis; defaulting to neutral"
         )
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
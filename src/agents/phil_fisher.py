@@ -1,28 +1,59 @@
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
-    get_insider_trades,
-    get_company_news,
+    aget_financial_metrics,
+    aget_market_cap,
+    asearch_line_items,
+    asearch_line_items_batch,
+    aget_insider_trades,
+    aget_company_news,
 )
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
 import statistics
 
 
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "revenue",
+    "net_income",
+    "earnings_per_share",
+    "free_cash_flow",
+    "research_and_development",
+    "operating_income",
+    "operating_margin",
+    "gross_margin",
+    "total_debt",
+    "shareholders_equity",
+    "cash_and_equivalents",
+    "ebit",
+    "ebitda",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=5),
+    DataRequest("line_items", period="annual", limit=5, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+    DataRequest("insider_trades", limit=50),
+    DataRequest("company_news", limit=50),
+]
+
+
 class PhilFisherSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
     reasoning: str
 
 
-def phil_fisher_agent(state: AgentState):
+async def phil_fisher_agent(state: AgentState):
     """
     Analyzes stocks using Phil Fisher's investing principles:
       - Seek companies with long-term above-average growth potential
@@ -40,11 +71,14 @@ def phil_fisher_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    fisher_analysis = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("phil_fisher_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=5)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("phil_fisher_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("phil_fisher_agent", ticker, "Gathering financial line items")
         # Include relevant line items for Phil Fisher's approach:
@@ -52,36 +86,22 @@ def phil_fisher_agent(state: AgentState):
         #   - Margins & Stability: operating_income, operating_margin, gross_margin
         #   - Management Efficiency & Leverage: total_debt, shareholders_equity, free_cash_flow
         #   - Valuation: net_income, free_cash_flow (for P/E, P/FCF), ebit, ebitda
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "earnings_per_share",
-                "free_cash_flow",
-                "research_and_development",
-                "operating_income",
-                "operating_margin",
-                "gross_margin",
-                "total_debt",
-                "shareholders_equity",
-                "cash_and_equivalents",
-                "ebit",
-                "ebitda",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("phil_fisher_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         progress.update_status("phil_fisher_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date, start_date=None, limit=50)
+        insider_trades = await aget_insider_trades(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("phil_fisher_agent", ticker, "Fetching company news")
-        company_news = get_company_news(ticker, end_date, start_date=None, limit=50)
+        company_news = await aget_company_news(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("phil_fisher_agent", ticker, "Analyzing growth & quality")
         growth_quality = analyze_fisher_growth_quality(financial_line_items)
@@ -139,30 +159,37 @@ def phil_fisher_agent(state: AgentState):
             "sentiment_analysis": sentiment_analysis,
         }
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("phil_fisher_agent", ticker, analysis_data[ticker], bullish_at=7.5, bearish_at=4.5, complete=bool(metrics and financial_line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("phil_fisher_agent", ticker, "Generating Phil Fisher-style analysis")
-        fisher_output = generate_fisher_output(
+        fisher_output = await generate_fisher_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        fisher_analysis[ticker] = {
+        progress.update_status("phil_fisher_agent", ticker, "Done")
+
+        return {
             "signal": fisher_output.signal,
             "confidence": fisher_output.confidence,
             "reasoning": fisher_output.reasoning,
+            "decision_path": "llm",
         }
 
-        progress.update_status("phil_fisher_agent", ticker, "Done")
-
-    # Wrap results in a single message
-    message = HumanMessage(content=json.dumps(fisher_analysis), name="phil_fisher_agent")
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("phil_fisher_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    fisher_analysis = dict(zip(tickers, results))
 
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(fisher_analysis, "Phil Fisher Agent")
 
-    state["data"]["analyst_signals"]["phil_fisher_agent"] = fisher_analysis
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"phil_fisher_agent": fisher_analysis}}}
 
 
 def analyze_fisher_growth_quality(financial_line_items: list) -> dict:
@@ -525,7 +552,7 @@ def analyze_sentiment(news_items: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_fisher_output(
+async def generate_fisher_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -591,7 +618,7 @@ def generate_fisher_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
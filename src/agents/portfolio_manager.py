@@ -6,7 +6,7 @@ from src.graph.state import AgentState, show_agent_reasoning
 from pydantic import BaseModel, Field
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm
 
 
 class PortfolioDecision(BaseModel):
@@ -21,7 +21,7 @@ class PortfolioManagerOutput(BaseModel):
 
 
 ##### Portfolio Management Agent #####
-def portfolio_management_agent(state: AgentState):
+async def portfolio_management_agent(state: AgentState):
     """Makes final trading decisions and generates orders for multiple tickers"""
 
     # Get the portfolio and analyst signals
@@ -58,7 +58,7 @@ def portfolio_management_agent(state: AgentState):
     progress.update_status("portfolio_management_agent", None, "Generating trading decisions")
 
     # Generate the trading decision
-    result = generate_trading_decision(
+    result = await generate_trading_decision(
         tickers=tickers,
         signals_by_ticker=signals_by_ticker,
         current_prices=current_prices,
@@ -68,23 +68,18 @@ def portfolio_management_agent(state: AgentState):
         model_provider=state["metadata"]["model_provider"],
     )
 
-    # Create the portfolio management message
-    message = HumanMessage(
-        content=json.dumps({ticker: decision.model_dump() for ticker, decision in result.decisions.items()}),
-        name="portfolio_management",
-    )
+    decisions = {ticker: decision.model_dump() for ticker, decision in result.decisions.items()}
 
     # Print the decision if the flag is set
     if state["metadata"]["show_reasoning"]:
-        show_agent_reasoning({ticker: decision.model_dump() for ticker, decision in result.decisions.items()}, "Portfolio Management Agent")
+        show_agent_reasoning(decisions, "Portfolio Management Agent")
 
-    return {
-        "messages": state["messages"] + [message],
-        "data": state["data"],
-    }
+    # The decisions are the run's output; append only this message to the conversation
+    message = HumanMessage(content=json.dumps(decisions), name="portfolio_management")
+    return {"messages": [message]}
 
 
-def generate_trading_decision(
+async def generate_trading_decision(
     tickers: list[str],
     signals_by_ticker: dict[str, dict],
     current_prices: dict[str, float],
@@ -190,4 +185,4 @@ def generate_trading_decision(
     def create_default_portfolio_output():
         return PortfolioManagerOutput(decisions={ticker: PortfolioDecision(action="hold", quantity=0, confidence=0.0, reasoning="Error in portfolio management, defaulting to hold") for ticker in tickers})
 
-    return call_llm(prompt=prompt, model_name=model_name, model_provider=model_provider, pydantic_model=PortfolioManagerOutput, agent_name="portfolio_management_agent", default_factory=create_default_portfolio_output)
+    return await acall_llm(prompt=prompt, model_name=model_name, model_provider=model_provider, pydantic_model=PortfolioManagerOutput, agent_name="portfolio_management_agent", default_factory=create_default_portfolio_output)
@@ -1,12 +1,10 @@
-from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
-from src.tools.api import get_prices, prices_to_df
-import json
+from src.tools.api import aget_price_series, prices_to_df
 
 
 ##### Risk Management Agent #####
-def risk_management_agent(state: AgentState):
+async def risk_management_agent(state: AgentState):
     """Controls position sizing based on real-world risk factors for multiple tickers."""
     portfolio = state["data"]["portfolio"]
     data = state["data"]
@@ -19,7 +17,7 @@ def risk_management_agent(state: AgentState):
     for ticker in tickers:
         progress.update_status("risk_management_agent", ticker, "Analyzing price data")
 
-        prices = get_prices(
+        prices = await aget_price_series(
             ticker=ticker,
             start_date=data["start_date"],
             end_date=data["end_date"],
@@ -66,18 +64,8 @@ def risk_management_agent(state: AgentState):
 
         progress.update_status("risk_management_agent", ticker, "Done")
 
-    message = HumanMessage(
-        content=json.dumps(risk_analysis),
-        name="risk_management_agent",
-    )
-
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(risk_analysis, "Risk Management Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["risk_management_agent"] = risk_analysis
-
-    return {
-        "messages": state["messages"] + [message],
-        "data": data,
-    }
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"risk_management_agent": risk_analysis}}}
@@ -1,28 +1,32 @@
-from langchain_core.messages import HumanMessage
+from src.data.requirements import DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
 import pandas as pd
 import numpy as np
-import json
 
-from src.tools.api import get_insider_trades, get_company_news
+from src.tools.api import aget_insider_trades, aget_company_news
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("insider_trades", limit=1000),
+    DataRequest("company_news", limit=100),
+]
 
 
 ##### Sentiment Agent #####
-def sentiment_agent(state: AgentState):
+async def sentiment_agent(state: AgentState):
     """Analyzes market sentiment and generates trading signals for multiple tickers."""
     data = state.get("data", {})
     end_date = data.get("end_date")
     tickers = data.get("tickers")
 
-    # Initialize sentiment analysis for each ticker
-    sentiment_analysis = {}
-
-    for ticker in tickers:
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("sentiment_agent", ticker, "Fetching insider trades")
 
         # Get the insider trades
-        insider_trades = get_insider_trades(
+        insider_trades = await aget_insider_trades(
             ticker=ticker,
             end_date=end_date,
             limit=1000,
@@ -37,7 +41,7 @@ def sentiment_agent(state: AgentState):
         progress.update_status("sentiment_agent", ticker, "Fetching company news")
 
         # Get the company news
-        company_news = get_company_news(ticker, end_date, limit=100)
+        company_news = await aget_company_news(ticker, end_date, limit=100)
 
         # Get the sentiment from the company news
         sentiment = pd.Series([n.sentiment for n in company_news]).dropna()
@@ -73,28 +77,21 @@ def sentiment_agent(state: AgentState):
             confidence = round(max(bullish_signals, bearish_signals) / total_weighted_signals, 2) * 100
         reasoning = f"Weighted Bullish signals: {bullish_signals:.1f}, Weighted Bearish signals: {bearish_signals:.1f}"
 
-        sentiment_analysis[ticker] = {
+        progress.update_status("sentiment_agent", ticker, "Done")
+
+        return {
             "signal": overall_signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
 
-        progress.update_status("sentiment_agent", ticker, "Done")
-
-    # Create the sentiment message
-    message = HumanMessage(
-        content=json.dumps(sentiment_analysis),
-        name="sentiment_agent",
-    )
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("sentiment_agent", state, analyze_ticker, uses_llm=False), tickers)
+    sentiment_analysis = dict(zip(tickers, results))
 
     # Print the reasoning if the flag is set
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(sentiment_analysis, "Sentiment Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["sentiment_agent"] = sentiment_analysis
-
-    return {
-        "messages": [message],
-        "data": data,
-    }
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"sentiment_agent": sentiment_analysis}}}
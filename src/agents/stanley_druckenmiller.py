@@ -1,20 +1,54 @@
+from src.data.requirements import MARKET_CAP, PRICES, DataRequest
+from src.data.price_series import PriceSeries
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
-    get_insider_trades,
-    get_company_news,
-    get_prices,
+    aget_financial_metrics,
+    aget_market_cap,
+    asearch_line_items,
+    asearch_line_items_batch,
+    aget_insider_trades,
+    aget_company_news,
+    aget_price_series,
 )
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
-import statistics
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
+import numpy as np
+
+
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "revenue",
+    "earnings_per_share",
+    "net_income",
+    "operating_income",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+    "ebit",
+    "ebitda",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="annual", limit=5),
+    DataRequest("line_items", period="annual", limit=5, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+    DataRequest("insider_trades", limit=50),
+    DataRequest("company_news", limit=50),
+    PRICES,
+]
 
 
 class StanleyDruckenmillerSignal(BaseModel):
@@ -23,7 +57,7 @@ class StanleyDruckenmillerSignal(BaseModel):
     reasoning: str
 
 
-def stanley_druckenmiller_agent(state: AgentState):
+async def stanley_druckenmiller_agent(state: AgentState):
     """
     Analyzes stocks using Stanley Druckenmiller's investing principles:
       - Seeking asymmetric risk-reward opportunities
@@ -39,11 +73,14 @@ def stanley_druckenmiller_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    druck_analysis = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("stanley_druckenmiller_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="annual", limit=5)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Gathering financial line items")
         # Include relevant line items for Stan Druckenmiller's approach:
@@ -51,40 +88,25 @@ def stanley_druckenmiller_agent(state: AgentState):
         #   - Valuation: net_income, free_cash_flow, ebit, ebitda
         #   - Leverage: total_debt, shareholders_equity
         #   - Liquidity: cash_and_equivalents
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "ebit",
-                "ebitda",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date, start_date=None, limit=50)
+        insider_trades = await aget_insider_trades(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching company news")
-        company_news = get_company_news(ticker, end_date, start_date=None, limit=50)
+        company_news = await aget_company_news(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching recent price data for momentum")
-        prices = get_prices(ticker, start_date=start_date, end_date=end_date)
+        prices = await aget_price_series(ticker, start_date=start_date, end_date=end_date)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Analyzing growth & momentum")
         growth_momentum_analysis = analyze_growth_and_momentum(financial_line_items, prices)
@@ -133,33 +155,40 @@ def stanley_druckenmiller_agent(state: AgentState):
             "valuation_analysis": valuation_analysis,
         }
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("stanley_druckenmiller_agent", ticker, analysis_data[ticker], bullish_at=7.5, bearish_at=4.5, complete=bool(metrics and financial_line_items and market_cap and prices))
+        if decided is not None:
+            return decided
+
         progress.update_status("stanley_druckenmiller_agent", ticker, "Generating Stanley Druckenmiller analysis")
-        druck_output = generate_druckenmiller_output(
+        druck_output = await generate_druckenmiller_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        druck_analysis[ticker] = {
+        progress.update_status("stanley_druckenmiller_agent", ticker, "Done")
+
+        return {
             "signal": druck_output.signal,
             "confidence": druck_output.confidence,
             "reasoning": druck_output.reasoning,
+            "decision_path": "llm",
         }
 
-        progress.update_status("stanley_druckenmiller_agent", ticker, "Done")
-
-    # Wrap results in a single message
-    message = HumanMessage(content=json.dumps(druck_analysis), name="stanley_druckenmiller_agent")
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("stanley_druckenmiller_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    druck_analysis = dict(zip(tickers, results))
 
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(druck_analysis, "Stanley Druckenmiller Agent")
 
-    state["data"]["analyst_signals"]["stanley_druckenmiller_agent"] = druck_analysis
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"stanley_druckenmiller_agent": druck_analysis}}}
 
 
-def analyze_growth_and_momentum(financial_line_items: list, prices: list) -> dict:
+def analyze_growth_and_momentum(financial_line_items: list, prices: PriceSeries) -> dict:
     """
     Evaluate:
       - Revenue Growth (YoY)
@@ -228,8 +257,8 @@ def analyze_growth_and_momentum(financial_line_items: list, prices: list) -> dic
     #
     # We'll give up to 3 points for strong momentum
     if prices and len(prices) > 30:
-        sorted_prices = sorted(prices, key=lambda p: p.time)
-        close_prices = [p.close for p in sorted_prices if p.close is not None]
+        # Series bars are already sorted oldest first
+        close_prices = prices.close
         if len(close_prices) >= 2:
             start_price = close_prices[0]
             end_price = close_prices[-1]
@@ -340,7 +369,7 @@ def analyze_sentiment(news_items: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def analyze_risk_reward(financial_line_items: list, prices: list) -> dict:
+def analyze_risk_reward(financial_line_items: list, prices: PriceSeries) -> dict:
     """
     Assesses risk via:
       - Debt-to-Equity
@@ -381,16 +410,13 @@ def analyze_risk_reward(financial_line_items: list, prices: list) -> dict:
     # 2. Price Volatility
     #
     if len(prices) > 10:
-        sorted_prices = sorted(prices, key=lambda p: p.time)
-        close_prices = [p.close for p in sorted_prices if p.close is not None]
+        close_prices = prices.close
         if len(close_prices) > 10:
-            daily_returns = []
-            for i in range(1, len(close_prices)):
-                prev_close = close_prices[i - 1]
-                if prev_close > 0:
-                    daily_returns.append((close_prices[i] - prev_close) / prev_close)
-            if daily_returns:
-                stdev = statistics.pstdev(daily_returns)  # population stdev
+            prev_closes = close_prices[:-1]
+            valid = prev_closes > 0
+            daily_returns = (close_prices[1:][valid] - prev_closes[valid]) / prev_closes[valid]
+            if daily_returns.size:
+                stdev = float(np.std(daily_returns))  # population stdev
                 if stdev < 0.01:
                     raw_score += 3
                     details.append(f"Low volatility: daily returns stdev {stdev:.2%}")
@@ -518,7 +544,7 @@ def analyze_druckenmiller_valuation(financial_line_items: list, market_cap: floa
     return {"score": final_score, "details": "; ".join(details)}
 
 
-def generate_druckenmiller_output(
+async def generate_druckenmiller_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -585,7 +611,7 @@ def generate_druckenmiller_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
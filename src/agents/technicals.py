@@ -1,19 +1,24 @@
 import math
 
-from langchain_core.messages import HumanMessage
-
+from src.data.requirements import PRICES
 from src.graph.state import AgentState, show_agent_reasoning
 
-import json
 import pandas as pd
 import numpy as np
 
-from src.tools.api import get_prices, prices_to_df
+from src.tools.api import aget_price_series, prices_to_df
 from src.utils.progress import progress
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    PRICES,
+]
 
 
 ##### Technical Analyst #####
-def technical_analyst_agent(state: AgentState):
+async def technical_analyst_agent(state: AgentState):
     """
     Sophisticated technical analysis system that combines multiple trading strategies for multiple tickers:
     1. Trend Following
@@ -27,14 +32,11 @@ def technical_analyst_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Initialize analysis for each ticker
-    technical_analysis = {}
-
-    for ticker in tickers:
+    async def analyze_ticker(ticker: str) -> dict | None:
         progress.update_status("technical_analyst_agent", ticker, "Analyzing price data")
 
         # Get the historical price data
-        prices = get_prices(
+        prices = await aget_price_series(
             ticker=ticker,
             start_date=start_date,
             end_date=end_date,
@@ -42,7 +44,7 @@ def technical_analyst_agent(state: AgentState):
 
         if not prices:
             progress.update_status("technical_analyst_agent", ticker, "Failed: No price data found")
-            continue
+            return None
 
         # Convert prices to a DataFrame
         prices_df = prices_to_df(prices)
@@ -83,8 +85,10 @@ def technical_analyst_agent(state: AgentState):
             strategy_weights,
         )
 
+        progress.update_status("technical_analyst_agent", ticker, "Done")
+
         # Generate detailed analysis report for this ticker
-        technical_analysis[ticker] = {
+        return {
             "signal": combined_signal["signal"],
             "confidence": round(combined_signal["confidence"] * 100),
             "strategy_signals": {
@@ -115,24 +119,16 @@ def technical_analyst_agent(state: AgentState):
                 },
             },
         }
-        progress.update_status("technical_analyst_agent", ticker, "Done")
 
-    # Create the technical analyst message
-    message = HumanMessage(
-        content=json.dumps(technical_analysis),
-        name="technical_analyst_agent",
-    )
+    # Analyze tickers concurrently; results come back in ticker order, without the ones that failed
+    results = await arun_per_ticker(memoize_signals("technical_analyst_agent", state, analyze_ticker, uses_llm=False), tickers)
+    technical_analysis = {ticker: result for ticker, result in zip(tickers, results) if result is not None}
 
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(technical_analysis, "Technical Analyst")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["technical_analyst_agent"] = technical_analysis
-
-    return {
-        "messages": state["messages"] + [message],
-        "data": data,
-    }
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"technical_analyst_agent": technical_analysis}}}
 
 
 def calculate_trend_signals(prices_df):
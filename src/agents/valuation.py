@@ -7,31 +7,52 @@ configurable weights.
 """
 
 from statistics import median
-import json
-from langchain_core.messages import HumanMessage
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
 
 from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
+    aget_financial_metrics,
+    aget_market_cap,
+    asearch_line_items,
+    asearch_line_items_batch,
 )
 
-def valuation_agent(state: AgentState):
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "depreciation_and_amortization",
+    "capital_expenditure",
+    "working_capital",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="ttm", limit=8),
+    DataRequest("line_items", period="ttm", limit=2, line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+]
+
+
+async def valuation_agent(state: AgentState):
     """Run valuation across tickers and write signals back to `state`."""
 
     data = state["data"]
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    valuation_analysis: dict[str, dict] = {}
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("valuation_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date, period="ttm", limit=2)
 
-    for ticker in tickers:
+    async def analyze_ticker(ticker: str) -> dict | None:
         progress.update_status("valuation_agent", ticker, "Fetching financial data")
 
         # --- Historical financial metrics (pull 8 latest TTM snapshots for medians) ---
-        financial_metrics = get_financial_metrics(
+        financial_metrics = await aget_financial_metrics(
             ticker=ticker,
             end_date=end_date,
             period="ttm",
@@ -39,27 +60,21 @@ def valuation_agent(state: AgentState):
         )
         if not financial_metrics:
             progress.update_status("valuation_agent", ticker, "Failed: No financial metrics found")
-            continue
+            return None
         most_recent_metrics = financial_metrics[0]
 
         # --- Fine‑grained line‑items (need two periods to calc WC change) ---
         progress.update_status("valuation_agent", ticker, "Gathering line items")
-        line_items = search_line_items(
+        line_items = await asearch_line_items(
             ticker=ticker,
-            line_items=[
-                "free_cash_flow",
-                "net_income",
-                "depreciation_and_amortization",
-                "capital_expenditure",
-                "working_capital",
-            ],
+            line_items=LINE_ITEMS,
             end_date=end_date,
             period="ttm",
             limit=2,
         )
         if len(line_items) < 2:
             progress.update_status("valuation_agent", ticker, "Failed: Insufficient financial line items")
-            continue
+            return None
         li_curr, li_prev = line_items[0], line_items[1]
 
         # ------------------------------------------------------------------
@@ -99,10 +114,10 @@ def valuation_agent(state: AgentState):
         # ------------------------------------------------------------------
         # Aggregate & signal
         # ------------------------------------------------------------------
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
         if not market_cap:
             progress.update_status("valuation_agent", ticker, "Failed: Market cap unavailable")
-            continue
+            return None
 
         method_values = {
             "dcf": {"value": dcf_val, "weight": 0.35},
@@ -114,7 +129,7 @@ def valuation_agent(state: AgentState):
         total_weight = sum(v["weight"] for v in method_values.values() if v["value"] > 0)
         if total_weight == 0:
             progress.update_status("valuation_agent", ticker, "Failed: All valuation methods zero")
-            continue
+            return None
 
         for v in method_values.values():
             v["gap"] = (v["value"] - market_cap) / market_cap if v["value"] > 0 else None
@@ -140,19 +155,22 @@ def valuation_agent(state: AgentState):
             for m, vals in method_values.items() if vals["value"] > 0
         }
 
-        valuation_analysis[ticker] = {
+        progress.update_status("valuation_agent", ticker, "Done")
+
+        return {
             "signal": signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
-        progress.update_status("valuation_agent", ticker, "Done")
 
-    # ---- Emit message (for LLM tool chain) ----
-    msg = HumanMessage(content=json.dumps(valuation_analysis), name="valuation_agent")
+    # Analyze tickers concurrently; results come back in ticker order, without the ones that failed
+    results = await arun_per_ticker(memoize_signals("valuation_agent", state, analyze_ticker, uses_llm=False), tickers)
+    valuation_analysis: dict[str, dict] = {ticker: result for ticker, result in zip(tickers, results) if result is not None}
+
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(valuation_analysis, "Valuation Analysis Agent")
-    state["data"]["analyst_signals"]["valuation_agent"] = valuation_analysis
-    return {"messages": [msg], "data": data}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"valuation_agent": valuation_analysis}}}
 
 #############################
 # Helper Valuation Functions
@@ -1,12 +1,35 @@
+from src.data.requirements import MARKET_CAP, DataRequest
 from src.graph.state import AgentState, show_agent_reasoning
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.tools.api import aget_financial_metrics, aget_market_cap, asearch_line_items, asearch_line_items_batch
+from src.utils.llm import acall_llm
+from src.utils.decision_policy import decisive_signal
 from src.utils.progress import progress
+from src.utils.parallel import arun_per_ticker
+from src.data.signal_store import memoize_signals
+
+
+# Financial line items this agent analyzes for every ticker
+LINE_ITEMS = [
+    "capital_expenditure",
+    "depreciation_and_amortization",
+    "net_income",
+    "outstanding_shares",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "issuance_or_purchase_of_equity_shares",
+]
+
+# Data this agent reads for every ticker, fetched for all selected agents up front by the workflow
+DATA_REQUIREMENTS = [
+    DataRequest("financial_metrics", period="ttm", limit=5),
+    DataRequest("line_items", line_items=tuple(LINE_ITEMS)),
+    MARKET_CAP,
+]
 
 
 class WarrenBuffettSignal(BaseModel):
@@ -15,7 +38,7 @@ class WarrenBuffettSignal(BaseModel):
     reasoning: str
 
 
-def warren_buffett_agent(state: AgentState):
+async def warren_buffett_agent(state: AgentState):
     """Analyzes stocks using Buffett's principles and LLM reasoning."""
     data = state["data"]
     end_date = data["end_date"]
@@ -23,32 +46,26 @@ def warren_buffett_agent(state: AgentState):
 
     # Collect all analysis for LLM reasoning
     analysis_data = {}
-    buffett_analysis = {}
 
-    for ticker in tickers:
+    # Fetch line items for all tickers up front in batched requests
+    progress.update_status("warren_buffett_agent", None, "Fetching financial line items")
+    await asearch_line_items_batch(tickers, LINE_ITEMS, end_date)
+
+    async def analyze_ticker(ticker: str) -> dict:
         progress.update_status("warren_buffett_agent", ticker, "Fetching financial metrics")
         # Fetch required data
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
+        metrics = await aget_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("warren_buffett_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
+        financial_line_items = await asearch_line_items(
             ticker,
-            [
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "net_income",
-                "outstanding_shares",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares",
-            ],
+            LINE_ITEMS,
             end_date,
         )
 
         progress.update_status("warren_buffett_agent", ticker, "Getting market cap")
         # Get current market cap
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = await aget_market_cap(ticker, end_date)
 
         progress.update_status("warren_buffett_agent", ticker, "Analyzing fundamentals")
         # Analyze fundamentals
@@ -104,34 +121,39 @@ def warren_buffett_agent(state: AgentState):
             "margin_of_safety": margin_of_safety,
         }
 
+        # Clear-cut scores get their signal without asking the LLM, unless some of their data is missing
+        decided = decisive_signal("warren_buffett_agent", ticker, analysis_data[ticker], bullish_at=0.7 * max_possible_score, bearish_at=0.3 * max_possible_score, complete=bool(metrics and financial_line_items and market_cap))
+        if decided is not None:
+            return decided
+
         progress.update_status("warren_buffett_agent", ticker, "Generating Warren Buffett analysis")
-        buffett_output = generate_buffett_output(
+        buffett_output = await generate_buffett_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data={ticker: analysis_data[ticker]},
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
         )
 
-        # Store analysis in consistent format with other agents
-        buffett_analysis[ticker] = {
+        progress.update_status("warren_buffett_agent", ticker, "Done")
+
+        # Return analysis in consistent format with other agents
+        return {
             "signal": buffett_output.signal,
             "confidence": buffett_output.confidence,  # Normalize between 0 to 100
             "reasoning": buffett_output.reasoning,
+            "decision_path": "llm",
         }
 
-        progress.update_status("warren_buffett_agent", ticker, "Done")
-
-    # Create the message
-    message = HumanMessage(content=json.dumps(buffett_analysis), name="warren_buffett_agent")
+    # Analyze tickers concurrently; results come back in ticker order
+    results = await arun_per_ticker(memoize_signals("warren_buffett_agent", state, analyze_ticker), tickers, batch_llm_calls=True)
+    buffett_analysis = dict(zip(tickers, results))
 
     # Show reasoning if requested
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(buffett_analysis, "Warren Buffett Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["warren_buffett_agent"] = buffett_analysis
-
-    return {"messages": [message], "data": state["data"]}
+    # Add the signals to the shared analyst signals
+    return {"data": {"analyst_signals": {"warren_buffett_agent": buffett_analysis}}}
 
 
 def analyze_fundamentals(metrics: list) -> dict[str, any]:
@@ -382,7 +404,7 @@ def calculate_intrinsic_value(financial_line_items: list) -> dict[str, any]:
     }
 
 
-def generate_buffett_output(
+async def generate_buffett_output(
     ticker: str,
     analysis_data: dict[str, any],
     model_name: str,
@@ -439,7 +461,7 @@ def generate_buffett_output(
     def create_default_warren_buffett_signal():
         return WarrenBuffettSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
+    return await acall_llm(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -4,7 +4,6 @@ from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import questionary
 
-import matplotlib.pyplot as plt
 import pandas as pd
 from colorama import Fore, Style, init
 import numpy as np
@@ -14,11 +13,8 @@ from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelPro
 from src.utils.analysts import ANALYST_ORDER
 from src.main import run_hedge_fund
 from src.tools.api import (
-    get_company_news,
-    get_price_data,
-    get_prices,
-    get_financial_metrics,
-    get_insider_trades,
+    get_price_series,
+    prefetch,
 )
 from src.utils.display import print_backtest_results, format_backtest_row
 from typing_extensions import Callable
@@ -272,18 +268,15 @@ class Backtester:
         start_date_dt = end_date_dt - relativedelta(years=1)
         start_date_str = start_date_dt.strftime("%Y-%m-%d")
 
-        for ticker in self.tickers:
-            # Fetch price data for the entire period, plus 1 year
-            get_prices(ticker, start_date_str, self.end_date)
-
-            # Fetch financial metrics
-            get_financial_metrics(ticker, self.end_date, limit=10)
+        # Fetch price data for the entire period, plus 1 year
+        errors = prefetch(self.tickers, ["prices"], start_date_str, self.end_date)
 
-            # Fetch insider trades
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        # Fetch financial metrics, insider trades and company news for the backtest period
+        errors.update(prefetch(self.tickers, ["financial_metrics", "insider_trades", "company_news"], self.start_date, self.end_date))
 
-            # Fetch company news
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        # Failed fetches are retried when the agents ask for the data, so they only warrant a warning here
+        for (ticker, dataset), error in errors.items():
+            print(f"Warning: could not pre-fetch {dataset} for {ticker}: {error}")
 
         print("Data pre-fetch complete.")
 
@@ -319,12 +312,12 @@ class Backtester:
 
                 for ticker in self.tickers:
                     try:
-                        price_data = get_price_data(ticker, previous_date_str, current_date_str)
-                        if price_data.empty:
+                        price_series = get_price_series(ticker, previous_date_str, current_date_str)
+                        if not len(price_series):
                             print(f"Warning: No price data for {ticker} on {current_date_str}")
                             missing_data = True
                             break
-                        current_prices[ticker] = price_data.iloc[-1]["close"]
+                        current_prices[ticker] = float(price_series.close[-1])
                     except Exception as e:
                         print(f"Error fetching price for {ticker} between {previous_date_str} and {current_date_str}: {e}")
                         missing_data = True
@@ -535,7 +528,9 @@ class Backtester:
         total_realized_gains = sum(self.portfolio["realized_gains"][ticker]["long"] + self.portfolio["realized_gains"][ticker]["short"] for ticker in self.tickers)
         print(f"Total Realized Gains/Losses: {Fore.GREEN if total_realized_gains >= 0 else Fore.RED}${total_realized_gains:,.2f}{Style.RESET_ALL}")
 
-        # Plot the portfolio value over time
+        # Plot the portfolio value over time (matplotlib is slow to import, so only when plotting)
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(12, 6))
         plt.plot(performance_df.index, performance_df["Portfolio Value"], color="blue")
         plt.title("Portfolio Value Over Time")
@@ -62,6 +62,9 @@ class AIConfig:
     selected_analysts: list = None
     temperature: float = 0.1
     max_tokens: int = 4000
+    run_timeout: Optional[float] = None  # 분석 실행 제한 시간(초), 초과한 애널리스트는 건너뜀
+    max_concurrent_llm_calls: Optional[int] = None  # 모델별 동시 LLM 호출 수 (None이면 LLM_MAX_CONCURRENCY 환경변수 또는 기본값)
+    llm_requests_per_minute: Optional[float] = None  # 모델별 분당 LLM 요청 수 제한 (None이면 LLM_REQUESTS_PER_MINUTE 환경변수, 기본은 제한 없음)
 
 
 @dataclass
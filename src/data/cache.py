@@ -1,69 +1,475 @@
+import bisect
+import datetime
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel
+
+from src.data.price_series import PriceSeries
+from src.data.store import ParquetStore, create_default_store
+
+# Lower bound used for coverage that is known to extend back to the first available record
+EARLIEST_DATE = "0001-01-01"
+
+# Default in-memory budget for cached rows, overridable with FINANCIAL_DATA_CACHE_MAX_MB
+DEFAULT_MAX_MB = 512
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def get_default_max_bytes() -> int | None:
+    """Resolve the in-memory cache budget from the environment.
+
+    Set FINANCIAL_DATA_CACHE_MAX_MB to a number of megabytes, or to 0 to let
+    the cache grow without limit.
+    """
+    max_mb = os.environ.get("FINANCIAL_DATA_CACHE_MAX_MB", "").strip()
+    try:
+        max_mb = float(max_mb) if max_mb else DEFAULT_MAX_MB
+    except ValueError:
+        print(f"Warning: ignoring invalid FINANCIAL_DATA_CACHE_MAX_MB={max_mb!r}")
+        max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024) if max_mb > 0 else None
+
+
+def _shift_date(date: str, days: int) -> str:
+    """Shift a YYYY-MM-DD date string by a number of days."""
+    return (datetime.date.fromisoformat(date) + datetime.timedelta(days=days)).isoformat()
+
+
+def _insider_trade_date(trade: dict[str, any]) -> str:
+    return trade.get("transaction_date") or trade["filing_date"]
+
+
+# Fields that identify one insider trade or news article; many share a filing date or day,
+# so the date alone would drop items published later on a day that is already cached
+INSIDER_TRADE_KEY = ("filing_date", "name", "transaction_date", "transaction_shares", "security_title")
+COMPANY_NEWS_KEY = ("date", "url")
+
+
+def _key_getter(key_field: str | tuple[str, ...]) -> Callable[[dict[str, any]], any]:
+    """Return a function reading the key field (or tuple of fields) that identifies a row."""
+    if isinstance(key_field, tuple):
+        return lambda item: tuple(item[field] for field in key_field)
+    return itemgetter(key_field)
+
+
+def _row_nbytes(row: dict[str, any], day: str) -> int:
+    # Containers and values; keys are shared between rows
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) + sys.getsizeof(day)
+
+
+def _model_nbytes(instance: BaseModel) -> int:
+    fields = instance.__dict__
+    return sys.getsizeof(instance) + sys.getsizeof(fields) + sum(sys.getsizeof(value) for value in fields.values())
+
+
+class SortedRows:
+    """Cached rows for one ticker, kept sorted by date with a parallel day index for bisect range queries."""
+
+    def __init__(self, rows: list[dict[str, any]], date_key: Callable[[dict[str, any]], str]):
+        self._date_key = date_key
+        self.rows = sorted(rows, key=date_key)
+        # Day (YYYY-MM-DD) of every row, in the same order as self.rows
+        self._days = [date_key(row)[:10] for row in self.rows]
+        # Validated model instances for self.rows, built once per model class on first request
+        self._models: dict[type[BaseModel], list[BaseModel]] = {}
+        # Row key -> row, built on the first merge()
+        self._keys: dict[any, dict[str, any]] | None = None
+        # Approximate memory held by the rows and their validated models
+        self.nbytes = sys.getsizeof(self.rows) + sys.getsizeof(self._days) + sum(_row_nbytes(row, day) for row, day in zip(self.rows, self._days))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def merge(self, data: list[dict[str, any]], key_field: str | tuple[str, ...], merge_fields: bool = False):
+        """Merge new rows in, avoiding duplicates based on a key field (or tuple of fields).
+
+        With merge_fields, a new row whose key already exists adds its fields to the
+        existing row instead of being dropped. Models already validated for the
+        existing rows are kept; only new and changed rows are validated.
+        """
+        get_key = _key_getter(key_field)
+        if self._keys is None:
+            self._keys = {get_key(row): row for row in self.rows}
+        added: list[dict[str, any]] = []
+        positions: dict[int, int] | None = None
+        for row in data:
+            key = get_key(row)
+            if (held := self._keys.get(key)) is None:
+                self._keys[key] = row
+                added.append(row)
+                continue
+            if not merge_fields:
+                continue
+            merged = self._keys[key] = {**held, **row}
+            if positions is None:
+                positions = {id(item): i for i, item in enumerate(self.rows)}
+            if (i := positions.pop(id(held), None)) is None:
+                added[added.index(held)] = merged
+                continue
+            positions[id(merged)] = i
+            self.rows[i] = merged
+            self.nbytes += _row_nbytes(merged, self._days[i]) - _row_nbytes(held, self._days[i])
+            for model, models in self._models.items():
+                self.nbytes -= _model_nbytes(models[i])
+                models[i] = model.model_validate(merged)
+                self.nbytes += _model_nbytes(models[i])
+
+        if not added:
+            return
+        rows = self.rows + added
+        # Appended to an already sorted list, which Timsort re-sorts in near-linear time
+        order = sorted(range(len(rows)), key=lambda i: self._date_key(rows[i]))
+        days = self._days + [self._date_key(row)[:10] for row in added]
+        self.nbytes += sum(_row_nbytes(row, day) for row, day in zip(added, days[len(self.rows):]))
+        self.nbytes -= sys.getsizeof(self.rows) + sys.getsizeof(self._days)
+        self.rows = [rows[i] for i in order]
+        self._days = [days[i] for i in order]
+        self.nbytes += sys.getsizeof(self.rows) + sys.getsizeof(self._days)
+        for model, models in self._models.items():
+            new_models = [model.model_validate(row) for row in added]
+            self.nbytes += sum(_model_nbytes(instance) for instance in new_models) - sys.getsizeof(models)
+            combined = models + new_models
+            models[:] = [combined[i] for i in order]
+            self.nbytes += sys.getsizeof(models)
+
+    def _bounds(self, start_date: str | None, end_date: str | None) -> tuple[int, int]:
+        lo = bisect.bisect_left(self._days, start_date) if start_date else 0
+        hi = bisect.bisect_right(self._days, end_date) if end_date else len(self._days)
+        return lo, hi
+
+    def range(self, start_date: str | None = None, end_date: str | None = None) -> list[dict[str, any]]:
+        """Return rows dated within [start_date, end_date] (inclusive, by day), oldest first."""
+        lo, hi = self._bounds(start_date, end_date)
+        return self.rows[lo:hi]
+
+    def model_range(self, model: type[ModelT], start_date: str | None = None, end_date: str | None = None) -> list[ModelT]:
+        """Like range(), but return the rows as model instances.
+
+        Rows are validated into models only the first time they are requested, so
+        repeated cache hits skip validation entirely, and the models then count
+        towards nbytes. The instances are shared between callers and must be
+        treated as read-only.
+        """
+        if (models := self._models.get(model)) is None:
+            models = self._models[model] = [model.model_validate(row) for row in self.rows]
+            self.nbytes += sys.getsizeof(models) + sum(_model_nbytes(instance) for instance in models)
+        lo, hi = self._bounds(start_date, end_date)
+        return models[lo:hi]
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """In-memory cache for API responses, optionally backed by a persistent on-disk store.
+
+    Rows are held per dataset and ticker. When max_bytes is set, the least
+    recently used tickers of the largest datasets are evicted once the
+    approximate size of all cached rows exceeds it.
+    """
+
+    def __init__(self, store: ParquetStore | None = None, max_bytes: int | None = None):
+        self._store = store
+        self._max_bytes = max_bytes
+        # dataset -> ticker -> rows, each in least to most recently used order. Datasets are
+        # "prices", "financial_metrics", "insider_trades", "company_news" and "line_items/{period}"
+        self._datasets: dict[str, OrderedDict[str, SortedRows]] = {}
+        # Columnar view of each ticker's cached prices, rebuilt lazily after new prices arrive
+        self._price_series: dict[str, PriceSeries] = {}
+        # Approximate bytes held and entries evicted, per dataset
+        self._bytes: dict[str, int] = {}
+        self._evictions: dict[str, int] = {}
+        self._total_bytes = 0
+        # (dataset, ticker) pairs already read from disk, so misses are only paid once
+        self._loaded: set[tuple[str, str]] = set()
+        # ticker -> dataset -> sorted, non-overlapping [start, end, as_of] date ranges known to be fully fetched,
+        # as_of being the day the range was recorded (its end may have been partial if it was that day)
+        self._coverage: dict[str, dict[str, list[list[str]]]] = {}
+        # ticker -> (market cap, time.monotonic() when fetched) for the current market cap, which changes during the day
+        self._market_caps: dict[str, tuple[float | None, float]] = {}
+        # Guards all of the above; data is fetched for many tickers from worker threads
+        self._lock = threading.RLock()
+
+    def _get_coverage(self, ticker: str) -> dict[str, list[list[str]]]:
+        """Return the coverage map for a ticker, reading it from the persistent store on first access.
+
+        Coverage of days that have ended since it was recorded while still in
+        progress is dropped on every access (see _expire_coverage).
+        """
+        with self._lock:
+            if ticker not in self._coverage:
+                stored = self._store.load_coverage(ticker) if self._store is not None else None
+                self._coverage[ticker] = self._read_coverage(stored)
+            coverage = self._coverage[ticker]
+            self._expire_coverage(coverage)
+            return coverage
+
+    @staticmethod
+    def _read_coverage(stored: dict[str, any] | None) -> dict[str, list[list[str]]]:
+        """Turn stored coverage into [start, end, as_of] intervals, as_of being the day each was recorded.
+
+        Files written before intervals carried their own as_of have one for the
+        whole file (or none, in which case the intervals are taken as complete).
+        """
+        if not stored:
+            return {}
+        file_as_of = stored.get("as_of")
+        datasets = {}
+        for dataset, intervals in stored.get("datasets", {}).items():
+            datasets[dataset] = [
+                interval if len(interval) == 3 else [*interval, file_as_of or _shift_date(interval[1], 1)]
+                for interval in intervals
+            ]
+        return datasets
+
+    @staticmethod
+    def _expire_coverage(coverage: dict[str, list[list[str]]]):
+        """Drop coverage of days that were still in progress when it was recorded.
+
+        Data for the day a fetch ran (news, insider filings, the day's price bar)
+        may still have been incomplete, so once that day has passed it is treated
+        as uncovered and fetched again.
+        """
+        today = datetime.date.today().isoformat()
+        for dataset, intervals in coverage.items():
+            if not any(end >= as_of < today for _, end, as_of in intervals):
+                continue
+            expired = []
+            for start, end, as_of in intervals:
+                if end >= as_of < today:
+                    end = _shift_date(as_of, -1)
+                if start <= end:
+                    expired.append([start, end, as_of])
+            coverage[dataset] = expired
+
+    def get_missing_ranges(self, dataset: str, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Split [start_date, end_date] into the sub-ranges that have not been fetched yet."""
+        with self._lock:
+            missing = []
+            cursor = start_date
+            for covered_start, covered_end, _ in self._get_coverage(ticker).get(dataset, []):
+                if covered_end < cursor:
+                    continue
+                if covered_start > end_date:
+                    break
+                if covered_start > cursor:
+                    missing.append((cursor, _shift_date(covered_start, -1)))
+                cursor = _shift_date(covered_end, 1)
+                if cursor > end_date:
+                    return missing
+            missing.append((cursor, end_date))
+            return missing
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+    def get_covered_range(self, dataset: str, ticker: str, date: str) -> tuple[str, str] | None:
+        """Return the covered [start, end] range containing a date, if any."""
+        with self._lock:
+            for covered_start, covered_end, _ in self._get_coverage(ticker).get(dataset, []):
+                if covered_start <= date <= covered_end:
+                    return covered_start, covered_end
+            return None
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
-        """Merge existing and new data, avoiding duplicates based on a key field."""
-        if not existing:
-            return new_data
+    def add_coverage(self, dataset: str, ticker: str, start_date: str, end_date: str):
+        """Record that all data for [start_date, end_date] has been fetched."""
+        with self._lock:
+            # Nothing can be known about days that have not happened yet
+            today = datetime.date.today().isoformat()
+            end_date = min(end_date, today)
+            if start_date > end_date:
+                return
 
-        # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+            coverage = self._get_coverage(ticker)
+            merged: list[list[str]] = []
+            for start, end, as_of in sorted(coverage.get(dataset, []) + [[start_date, end_date, today]]):
+                # Merge overlapping and adjacent ranges; the merged range's end was recorded with the as_of of the range it came from
+                if merged and start <= _shift_date(merged[-1][1], 1):
+                    merged[-1][1:] = max(merged[-1][1:], [end, as_of])
+                else:
+                    merged.append([start, end, as_of])
+            coverage[dataset] = merged
 
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
-        return merged
+            if self._store is not None:
+                self._store.save_coverage(ticker, {"datasets": coverage})
 
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+    def _get(self, dataset: str, ticker: str, date_key: Callable[[dict[str, any]], str]) -> SortedRows | None:
+        """Return cached rows, reading them from the persistent store on first access."""
+        with self._lock:
+            cache = self._datasets.setdefault(dataset, OrderedDict())
+            if ticker in cache:
+                cache.move_to_end(ticker)
+                return cache[ticker]
+            if self._store is not None and (dataset, ticker) not in self._loaded:
+                self._loaded.add((dataset, ticker))
+                if rows := self._store.load(dataset, ticker):
+                    self._put(dataset, ticker, SortedRows(rows, date_key))
+                    return cache[ticker]
+            return None
+
+    def _set(self, dataset: str, ticker: str, data: list[dict[str, any]], key_field: str | tuple[str, ...], date_key: Callable[[dict[str, any]], str], merge_fields: bool = False):
+        """Merge new rows into the cache and write the result through to the persistent store."""
+        with self._lock:
+            if (rows := self._get(dataset, ticker, date_key)) is None:
+                rows = SortedRows([], date_key)
+                self._put(dataset, ticker, rows)
+            self._resize(dataset, ticker, rows, lambda: rows.merge(data, key_field=key_field, merge_fields=merge_fields))
+            if self._store is not None:
+                self._store.save(dataset, ticker, rows.rows)
+
+    def _resize(self, dataset: str, ticker: str, rows: SortedRows, update: Callable[[], any]) -> any:
+        """Run an update that may grow or shrink cached rows, then account for their new size."""
+        with self._lock:
+            nbytes = rows.nbytes
+            result = update()
+            # Rows evicted since they were looked up are no longer counted
+            if rows.nbytes != nbytes and self._datasets.get(dataset, {}).get(ticker) is rows:
+                self._account(dataset, rows.nbytes - nbytes)
+                self._evict(keep=(dataset, ticker))
+            return result
+
+    def _model_range(self, dataset: str, ticker: str, rows: SortedRows, model: type[ModelT], start_date: str | None = None, end_date: str | None = None) -> list[ModelT]:
+        """Return rows as model instances, counting the models towards the memory budget when they are first built."""
+        return self._resize(dataset, ticker, rows, lambda: rows.model_range(model, start_date, end_date))
+
+    def _put(self, dataset: str, ticker: str, rows: SortedRows):
+        """Store rows as the most recently used entry of a dataset, then enforce the memory budget."""
+        cache = self._datasets.setdefault(dataset, OrderedDict())
+        if (previous := cache.pop(ticker, None)) is not None:
+            self._account(dataset, -previous.nbytes)
+        cache[ticker] = rows
+        self._account(dataset, rows.nbytes)
+        self._evict(keep=(dataset, ticker))
+
+    def _account(self, dataset: str, nbytes: int):
+        self._bytes[dataset] = self._bytes.get(dataset, 0) + nbytes
+        self._total_bytes += nbytes
+
+    def _evict(self, keep: tuple[str, str]):
+        """Evict least recently used entries from the largest datasets until the cache fits its budget.
+
+        The entry that was just stored is kept even if it alone exceeds the budget,
+        since the caller is about to read it.
+        """
+        while self._max_bytes is not None and self._total_bytes > self._max_bytes:
+            candidates = [
+                (self._bytes[dataset], dataset, next(ticker for ticker in cache if (dataset, ticker) != keep))
+                for dataset, cache in self._datasets.items()
+                if len(cache) > (1 if keep[0] == dataset else 0)
+            ]
+            if not candidates:
+                return
+            _, dataset, ticker = max(candidates)
+            self._drop(dataset, ticker)
+
+    def _drop(self, dataset: str, ticker: str):
+        rows = self._datasets[dataset].pop(ticker)
+        self._account(dataset, -rows.nbytes)
+        self._evictions[dataset] = self._evictions.get(dataset, 0) + 1
+        if dataset == "prices":
+            self._price_series.pop(ticker, None)
+
+        if self._store is not None:
+            # The rows are still on disk and are read back on next access
+            self._loaded.discard((dataset, ticker))
+        else:
+            # The rows are gone for good, so they must be fetched again rather than treated as covered
+            coverage = self._coverage.get(ticker, {})
+            for key in [key for key in coverage if key == dataset or key.startswith(f"{dataset}/")]:
+                del coverage[key]
+
+    def get_stats(self) -> dict[str, any]:
+        """Return entry counts, approximate bytes held and evictions, in total and per dataset."""
+        with self._lock:
+            datasets = {
+                dataset: {"entries": len(cache), "bytes": self._bytes.get(dataset, 0), "evictions": self._evictions.get(dataset, 0)}
+                for dataset, cache in self._datasets.items()
+            }
+            return {
+                "max_bytes": self._max_bytes,
+                "bytes": self._total_bytes,
+                "entries": sum(stats["entries"] for stats in datasets.values()),
+                "evictions": sum(stats["evictions"] for stats in datasets.values()),
+                "datasets": datasets,
+            }
+
+    def get_prices(self, ticker: str, start_date: str | None = None, end_date: str | None = None, model: type[ModelT] | None = None) -> list[dict[str, any]] | list[ModelT] | None:
+        """Get cached price data within a date range, oldest first, if available. Pass a model class to get model instances instead of dicts."""
+        if cached := self._get("prices", ticker, itemgetter("time")):
+            return self._model_range("prices", ticker, cached, model, start_date, end_date) if model else cached.range(start_date, end_date)
+        return None
+
+    def get_price_series(self, ticker: str, start_date: str | None = None, end_date: str | None = None) -> PriceSeries | None:
+        """Get cached price data within a date range as a NumPy-backed series, if available."""
+        with self._lock:
+            if not (cached := self._get("prices", ticker, itemgetter("time"))):
+                return None
+            if (series := self._price_series.get(ticker)) is None:
+                series = self._price_series[ticker] = PriceSeries.from_rows(cached.rows)
+        return series.between(start_date, end_date)
 
     def set_prices(self, ticker: str, data: list[dict[str, any]]):
         """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+        with self._lock:
+            self._set("prices", ticker, data, key_field="time", date_key=itemgetter("time"))
+            self._price_series.pop(ticker, None)
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
-        """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+    def get_financial_metrics(self, ticker: str, end_date: str | None = None, model: type[ModelT] | None = None) -> list[dict[str, any]] | list[ModelT] | None:
+        """Get cached financial metrics reported on or before end_date, oldest first, if available. Pass a model class to get model instances instead of dicts."""
+        if cached := self._get("financial_metrics", ticker, itemgetter("report_period")):
+            return self._model_range("financial_metrics", ticker, cached, model, end_date=end_date) if model else cached.range(end_date=end_date)
+        return None
 
     def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
         """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+        self._set("financial_metrics", ticker, data, key_field=("report_period", "period"), date_key=itemgetter("report_period"))
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+    def get_line_items(self, ticker: str, period: str, end_date: str | None = None) -> list[dict[str, any]] | None:
+        """Get cached line items for a period type reported on or before end_date, oldest first, if available."""
+        if cached := self._get(f"line_items/{period}", ticker, itemgetter("report_period")):
+            return cached.range(end_date=end_date)
+        return None
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+    def set_line_items(self, ticker: str, period: str, data: list[dict[str, any]]):
+        """Merge new line items into cache, adding their fields to report periods that are already cached."""
+        self._set(f"line_items/{period}", ticker, data, key_field="report_period", date_key=itemgetter("report_period"), merge_fields=True)
 
-    def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+    def get_insider_trades(self, ticker: str, start_date: str | None = None, end_date: str | None = None, model: type[ModelT] | None = None) -> list[dict[str, any]] | list[ModelT] | None:
+        """Get cached insider trades within a date range, oldest first, if available. Pass a model class to get model instances instead of dicts."""
+        if cached := self._get("insider_trades", ticker, _insider_trade_date):
+            return self._model_range("insider_trades", ticker, cached, model, start_date, end_date) if model else cached.range(start_date, end_date)
+        return None
 
     def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
         """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        self._set("insider_trades", ticker, data, key_field=INSIDER_TRADE_KEY, date_key=_insider_trade_date)
 
-    def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+    def get_company_news(self, ticker: str, start_date: str | None = None, end_date: str | None = None, model: type[ModelT] | None = None) -> list[dict[str, any]] | list[ModelT] | None:
+        """Get cached company news within a date range, oldest first, if available. Pass a model class to get model instances instead of dicts."""
+        if cached := self._get("company_news", ticker, itemgetter("date")):
+            return self._model_range("company_news", ticker, cached, model, start_date, end_date) if model else cached.range(start_date, end_date)
+        return None
 
     def set_company_news(self, ticker: str, data: list[dict[str, any]]):
         """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+        self._set("company_news", ticker, data, key_field=COMPANY_NEWS_KEY, date_key=itemgetter("date"))
+
+    def get_market_cap(self, ticker: str, max_age: float) -> tuple[bool, float | None]:
+        """Get the cached current market cap if it was fetched less than max_age seconds ago, as (found, market_cap)."""
+        with self._lock:
+            if (cached := self._market_caps.get(ticker)) and time.monotonic() - cached[1] < max_age:
+                return True, cached[0]
+            return False, None
+
+    def set_market_cap(self, ticker: str, market_cap: float | None):
+        """Cache the current market cap."""
+        with self._lock:
+            self._market_caps[ticker] = (market_cap, time.monotonic())
 
 
 # Global cache instance
-_cache = Cache()
+_cache = Cache(store=create_default_store(), max_bytes=get_default_max_bytes())
 
 
 def get_cache() -> Cache:
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+# Bump to invalidate every cached response, e.g. when the key layout changes
+LLM_CACHE_VERSION = 1
+
+
+def get_llm_cache_dir() -> Path | None:
+    """Resolve the LLM response cache directory from the environment.
+
+    The cache is opt-in: set LLM_CACHE_DIR to a path to turn it on.
+    """
+    cache_dir = os.environ.get("LLM_CACHE_DIR")
+    if not cache_dir or not cache_dir.strip():
+        return None
+    return Path(cache_dir).expanduser()
+
+
+def _normalize_prompt(prompt: Any) -> Any:
+    """Reduce a prompt to its messages' roles and text, with runs of whitespace collapsed."""
+    if hasattr(prompt, "to_messages"):  # Prompt values, e.g. from ChatPromptTemplate.invoke
+        prompt = prompt.to_messages()
+    if isinstance(prompt, str):
+        return " ".join(prompt.split())
+    if isinstance(prompt, (list, tuple)):
+        return [_normalize_prompt(message) for message in prompt]
+    if hasattr(prompt, "content"):  # Messages
+        return [prompt.type, _normalize_prompt(prompt.content)]
+    if isinstance(prompt, dict):
+        return {key: _normalize_prompt(value) for key, value in sorted(prompt.items())}
+    return prompt
+
+
+class LLMResponseCache:
+    """Parsed LLM responses on disk, keyed by model, provider, output schema and prompt.
+
+    Each response is one JSON file named after its key. Entries older than ttl
+    seconds are treated as missing, and once the files exceed max_bytes the
+    least recently written ones are removed.
+    """
+
+    def __init__(self, root: str | Path | None, ttl: float | None = None, max_bytes: int = 0):
+        self.root = Path(root) if root else None
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    @staticmethod
+    def make_key(prompt: Any, model_name: str, model_provider: str, pydantic_model: Type[BaseModel]) -> str:
+        """Hash everything that determines a response into a cache key."""
+        payload = json.dumps(
+            {
+                "version": LLM_CACHE_VERSION,
+                "model": model_name,
+                "provider": str(model_provider),
+                "schema": pydantic_model.model_json_schema(),
+                "prompt": _normalize_prompt(prompt),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str, pydantic_model: Type[T]) -> T | None:
+        """Return the cached response for a key as the Pydantic model, or None."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        response = None
+        try:
+            if self.ttl is None or time.time() - path.stat().st_mtime <= self.ttl:
+                response = pydantic_model.model_validate_json(path.read_text())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable LLM cache file {path}: {e}")
+
+        with self._lock:
+            if response is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return response
+
+    def put(self, key: str, response: BaseModel):
+        """Store a response, then trim the cache to its size limit."""
+        if not self.enabled:
+            return
+
+        payload = response.model_dump_json()
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write LLM cache file {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._writes += 1
+            if self.max_bytes:
+                if self._size is None:
+                    self._size = sum(entry.stat().st_size for entry in self._entries())
+                else:
+                    self._size += len(payload)
+                if self._size > self.max_bytes:
+                    self._trim()
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*/*.json"))
+
+    def _trim(self):
+        """Remove the oldest entries until the cache is back under 90% of its size limit."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry in entries:
+            if size <= self.max_bytes * 0.9:
+                break
+            entry.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def get_stats(self) -> dict[str, any]:
+        """Return lookup hits, misses, hit rate and writes since startup."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "writes": self._writes,
+                "root": str(self.root) if self.root else None,
+            }
+
+
+# Global LLM response cache, off unless LLM_CACHE_DIR is set
+_llm_cache = LLMResponseCache(
+    get_llm_cache_dir(),
+    ttl=float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 60 * 60))) or None,
+    max_bytes=int(float(os.environ.get("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+)
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the global LLM response cache."""
+    return _llm_cache
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from src.data.models import Price
+
+
+def _day(date: str) -> np.datetime64:
+    """The day of a YYYY-MM-DD date or timestamp, as written (i.e. in its own time zone)."""
+    return np.datetime64(date[:10], "D")
+
+
+class PriceSeries:
+    """Daily OHLCV bars for one ticker held in contiguous NumPy arrays, oldest first.
+
+    Open/close/high/low share one (n, 4) float64 block so that to_df() can wrap
+    it without copying. All arrays are read-only because slices and DataFrames
+    handed out are views onto the cached data.
+    """
+
+    PRICE_COLUMNS = ("open", "close", "high", "low")
+
+    __slots__ = ("time", "day", "ohlc", "volume", "tz")
+
+    def __init__(self, time: np.ndarray, day: np.ndarray, ohlc: np.ndarray, volume: np.ndarray, tz: str | None = None):
+        # Timestamps as int64 nanoseconds since the epoch (UTC)
+        self.time = time
+        # Local day of each bar, taken from its timestamp as given, the same rule the row cache uses for date ranges
+        self.day = day
+        self.ohlc = ohlc
+        self.volume = volume
+        # Time zone the source timestamps were given in, if any
+        self.tz = tz
+        for array in (self.time, self.day, self.ohlc, self.volume):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_rows(cls, rows: list[dict[str, any]]) -> "PriceSeries":
+        """Build a series from cached price dicts, which must already be sorted by time."""
+        if not rows:
+            return cls.empty()
+        times = pd.to_datetime([row["time"] for row in rows]).as_unit("ns")
+        days = np.array([row["time"][:10] for row in rows], dtype="datetime64[D]")
+        ohlc = np.array([[row[column] for column in cls.PRICE_COLUMNS] for row in rows], dtype=np.float64).reshape(len(rows), len(cls.PRICE_COLUMNS))
+        volume = np.array([row["volume"] for row in rows], dtype=np.int64)
+        tz = str(times.tz) if times.tz is not None else None
+        return cls(times.asi8.copy(), days, ohlc, volume, tz)
+
+    @classmethod
+    def from_prices(cls, prices: list[Price]) -> "PriceSeries":
+        """Build a series from Price models, in any order."""
+        if not prices:
+            return cls.empty()
+        return cls.from_rows(sorted((p.model_dump() for p in prices), key=lambda row: row["time"]))
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        """A series with no bars."""
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype="datetime64[D]"), np.empty((0, len(cls.PRICE_COLUMNS))), np.empty(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.ohlc[:, 0]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.ohlc[:, 1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.ohlc[:, 2]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.ohlc[:, 3]
+
+    def between(self, start_date: str | None = None, end_date: str | None = None) -> "PriceSeries":
+        """Return the bars dated within [start_date, end_date] (inclusive, by day) as a view."""
+        lo = int(np.searchsorted(self.day, _day(start_date), side="left")) if start_date else 0
+        hi = int(np.searchsorted(self.day, _day(end_date), side="right")) if end_date else len(self.day)
+        return PriceSeries(self.time[lo:hi], self.day[lo:hi], self.ohlc[lo:hi], self.volume[lo:hi], self.tz)
+
+    def index(self) -> pd.DatetimeIndex:
+        """Bar timestamps as a DatetimeIndex named "Date"."""
+        index = pd.DatetimeIndex(self.time.view("datetime64[ns]"), name="Date")
+        # The stored nanoseconds are UTC, so they are converted to the source time zone rather than relabelled with it
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz else index
+
+    def to_df(self) -> pd.DataFrame:
+        """Return the bars as a DataFrame indexed by date, wrapping the price block without copying it."""
+        df = pd.DataFrame(self.ohlc, index=self.index(), columns=list(self.PRICE_COLUMNS), copy=False)
+        df["volume"] = self.volume
+        return df
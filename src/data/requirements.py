@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DataRequest:
+    """A dataset an agent reads for every ticker, described by the arguments it passes to src.tools.api.
+
+    dataset is one of "prices", "financial_metrics", "line_items",
+    "insider_trades", "company_news" or "market_cap".
+
+    For insider trades and company news, the agent either asks for the latest
+    `limit` records (the default), records since the run's start date
+    (since_run_start) or records from the last `lookback_days` days before the
+    end date. Prices are always read for the run's date range.
+    """
+
+    dataset: str
+    period: str = "ttm"
+    limit: int = 10
+    line_items: tuple[str, ...] = ()
+    since_run_start: bool = False
+    lookback_days: int | None = None
+
+
+# Price history for the run's date range, read by the risk manager and price-based analysts
+PRICES = DataRequest("prices")
+
+# Market cap as of the end date
+MARKET_CAP = DataRequest("market_cap")
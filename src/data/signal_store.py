@@ -0,0 +1,194 @@
+import datetime
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from src.data.store import get_default_cache_dir
+from src.utils.decision_policy import LLM_SKIP_MARGIN
+from src.utils.degradation import track_degradation
+from src.utils.progress import progress
+from src.utils.tracing import annotate
+
+# Bump to invalidate every stored signal, e.g. when the key layout changes. Keys hash the run's
+# dates rather than the data fetched for them, so also bump it (or clear the store) when the
+# financial data API has corrected past data that stored signals were computed from.
+SIGNAL_STORE_VERSION = 1
+
+
+def get_default_signal_dir() -> Path | None:
+    """Resolve the on-disk signal store directory from the environment.
+
+    Set AGENT_SIGNAL_CACHE_DIR to a path to choose the location, or to an empty
+    string to keep signals in memory only. Defaults to a "signals" directory in
+    the financial data cache directory.
+    """
+    signal_dir = os.environ.get("AGENT_SIGNAL_CACHE_DIR")
+    if signal_dir is None:
+        cache_dir = get_default_cache_dir()
+        return cache_dir / "signals" if cache_dir else None
+    if not signal_dir.strip():
+        return None
+    return Path(signal_dir).expanduser()
+
+
+class SignalStore:
+    """Analyst signals keyed by a hash of everything that determines them.
+
+    Each signal is stored as one JSON file named after its key, so entries are
+    never updated in place and concurrent writers of the same key write the
+    same content. Without a root directory signals are kept in memory only.
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root else None
+        self._lock = threading.Lock()
+        # Serialized signals, so every caller gets its own copy
+        self._memory: dict[str, str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    @staticmethod
+    def make_key(**inputs) -> str:
+        """Hash the inputs of a signal into a store key."""
+        payload = json.dumps({"version": SIGNAL_STORE_VERSION, **inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Return the stored signal for a key, or None."""
+        with self._lock:
+            payload = self._memory.get(key)
+        if payload is None and self.root:
+            try:
+                payload = self._path(key).read_text()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: ignoring unreadable signal file {self._path(key)}: {e}")
+
+        try:
+            signal = json.loads(payload) if payload is not None else None
+        except ValueError as e:
+            print(f"Warning: ignoring corrupt signal file {self._path(key)}: {e}")
+            signal = None
+
+        with self._lock:
+            if signal is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._memory[key] = payload
+        return signal
+
+    def put(self, key: str, signal: dict):
+        """Store a signal; signals that are not JSON-serializable are skipped with a warning."""
+        try:
+            payload = json.dumps(signal)
+        except (TypeError, ValueError) as e:
+            print(f"Warning: not storing signal {key}: {e}")
+            return
+
+        with self._lock:
+            self._memory[key] = payload
+            self._writes += 1
+        if not self.root:
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not persist signal {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def get_stats(self) -> dict[str, any]:
+        """Return lookup hits, misses, hit rate and writes since startup."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "writes": self._writes,
+                "root": str(self.root) if self.root else None,
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def _module_fingerprint(module_name: str) -> str:
+    """Hash of a module's source, so that editing an agent (e.g. its prompt) invalidates its stored signals."""
+    try:
+        source = inspect.getsource(sys.modules[module_name])
+    except (KeyError, OSError, TypeError):
+        return module_name
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def memoize_signals(
+    agent_name: str,
+    state: dict,
+    analyze: Callable[[str], Awaitable[dict | None]],
+    uses_llm: bool = True,
+) -> Callable[[str], Awaitable[dict | None]]:
+    """Wrap an agent's per-ticker analysis so that signals it already produced are reused.
+
+    A signal is keyed by the agent (and its source code), the ticker, the run's
+    date range and, for LLM-backed agents, the model. Financial data as of a past
+    date does not change, so the dates stand in for the data the agent reads;
+    runs ending today or later are not memoized since their data is still moving.
+    Failed analyses (None) are not stored, and neither are degraded ones: those
+    that fell back to a default, e.g. after an LLM error, or that ran on past
+    their node's deadline (see src/utils/degradation.py).
+    """
+    data = state["data"]
+    if data["end_date"] >= datetime.date.today().isoformat():
+        return analyze
+
+    metadata = state["metadata"]
+    inputs = {
+        "agent": agent_name,
+        "code": _module_fingerprint(analyze.__module__),
+        "start_date": data["start_date"],
+        "end_date": data["end_date"],
+    }
+    if uses_llm:
+        inputs["model"] = [metadata["model_provider"], metadata["model_name"]]
+        if LLM_SKIP_MARGIN:
+            # Rule-based signals stand in for LLM ones only under the same policy
+            inputs["llm_skip_margin"] = LLM_SKIP_MARGIN
+
+    async def memoized(ticker: str) -> dict | None:
+        key = _signal_store.make_key(ticker=ticker, **inputs)
+        if (signal := _signal_store.get(key)) is not None:
+            progress.update_status(agent_name, ticker, "Done (stored signal)")
+            annotate(signal_store="hit")
+            return signal
+
+        with track_degradation() as degradation:
+            signal = await analyze(ticker)
+        if signal is not None and not degradation.degraded:
+            _signal_store.put(key, signal)
+        return signal
+
+    return memoized
+
+
+# Global signal store
+_signal_store = SignalStore(get_default_signal_dir())
+
+
+def get_signal_store() -> SignalStore:
+    """Get the global signal store."""
+    return _signal_store
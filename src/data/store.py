@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; without it the cache stays in-memory only
+    pa = None
+    pq = None
+
+
+def get_default_cache_dir() -> Path | None:
+    """Resolve the on-disk cache directory from the environment.
+
+    Set FINANCIAL_DATA_CACHE_DIR to a path to choose the location, or to an
+    empty string to turn persistence off.
+    """
+    cache_dir = os.environ.get("FINANCIAL_DATA_CACHE_DIR")
+    if cache_dir is None:
+        return Path.home() / ".cache" / "ai-hedge-fund"
+    if not cache_dir.strip():
+        return None
+    return Path(cache_dir).expanduser()
+
+
+def _temp_path(path: Path) -> Path:
+    """Create an empty temp file next to path, unique to this writer, to write and then move over path.
+
+    Writers of the same file in other threads or processes each get their own,
+    so none can move another's half-written file into place.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.{os.getpid()}.", suffix=".tmp", delete=False) as f:
+        return Path(f.name)
+
+
+class ParquetStore:
+    """Columnar on-disk store with one Parquet file per dataset and ticker."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the optional pyarrow dependency is installed."""
+        return pq is not None
+
+    def _path(self, dataset: str, ticker: str) -> Path:
+        # Tickers like "BRK/B" must not escape the dataset directory
+        safe_ticker = ticker.replace(os.sep, "_").replace("/", "_")
+        return self.root / dataset / f"{safe_ticker}.parquet"
+
+    def load(self, dataset: str, ticker: str) -> list[dict[str, any]] | None:
+        """Read all rows for a ticker."""
+        path = self._path(dataset, ticker)
+        if not path.exists():
+            return None
+        try:
+            table = pq.read_table(path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Warning: ignoring unreadable cache file {path}: {e}")
+            return None
+        return table.to_pylist()
+
+    def save(self, dataset: str, ticker: str, rows: list[dict[str, any]]):
+        """Write all rows for a ticker, replacing the previous file atomically."""
+        if not rows:
+            return
+
+        # Rows may carry different keys (e.g. line items), so build the column set from all of them
+        columns: dict[str, None] = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+
+        path = self._path(dataset, ticker)
+        tmp_path = None
+        try:
+            tmp_path = _temp_path(path)
+            table = pa.Table.from_pydict({column: [row.get(column) for row in rows] for column in columns})
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Warning: could not persist {dataset} cache for {ticker}: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def _coverage_path(self, ticker: str) -> Path:
+        return self._path("coverage", ticker).with_suffix(".json")
+
+    def load_coverage(self, ticker: str) -> dict[str, any] | None:
+        """Read the covered date ranges recorded for a ticker."""
+        path = self._coverage_path(ticker)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: ignoring unreadable coverage file {path}: {e}")
+            return None
+
+    def save_coverage(self, ticker: str, coverage: dict[str, any]):
+        """Write the covered date ranges for a ticker, replacing the previous file atomically."""
+        path = self._coverage_path(ticker)
+        tmp_path = None
+        try:
+            tmp_path = _temp_path(path)
+            with open(tmp_path, "w") as f:
+                json.dump(coverage, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not persist coverage for {ticker}: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+
+def create_default_store() -> ParquetStore | None:
+    """Create the store used by the global cache, or None if persistence is disabled."""
+    if not ParquetStore.is_available():
+        return None
+    cache_dir = get_default_cache_dir()
+    if cache_dir is None:
+        return None
+    return ParquetStore(cache_dir)
@@ -0,0 +1,27 @@
+from src.data.requirements import DataRequest
+from src.graph.state import AgentState
+from src.tools.api import aprefetch_requests, merge_requests
+from src.utils.progress import progress
+
+PREFETCH_NODE = "data_prefetch_node"
+
+
+def create_prefetch_node(requirements: list[DataRequest]):
+    """Create a workflow node that fetches the data the agents will read before they run.
+
+    The node loads the union of the agents' data requests for every ticker in
+    parallel into the shared data cache, so the agents' own data calls are
+    answered from memory and they only spend time on analysis.
+    """
+    requirements = merge_requests(requirements)
+
+    async def prefetch_data(state: AgentState):
+        data = state["data"]
+        progress.update_status(PREFETCH_NODE, None, f"Fetching data for {len(data['tickers'])} tickers")
+        errors = await aprefetch_requests(data["tickers"], requirements, data["start_date"], data["end_date"])
+        # Agents fetch whatever failed here on their own and report missing data per ticker
+        progress.update_status(PREFETCH_NODE, None, f"Done ({len(errors)} failed)" if errors else "Done")
+        # Nothing to add to the state, but the graph requires every node to update a key
+        return {"data": {}}
+
+    return prefetch_data
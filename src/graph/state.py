@@ -11,10 +11,29 @@ def merge_dicts(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
     return {**a, **b}
 
 
+# Data entries keyed by agent, to which each agent adds its own entry
+AGENT_KEYED_DATA = ("analyst_signals", "skipped_agents")
+
+
+def merge_data(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
+    """Merge a node's data update into the state's data.
+
+    Agents return only their own signals, as {"analyst_signals": {agent: signals}}
+    (or {"skipped_agents": {agent: reason}}), so those entries are merged one level
+    deeper rather than replaced. The signal dicts themselves are kept by
+    reference, never copied or serialized.
+    """
+    merged = {**a, **b}
+    for key in AGENT_KEYED_DATA:
+        if key in a and key in b:
+            merged[key] = {**a[key], **b[key]}
+    return merged
+
+
 # Define agent state
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
-    data: Annotated[dict[str, any], merge_dicts]
+    data: Annotated[dict[str, any], merge_data]
     metadata: Annotated[dict[str, any], merge_dicts]
 
 
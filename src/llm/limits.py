@@ -0,0 +1,173 @@
+"""Concurrency and rate limits for LLM calls, per provider and model"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Calls to one model in flight at once, unless configured otherwise; a local Ollama server is easily overloaded
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_OLLAMA_MAX_CONCURRENCY = 2
+
+
+class TokenBucket:
+    """Rate limiter that allows `rate` calls per second on average, in bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, and return how many seconds to wait before it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Slots:
+    """A fixed number of slots handed out first come, first served to threads and event loops alike.
+
+    A released slot goes straight to the longest waiting caller: a thread is
+    woken through its Event, a coroutine through a future on its own loop.
+    """
+
+    def __init__(self, size: int):
+        self._free = size
+        # threading.Event for a waiting thread, (loop, future) for a waiting coroutine
+        self._waiters: deque[threading.Event | tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over just as the wait was cancelled, so pass it on
+            self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                loop, future = waiter
+                try:
+                    loop.call_soon_threadsafe(_resolve, future)
+                    return
+                except RuntimeError:
+                    # The waiter's loop has been closed; try the next one
+                    continue
+            self._free += 1
+
+
+class LLMLimiter:
+    """Bounds the calls to one provider and model: at most max_concurrency in flight, started at most requests_per_minute.
+
+    One limiter is shared by every thread and event loop in the process. Calls
+    get a slot in the order they asked for one, and wait for the rate limit by
+    sleeping exactly until their token is due.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: float | None = None):
+        self.max_concurrency = max_concurrency
+        self._slots = _Slots(max_concurrency)
+        self._bucket = TokenBucket(requests_per_minute / 60) if requests_per_minute else None
+
+    def run(self, call: Callable[[], T]) -> T:
+        """Make a blocking call once the limits allow it."""
+        self._slots.acquire()
+        try:
+            if self._bucket and (delay := self._bucket.reserve()):
+                time.sleep(delay)
+            return call()
+        finally:
+            self._slots.release()
+
+    async def arun(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Await a call once the limits allow it, without blocking the event loop while waiting."""
+        await self._slots.aacquire()
+        try:
+            if self._bucket and (delay := self._bucket.reserve()):
+                await asyncio.sleep(delay)
+            return await call()
+        finally:
+            self._slots.release()
+
+
+def _env_number(name: str, provider: str) -> float | None:
+    """A limit from the environment: the provider-specific variable (e.g. NAME_OLLAMA) wins over NAME."""
+    value = os.environ.get(f"{name}_{provider.upper()}") or os.environ.get(name)
+    return float(value) if value else None
+
+
+# Limits set by configure_llm_limits, which take precedence over the environment
+_configured: dict[str, float | None] = {"max_concurrency": None, "requests_per_minute": None}
+_limiters: dict[tuple[str, str], LLMLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_llm_limits(max_concurrency: int | None = None, requests_per_minute: float | None = None):
+    """Set the limits of every provider and model, e.g. from AIConfig; None keeps the environment's or the default.
+
+    Calls already waiting keep the limits they started with.
+    """
+    with _limiters_lock:
+        _configured.update(max_concurrency=max_concurrency, requests_per_minute=requests_per_minute)
+        _limiters.clear()
+
+
+def get_llm_limiter(model_provider: str, model_name: str) -> LLMLimiter:
+    """Get the limiter shared by all calls to a provider's model.
+
+    The limits come from configure_llm_limits, else from LLM_MAX_CONCURRENCY
+    and LLM_REQUESTS_PER_MINUTE (or their per-provider variants such as
+    LLM_MAX_CONCURRENCY_OLLAMA), else from the defaults; there is no rate
+    limit by default.
+    """
+    provider = str(getattr(model_provider, "value", model_provider))
+    key = (provider, model_name)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            default_concurrency = DEFAULT_OLLAMA_MAX_CONCURRENCY if provider == "Ollama" else DEFAULT_MAX_CONCURRENCY
+            max_concurrency = _configured["max_concurrency"] or _env_number("LLM_MAX_CONCURRENCY", provider) or default_concurrency
+            requests_per_minute = _configured["requests_per_minute"] or _env_number("LLM_REQUESTS_PER_MINUTE", provider)
+            limiter = _limiters[key] = LLMLimiter(int(max_concurrency), requests_per_minute)
+        return limiter
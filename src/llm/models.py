@@ -1,13 +1,15 @@
+import asyncio
+import inspect
 import os
-from langchain_anthropic import ChatAnthropic
-from langchain_deepseek import ChatDeepSeek
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
+import threading
+import weakref
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
 from enum import Enum
 from pydantic import BaseModel
-from typing import Tuple
+from typing import Tuple, Type
+
+from src.utils.parallel import register_loop_cleanup
 
 
 class ModelProvider(str, Enum):
@@ -96,8 +98,11 @@ def get_model_info(model_name: str) -> LLMModel | None:
     return next((model for model in all_models if model.model_name == model_name), None)
 
 
-def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | ChatGroq | ChatOllama | None:
+def get_model(model_name: str, model_provider: ModelProvider) -> BaseChatModel | None:
+    # Each provider's SDK is imported only when one of its models is used, as importing them all is slow
     if model_provider == ModelProvider.GROQ:
+        from langchain_groq import ChatGroq
+
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             # Print error to console
@@ -105,6 +110,8 @@ def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | Ch
             raise ValueError("Groq API key not found.  Please make sure GROQ_API_KEY is set in your .env file.")
         return ChatGroq(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.OPENAI:
+        from langchain_openai import ChatOpenAI
+
         # Get and validate API key
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -113,24 +120,32 @@ def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | Ch
             raise ValueError("OpenAI API key not found.  Please make sure OPENAI_API_KEY is set in your .env file.")
         return ChatOpenAI(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.ANTHROPIC:
+        from langchain_anthropic import ChatAnthropic
+
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure ANTHROPIC_API_KEY is set in your .env file.")
             raise ValueError("Anthropic API key not found.  Please make sure ANTHROPIC_API_KEY is set in your .env file.")
         return ChatAnthropic(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.DEEPSEEK:
+        from langchain_deepseek import ChatDeepSeek
+
         api_key = os.getenv("DEEPSEEK_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure DEEPSEEK_API_KEY is set in your .env file.")
             raise ValueError("DeepSeek API key not found.  Please make sure DEEPSEEK_API_KEY is set in your .env file.")
         return ChatDeepSeek(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.GEMINI:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure GOOGLE_API_KEY is set in your .env file.")
             raise ValueError("Google API key not found.  Please make sure GOOGLE_API_KEY is set in your .env file.")
         return ChatGoogleGenerativeAI(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.OLLAMA:
+        from langchain_ollama import ChatOllama
+
         # For Ollama, we use a base URL instead of an API key
         # Check if OLLAMA_HOST is set (for Docker on macOS)
         ollama_host = os.getenv("OLLAMA_HOST", "localhost")
@@ -142,3 +157,61 @@ def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | Ch
             base_url=base_url,
             num_thread=num_thread,
         )
+
+
+# Models handed out by get_pooled_model, reused so that their HTTP connections stay alive between calls.
+# Async clients are bound to the event loop they first ran on, so models called with ainvoke are pooled per loop.
+_model_pool: dict[tuple, Runnable] = {}
+_async_model_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, Runnable]]" = weakref.WeakKeyDictionary()
+_model_pool_lock = threading.Lock()
+
+
+def get_pooled_model(model_name: str, model_provider: ModelProvider, pydantic_model: Type[BaseModel] | None = None, for_async: bool = False) -> Runnable:
+    """Get a shared model for the provider and model name, with JSON-mode structured output for pydantic_model if given.
+
+    Models are built once per (provider, model, schema) and reused by every
+    caller; the structured variants of a model share its client. Pass
+    for_async=True when the model will be awaited, to get the running event
+    loop's own instance.
+    """
+    with _model_pool_lock:
+        if for_async:
+            pool = _async_model_pools.setdefault(asyncio.get_running_loop(), {})
+        else:
+            pool = _model_pool
+
+        model = pool.get((model_provider, model_name, pydantic_model))
+        if model is None:
+            model = pool.get((model_provider, model_name, None))
+            if model is None:
+                model = pool[(model_provider, model_name, None)] = get_model(model_name, model_provider)
+            if pydantic_model is not None:
+                model = pool[(model_provider, model_name, pydantic_model)] = model.with_structured_output(pydantic_model, method="json_mode")
+        return model
+
+
+@register_loop_cleanup
+async def aclose_pooled_models():
+    """Close the HTTP clients of the running event loop's pooled models and drop the pool.
+
+    run_sync calls this before shutting down each loop it starts; the clients
+    would otherwise keep their connections, and the loop, alive.
+    """
+    with _model_pool_lock:
+        pool = _async_model_pools.pop(asyncio.get_running_loop(), {})
+    # Structured variants share their base model's clients, so only the base models are closed
+    for model in pool.values():
+        if isinstance(model, BaseChatModel):
+            await _aclose_clients(model)
+
+
+async def _aclose_clients(model: BaseChatModel):
+    """Close a chat model's async provider clients, wherever its integration keeps them."""
+    for name in ("root_async_client", "async_client", "_async_client"):
+        client = getattr(model, name, None)
+        if client is not None and not callable(getattr(client, "close", None)):
+            # e.g. ChatGroq's async_client is a resource of the AsyncGroq client that owns the connections
+            client = getattr(client, "_client", None)
+        close = getattr(client, "close", None)
+        if inspect.iscoroutinefunction(close):
+            await close()
@@ -1,3 +1,6 @@
+import asyncio
+import functools
+import os
 import sys
 
 from dotenv import load_dotenv
@@ -9,8 +12,12 @@ from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
 from src.utils.display import print_trading_output
-from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
+from src.utils.analysts import ANALYST_CONFIG, ANALYST_ORDER, get_analyst_node, get_data_requirements
+from src.graph.prefetch import PREFETCH_NODE, create_prefetch_node
 from src.utils.progress import progress
+from src.utils.parallel import run_sync
+from src.utils.tracing import Tracer, save_trace, traced_node
+from src.utils.deadline import DEFAULT_RUN_TIMEOUT, deadline_scope, run_deadlines, skip_on_deadline
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
 from src.utils.ollama import ensure_ollama_and_model
 
@@ -25,6 +32,9 @@ load_dotenv()
 
 init(autoreset=True)
 
+# Upper bound on portfolios whose risk and portfolio management run at once in a batch
+MAX_PORTFOLIO_WORKERS = int(os.environ.get("HEDGE_FUND_MAX_PORTFOLIO_WORKERS", "8"))
+
 
 def parse_hedge_fund_response(response):
     """Parses a JSON string and returns a dictionary."""
@@ -51,49 +61,189 @@ def run_hedge_fund(
     selected_analysts: list[str] = [],
     model_name: str = "gpt-4o",
     model_provider: str = "OpenAI",
+    timeout: float | None = DEFAULT_RUN_TIMEOUT,
+):
+    # The agents are async, so run the workflow on an event loop of its own
+    return run_sync(
+        arun_hedge_fund(
+            tickers,
+            start_date,
+            end_date,
+            portfolio,
+            show_reasoning=show_reasoning,
+            selected_analysts=selected_analysts,
+            model_name=model_name,
+            model_provider=model_provider,
+            timeout=timeout,
+        )
+    )
+
+
+async def arun_hedge_fund(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    portfolio: dict,
+    show_reasoning: bool = False,
+    selected_analysts: list[str] = [],
+    model_name: str = "gpt-4o",
+    model_provider: str = "OpenAI",
+    timeout: float | None = DEFAULT_RUN_TIMEOUT,
 ):
+    """Async variant of run_hedge_fund, so that many runs can share one event loop.
+
+    With a timeout (seconds), analysts that have not finished within their share
+    of it are skipped and listed in the result's "skipped_agents", and the
+    portfolio manager decides on the signals that did arrive.
+    """
     # Start progress tracking
     progress.start()
 
     try:
-        # Create a new workflow if analysts are customized
-        if selected_analysts:
-            workflow = create_workflow(selected_analysts)
-            agent = workflow.compile()
-        else:
-            agent = app
-
-        final_state = agent.invoke(
-            {
-                "messages": [
-                    HumanMessage(
-                        content="Make trading decisions based on the provided data.",
-                    )
-                ],
-                "data": {
-                    "tickers": tickers,
-                    "portfolio": portfolio,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "analyst_signals": {},
-                },
-                "metadata": {
-                    "show_reasoning": show_reasoning,
-                    "model_name": model_name,
-                    "model_provider": model_provider,
-                },
-            },
+        # Reuse the compiled workflow for this selection of analysts (all analysts if none selected)
+        agent = get_compiled_workflow(selected_analysts or None)
+
+        # Time every node, ticker and data/LLM call of this run, and bound them by its deadline
+        tracer = Tracer()
+        deadlines = run_deadlines(timeout)
+        with tracer.activate(), deadline_scope(deadlines["deadline"]):
+            final_state = await agent.ainvoke(_initial_state(tickers, start_date, end_date, portfolio, show_reasoning, model_name, model_provider, deadlines))
+
+        return _run_result(final_state, tracer)
+    finally:
+        # Stop progress tracking
+        progress.stop()
+
+
+def run_hedge_fund_batch(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    portfolios: list[dict],
+    show_reasoning: bool = False,
+    selected_analysts: list[str] = [],
+    model_name: str = "gpt-4o",
+    model_provider: str = "OpenAI",
+    timeout: float | None = DEFAULT_RUN_TIMEOUT,
+    max_workers: int = MAX_PORTFOLIO_WORKERS,
+):
+    # The agents are async, so run the workflows on an event loop of their own
+    return run_sync(
+        arun_hedge_fund_batch(
+            tickers,
+            start_date,
+            end_date,
+            portfolios,
+            show_reasoning=show_reasoning,
+            selected_analysts=selected_analysts,
+            model_name=model_name,
+            model_provider=model_provider,
+            timeout=timeout,
+            max_workers=max_workers,
         )
+    )
+
+
+async def arun_hedge_fund_batch(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    portfolios: list[dict],
+    show_reasoning: bool = False,
+    selected_analysts: list[str] = [],
+    model_name: str = "gpt-4o",
+    model_provider: str = "OpenAI",
+    timeout: float | None = DEFAULT_RUN_TIMEOUT,
+    max_workers: int = MAX_PORTFOLIO_WORKERS,
+):
+    """Run the hedge fund for several portfolios that share the same tickers and dates.
+
+    The analysts only depend on the tickers and dates, so they run once; risk
+    and portfolio management then run for each portfolio, up to max_workers at
+    a time, on the shared signals. Returns the shared "analyst_signals",
+    "skipped_agents" and "timing" of the analysts, and under "results" one
+    result per portfolio, in order, as run_hedge_fund would return it.
+    """
+    # Start progress tracking
+    progress.start()
+
+    try:
+        deadlines = run_deadlines(timeout)
+
+        # Analyze the tickers once for all portfolios; the analysts do not read the portfolio
+        tracer = Tracer()
+        with tracer.activate(), deadline_scope(deadlines["deadline"]):
+            analysis = await get_compiled_analyst_workflow(selected_analysts or None).ainvoke(
+                _initial_state(tickers, start_date, end_date, None, show_reasoning, model_name, model_provider, deadlines)
+            )
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def manage_portfolio(portfolio: dict) -> dict:
+            async with semaphore:
+                state = _initial_state(tickers, start_date, end_date, portfolio, show_reasoning, model_name, model_provider, deadlines)
+                # Agents add their own entries to copies of these, so every portfolio can start from the same dicts
+                state["data"]["analyst_signals"] = analysis["data"]["analyst_signals"]
+                state["data"]["skipped_agents"] = analysis["data"]["skipped_agents"]
+
+                portfolio_tracer = Tracer()
+                with portfolio_tracer.activate(), deadline_scope(deadlines["deadline"]):
+                    final_state = await get_compiled_portfolio_workflow().ainvoke(state)
+                return _run_result(final_state, portfolio_tracer)
 
         return {
-            "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
-            "analyst_signals": final_state["data"]["analyst_signals"],
+            "analyst_signals": analysis["data"]["analyst_signals"],
+            "skipped_agents": analysis["data"]["skipped_agents"],
+            "timing": tracer.to_dict(),
+            "results": await asyncio.gather(*(manage_portfolio(portfolio) for portfolio in portfolios)),
         }
     finally:
         # Stop progress tracking
         progress.stop()
 
 
+def _initial_state(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    portfolio: dict | None,
+    show_reasoning: bool,
+    model_name: str,
+    model_provider: str,
+    deadlines: dict,
+) -> dict:
+    return {
+        "messages": [
+            HumanMessage(
+                content="Make trading decisions based on the provided data.",
+            )
+        ],
+        "data": {
+            "tickers": tickers,
+            "portfolio": portfolio,
+            "start_date": start_date,
+            "end_date": end_date,
+            "analyst_signals": {},
+            "skipped_agents": {},
+        },
+        "metadata": {
+            "show_reasoning": show_reasoning,
+            "model_name": model_name,
+            "model_provider": model_provider,
+            **deadlines,
+        },
+    }
+
+
+def _run_result(final_state: dict, tracer: Tracer) -> dict:
+    return {
+        "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
+        "analyst_signals": final_state["data"]["analyst_signals"],
+        "skipped_agents": final_state["data"]["skipped_agents"],
+        "timing": tracer.to_dict(),
+    }
+
+
 def start(state: AgentState):
     """Initialize the workflow with the input message."""
     return state
@@ -104,32 +254,103 @@ def create_workflow(selected_analysts=None):
     workflow = StateGraph(AgentState)
     workflow.add_node("start_node", start)
 
-    # Get analyst nodes from the configuration
-    analyst_nodes = get_analyst_nodes()
+    # Add the data prefetch and the selected analysts, then risk and portfolio management
+    analyst_nodes = _add_analysts(workflow, selected_analysts)
+    _add_portfolio_management(workflow, after=analyst_nodes)
+
+    workflow.set_entry_point("start_node")
+    return workflow
+
+
+def create_analyst_workflow(selected_analysts=None):
+    """Create the workflow that only runs the selected analysts, producing signals that do not depend on a portfolio."""
+    workflow = StateGraph(AgentState)
+    workflow.add_node("start_node", start)
+
+    for node_name in _add_analysts(workflow, selected_analysts):
+        workflow.add_edge(node_name, END)
+
+    workflow.set_entry_point("start_node")
+    return workflow
+
+
+def create_portfolio_workflow():
+    """Create the workflow that turns analyst signals already in the state into decisions for its portfolio."""
+    workflow = StateGraph(AgentState)
+    workflow.add_node("start_node", start)
+
+    _add_portfolio_management(workflow, after=["start_node"])
+
+    workflow.set_entry_point("start_node")
+    return workflow
 
+
+def _add_analysts(workflow: StateGraph, selected_analysts=None) -> list[str]:
+    """Add the data prefetch and the selected analysts after the start node, and return the analysts' node names."""
     # Default to all analysts if none selected
     if selected_analysts is None:
-        selected_analysts = list(analyst_nodes.keys())
+        selected_analysts = list(ANALYST_CONFIG.keys())
+
+    # Fetch the data every selected analyst needs once, in parallel, before they run
+    workflow.add_node(PREFETCH_NODE, traced_node(PREFETCH_NODE, skip_on_deadline(PREFETCH_NODE, create_prefetch_node(get_data_requirements(selected_analysts)))))
+    workflow.add_edge("start_node", PREFETCH_NODE)
+
     # Add selected analyst nodes
+    node_names = []
     for analyst_key in selected_analysts:
-        node_name, node_func = analyst_nodes[analyst_key]
-        workflow.add_node(node_name, node_func)
-        workflow.add_edge("start_node", node_name)
+        node_name, node_func = get_analyst_node(analyst_key)
+        workflow.add_node(node_name, traced_node(node_name, skip_on_deadline(node_name, node_func)))
+        workflow.add_edge(PREFETCH_NODE, node_name)
+        node_names.append(node_name)
+    return node_names
 
-    # Always add risk and portfolio management
-    workflow.add_node("risk_management_agent", risk_management_agent)
-    workflow.add_node("portfolio_management_agent", portfolio_management_agent)
 
-    # Connect selected analysts to risk management
-    for analyst_key in selected_analysts:
-        node_name = analyst_nodes[analyst_key][0]
+def _add_portfolio_management(workflow: StateGraph, after: list[str]):
+    """Add risk management, run after the given nodes, then portfolio management."""
+    workflow.add_node("risk_management_agent", traced_node("risk_management_agent", skip_on_deadline("risk_management_agent", risk_management_agent, deadline_key="deadline")))
+    workflow.add_node("portfolio_management_agent", traced_node("portfolio_management_agent", portfolio_management_agent))
+
+    for node_name in after:
         workflow.add_edge(node_name, "risk_management_agent")
 
     workflow.add_edge("risk_management_agent", "portfolio_management_agent")
     workflow.add_edge("portfolio_management_agent", END)
 
-    workflow.set_entry_point("start_node")
-    return workflow
+
+def get_compiled_workflow(selected_analysts: list[str] | None = None):
+    """Return the compiled workflow for a selection of analysts, compiling each distinct selection only once."""
+    return _compile_workflow(_analyst_selection(selected_analysts))
+
+
+def get_compiled_analyst_workflow(selected_analysts: list[str] | None = None):
+    """Return the compiled analysts-only workflow for a selection of analysts, compiling each distinct selection only once."""
+    return _compile_analyst_workflow(_analyst_selection(selected_analysts))
+
+
+@functools.lru_cache(maxsize=1)
+def get_compiled_portfolio_workflow():
+    """Return the compiled risk and portfolio management workflow."""
+    return create_portfolio_workflow().compile()
+
+
+def _analyst_selection(selected_analysts: list[str] | None) -> frozenset[str]:
+    return frozenset(ANALYST_CONFIG.keys() if selected_analysts is None else selected_analysts)
+
+
+def _ordered(selected_analysts: frozenset[str]) -> list[str]:
+    # Add nodes in the configured analyst order, whatever order the selection came in; unknown keys still fail when the workflow is created
+    analyst_keys = ANALYST_CONFIG.keys()
+    return [key for key in analyst_keys if key in selected_analysts] + sorted(selected_analysts - analyst_keys)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_workflow(selected_analysts: frozenset[str]):
+    return create_workflow(_ordered(selected_analysts)).compile()
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_analyst_workflow(selected_analysts: frozenset[str]):
+    return create_analyst_workflow(_ordered(selected_analysts)).compile()
 
 
 if __name__ == "__main__":
@@ -146,6 +367,8 @@ if __name__ == "__main__":
     parser.add_argument("--show-reasoning", action="store_true", help="Show reasoning from each agent")
     parser.add_argument("--show-agent-graph", action="store_true", help="Show the agent graph")
     parser.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
+    parser.add_argument("--trace-file", type=str, help="Write the run's timing spans to this JSON file")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_RUN_TIMEOUT, help="Seconds the run may take; analysts that do not finish in time are skipped")
 
     args = parser.parse_args()
 
@@ -237,8 +460,7 @@ if __name__ == "__main__":
                 print(f"\nSelected model: {Fore.GREEN + Style.BRIGHT}{model_choice}{Style.RESET_ALL}\n")
 
     # Create the workflow with selected analysts
-    workflow = create_workflow(selected_analysts)
-    app = workflow.compile()
+    app = get_compiled_workflow(selected_analysts)
 
     if args.show_agent_graph:
         file_path = ""
@@ -304,5 +526,10 @@ if __name__ == "__main__":
         selected_analysts=selected_analysts,
         model_name=model_choice,
         model_provider=model_provider,
+        timeout=args.timeout,
     )
     print_trading_output(result)
+
+    if args.trace_file:
+        save_trace(result["timing"], args.trace_file)
+        print(f"\nTiming trace written to {args.trace_file}")
@@ -1,9 +1,20 @@
+import asyncio
+import contextvars
+import dataclasses
 import datetime
+import functools
+import inspect
 import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Generator, TypeVar
+import httpx
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
-from src.data.cache import get_cache
+from src.data.cache import EARLIEST_DATE, get_cache
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -17,64 +28,365 @@ from src.data.models import (
     InsiderTradeResponse,
     CompanyFactsResponse,
 )
+from src.data.price_series import PriceSeries
+from src.data.requirements import DataRequest
+from src.utils.deadline import DeadlineExceeded, bounded_timeout, no_deadline, remaining
+from src.utils.parallel import register_loop_cleanup
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight
+from src.utils.tracing import count, traced
+
+T = TypeVar("T")
 
 # Global cache instance
 _cache = get_cache()
 
+# How long (seconds) a fetched current market cap is reused before asking the API again
+MARKET_CAP_MAX_AGE = 15 * 60
 
-def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_prices(ticker):
-        # Filter cached data by date range and convert to Price objects
-        filtered_data = [Price(**price) for price in cached_data if start_date <= price["time"] <= end_date]
-        if filtered_data:
-            return filtered_data
-
-    # If not in cache or no data in range, fetch from API
+# Seconds an API request may take; a run's deadline can cut it shorter
+API_TIMEOUT = float(os.environ.get("FINANCIAL_DATASETS_TIMEOUT", "30"))
+
+# Upper bound on API requests in flight at once, however deeply the flows sending them are nested in parallel steps
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("FINANCIAL_DATASETS_MAX_CONCURRENCY", "8"))
+
+# Shared keep-alive session so repeated calls reuse pooled connections instead of a new TLS handshake each time
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS))
+# Requests sent over the session at once, so no thread finds its connection pool full
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Pooled clients for the async API, each with the semaphore bounding its requests in flight,
+# one per event loop since neither can be shared between loops
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+# Maximum number of tickers sent in one line-item search request
+LINE_ITEMS_BATCH_SIZE = 10
+
+# Identical requests made concurrently (e.g. by parallel analyst nodes) share one fetch.
+# The fetch may serve runs with different deadlines, so it is bounded by API_TIMEOUT
+# alone, and each caller waits for it no longer than its own deadline allows.
+_in_flight = SingleFlight(wait_timeout=remaining)
+_async_in_flight = AsyncSingleFlight(wait_timeout=remaining)
+
+
+##### Request flows #####
+# Each API function is written once as a generator (a "flow") that yields the
+# requests it needs and is sent back the responses. _run drives a flow with the
+# blocking session and _arun drives the same flow on the event loop, so get_x
+# and its async variant aget_x share all of the caching logic.
+
+# A flow that yields requests and returns a T
+Flow = Generator[Any, Any, T]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Request:
+    """An HTTP request to the financial datasets API; the driver sends back the response."""
+
+    method: str
+    url: str
+    json: dict | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class _Parallel:
+    """Independent flows to run concurrently; the driver sends back each one's result, or the exception it raised, in order.
+
+    max_workers bounds the flows run at once. Their requests, including those of
+    parallel steps nested inside them, share the process-wide request slots.
+    """
+
+    flows: list
+    max_workers: int | None = None
+
+
+class _Call:
+    """A flow whose concurrent identical calls share one execution (see _coalesce)."""
+
+    def __init__(self, key, func, args, kwargs):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def flow(self) -> Flow:
+        return self.func(*self.args, **self.kwargs)
+
+    def __iter__(self):
+        # Lets callers `yield from` a coalesced flow like any other flow
+        return (yield self)
+
+
+def _freeze(value):
+    """Make an argument value hashable so it can be part of a request key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def _coalesce(func):
+    """Share one execution of the flow func between concurrent calls with the same arguments."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return _Call((func.__name__, _freeze(bound.arguments)), func, args, kwargs)
+
+    return wrapper
+
+
+def _headers() -> dict[str, str]:
     headers = {}
     if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
         headers["X-API-KEY"] = api_key
+    return headers
+
+
+def _own_copy(result):
+    # Each caller of a shared call gets its own list so one cannot mutate what another received
+    return list(result) if isinstance(result, list) else result
 
+
+def _run(flow: Flow[T]) -> T:
+    """Run a flow to completion, sending its requests over the shared blocking session."""
+    flow = iter(flow)
+    value, error = None, None
+    while True:
+        try:
+            step = flow.throw(error) if error else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+        value, error = None, None
+        try:
+            if isinstance(step, _Request):
+                value = _send(step)
+            elif isinstance(step, _Call):
+                value = _own_copy(_in_flight.do(step.key, _run_shared, step))
+            else:
+                value = _run_parallel(step)
+        except Exception as e:
+            error = e
+
+
+def _send(request: _Request) -> requests.Response:
+    """Send a request over the shared session once one of the request slots is free."""
+    count("http_requests")
+    if not _request_slots.acquire(timeout=remaining()):
+        raise DeadlineExceeded("Run deadline exceeded")
+    try:
+        return _session.request(request.method, request.url, headers=_headers(), json=request.json, timeout=bounded_timeout(API_TIMEOUT))
+    finally:
+        _request_slots.release()
+
+
+def _run_shared(call: _Call):
+    """Run a coalesced call's flow, which other runs may share, without the caller's deadline."""
+    with no_deadline():
+        return _run(call.flow())
+
+
+def _run_parallel(step: _Parallel) -> list:
+    def run_one(flow):
+        try:
+            return _run(flow)
+        except Exception as e:
+            return e
+
+    if not step.flows:
+        return []
+    with ThreadPoolExecutor(max_workers=step.max_workers or MAX_CONCURRENT_REQUESTS) as executor:
+        # Each flow runs in a copy of the caller's context, so its requests are counted in the caller's span
+        futures = [executor.submit(contextvars.copy_context().run, run_one, flow) for flow in step.flows]
+        return [future.result() for future in futures]
+
+
+def _async_client() -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    """The pooled async HTTP client of the running event loop, and the semaphore bounding its requests in flight."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        pooled = _async_clients.get(loop)
+        if pooled is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS),
+                timeout=API_TIMEOUT,
+            )
+            pooled = _async_clients[loop] = (client, asyncio.Semaphore(MAX_CONCURRENT_REQUESTS))
+    return pooled
+
+
+@register_loop_cleanup
+async def _aclose_async_client():
+    """Close and drop the running event loop's client, whose connections would otherwise keep the loop alive."""
+    with _async_clients_lock:
+        pooled = _async_clients.pop(asyncio.get_running_loop(), None)
+    if pooled is not None:
+        await pooled[0].aclose()
+
+
+async def _arun(flow: Flow[T]) -> T:
+    """Run a flow to completion on the running event loop, sending its requests with the loop's async client."""
+    flow = iter(flow)
+    value, error = None, None
+    while True:
+        try:
+            step = flow.throw(error) if error else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+        value, error = None, None
+        try:
+            if isinstance(step, _Request):
+                value = await _asend(step)
+            elif isinstance(step, _Call):
+                value = _own_copy(await _async_in_flight.do(step.key, _arun_shared, step))
+            else:
+                value = await _arun_parallel(step)
+        except Exception as e:
+            error = e
+
+
+async def _asend(request: _Request) -> httpx.Response:
+    """Send a request with the loop's async client once one of its request slots is free."""
+    count("http_requests")
+    client, slots = _async_client()
+    await asyncio.wait_for(slots.acquire(), timeout=remaining())
+    try:
+        return await client.request(request.method, request.url, headers=_headers(), json=request.json, timeout=bounded_timeout(API_TIMEOUT))
+    finally:
+        slots.release()
+
+
+async def _arun_shared(call: _Call):
+    """Run a coalesced call's flow, which other runs may share, without the caller's deadline."""
+    with no_deadline():
+        return await _arun(call.flow())
+
+
+async def _arun_parallel(step: _Parallel) -> list:
+    semaphore = asyncio.Semaphore(step.max_workers or MAX_CONCURRENT_REQUESTS)
+
+    async def run_one(flow):
+        async with semaphore:
+            try:
+                return await _arun(flow)
+            except Exception as e:
+                return e
+
+    return list(await asyncio.gather(*(run_one(flow) for flow in step.flows)))
+
+
+def _covers_latest(dataset: str, ticker: str, dates: list[str], end_date: str, limit: int) -> bool:
+    """Check whether cached rows can answer a "latest `limit` records up to end_date" query.
+
+    `dates` are the cached record dates on or before end_date.
+    """
+    covered = _cache.get_covered_range(dataset, ticker, end_date)
+    if not covered:
+        return False
+    covered_start = covered[0]
+    # Coverage only guarantees completeness back to its start date
+    return covered_start == EARLIEST_DATE or sum(1 for date in dates if date >= covered_start) >= limit
+
+
+def _add_latest_coverage(dataset: str, ticker: str, dates: list[str], end_date: str, limit: int, one_per_date: bool = False):
+    """Record the date range fully answered by a "latest `limit` records up to end_date" fetch.
+
+    Set one_per_date for datasets with a single record per date (e.g. per report period).
+    """
+    if len(dates) < limit:
+        # A short page means everything up to end_date was returned
+        _cache.add_coverage(dataset, ticker, EARLIEST_DATE, end_date)
+    elif dates and one_per_date:
+        _cache.add_coverage(dataset, ticker, min(dates), end_date)
+    elif dates:
+        # The oldest day may have been cut off by the limit, so only the days after it are complete
+        oldest = datetime.date.fromisoformat(min(dates))
+        _cache.add_coverage(dataset, ticker, (oldest + datetime.timedelta(days=1)).isoformat(), end_date)
+
+
+def _fetch_prices(ticker: str, start_date: str, end_date: str) -> Flow[list[Price]]:
+    """Fetch price data for a date range from the API."""
     url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = requests.get(url, headers=headers)
+    response = yield _Request("GET", url)
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
     # Parse response with Pydantic model
     price_response = PriceResponse(**response.json())
-    prices = price_response.prices
+    return price_response.prices
 
-    if not prices:
-        return []
 
-    # Cache the results as dicts
-    _cache.set_prices(ticker, [p.model_dump() for p in prices])
-    return prices
+@_coalesce
+def _fill_price_gaps(ticker: str, start_date: str, end_date: str) -> Flow[None]:
+    """Fetch and cache the parts of a date range that are not cached yet."""
+    for gap_start, gap_end in _cache.get_missing_ranges("prices", ticker, start_date, end_date):
+        prices = yield from _fetch_prices(ticker, gap_start, gap_end)
+        if prices:
+            # Cache the results as dicts
+            _cache.set_prices(ticker, [p.model_dump() for p in prices])
+        _cache.add_coverage("prices", ticker, gap_start, gap_end)
 
 
-def get_financial_metrics(
+def _prices_flow(ticker: str, start_date: str, end_date: str) -> Flow[list[Price]]:
+    yield from _fill_price_gaps(ticker, start_date, end_date)
+
+    # Cached prices come back already sorted by time, as models validated once per cache update
+    return _cache.get_prices(ticker, start_date, end_date, model=Price) or []
+
+
+def _price_series_flow(ticker: str, start_date: str, end_date: str) -> Flow[PriceSeries]:
+    yield from _fill_price_gaps(ticker, start_date, end_date)
+    return _cache.get_price_series(ticker, start_date, end_date) or PriceSeries.empty()
+
+
+@traced("fetch")
+def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data from cache or API, requesting only the date ranges not cached yet."""
+    return _run(_prices_flow(ticker, start_date, end_date))
+
+
+@traced("fetch")
+async def aget_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Async variant of get_prices."""
+    return await _arun(_prices_flow(ticker, start_date, end_date))
+
+
+@traced("fetch")
+def get_price_series(ticker: str, start_date: str, end_date: str) -> PriceSeries:
+    """Fetch price data like get_prices, returned as a NumPy-backed series instead of Price models."""
+    return _run(_price_series_flow(ticker, start_date, end_date))
+
+
+@traced("fetch")
+async def aget_price_series(ticker: str, start_date: str, end_date: str) -> PriceSeries:
+    """Async variant of get_price_series."""
+    return await _arun(_price_series_flow(ticker, start_date, end_date))
+
+
+@_coalesce
+def _financial_metrics_flow(
     ticker: str,
     end_date: str,
     period: str = "ttm",
     limit: int = 10,
-) -> list[FinancialMetrics]:
-    """Fetch financial metrics from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_financial_metrics(ticker):
-        # Filter cached data by date and limit
-        filtered_data = [FinancialMetrics(**metric) for metric in cached_data if metric["report_period"] <= end_date]
-        filtered_data.sort(key=lambda x: x.report_period, reverse=True)
-        if filtered_data:
-            return filtered_data[:limit]
+) -> Flow[list[FinancialMetrics]]:
+    coverage_key = f"financial_metrics/{period}"
 
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    # Check cache first; cached metrics up to end_date come back oldest first (as models validated once per cache update), so walk them newest first
+    cached_data = _cache.get_financial_metrics(ticker, end_date=end_date, model=FinancialMetrics) or []
+    filtered_data = [metric for metric in reversed(cached_data) if metric.period == period]
+    if _covers_latest(coverage_key, ticker, [metric.report_period for metric in filtered_data], end_date, limit):
+        return filtered_data[:limit]
 
+    # If not in cache or insufficient data, fetch from API
     url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = requests.get(url, headers=headers)
+    response = yield _Request("GET", url)
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
@@ -83,6 +395,8 @@ def get_financial_metrics(
     # Return the FinancialMetrics objects directly instead of converting to dict
     financial_metrics = metrics_response.financial_metrics
 
+    _add_latest_coverage(coverage_key, ticker, [m.report_period[:10] for m in financial_metrics], end_date, limit, one_per_date=True)
+
     if not financial_metrics:
         return []
 
@@ -91,61 +405,190 @@ def get_financial_metrics(
     return financial_metrics
 
 
-def search_line_items(
+@traced("fetch")
+def get_financial_metrics(
     ticker: str,
-    line_items: list[str],
     end_date: str,
     period: str = "ttm",
     limit: int = 10,
-) -> list[LineItem]:
-    """Fetch line items from API."""
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+) -> list[FinancialMetrics]:
+    """Fetch financial metrics from cache or API."""
+    return _run(_financial_metrics_flow(ticker, end_date, period=period, limit=limit))
+
+
+@traced("fetch")
+async def aget_financial_metrics(
+    ticker: str,
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[FinancialMetrics]:
+    """Async variant of get_financial_metrics."""
+    return await _arun(_financial_metrics_flow(ticker, end_date, period=period, limit=limit))
+
 
+def _fetch_line_items(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str,
+    limit: int,
+) -> Flow[list[LineItem]]:
+    """Fetch line items for one or more tickers from the API."""
     url = "https://api.financialdatasets.ai/financials/search/line-items"
 
     body = {
-        "tickers": [ticker],
+        "tickers": tickers,
         "line_items": line_items,
         "end_date": end_date,
         "period": period,
         "limit": limit,
     }
-    response = requests.post(url, headers=headers, json=body)
+    response = yield _Request("POST", url, json=body)
     if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        raise Exception(f"Error fetching data: {', '.join(tickers)} - {response.status_code} - {response.text}")
     data = response.json()
     response_model = LineItemResponse(**data)
-    search_results = response_model.search_results
-    if not search_results:
-        return []
+    return response_model.search_results
 
-    # Cache the results
-    return search_results[:limit]
 
+def _cache_line_items(ticker: str, line_items: list[str], search_results: list[LineItem], end_date: str, period: str, limit: int):
+    """Store fetched line items and record which report periods each line item is now known for."""
+    report_periods = [result.report_period[:10] for result in search_results]
+    for line_item in line_items:
+        _add_latest_coverage(f"line_items/{period}/{line_item}", ticker, report_periods, end_date, limit, one_per_date=True)
+    if search_results:
+        _cache.set_line_items(ticker, period, [result.model_dump() for result in search_results])
 
-def get_insider_trades(
+
+def _missing_line_items(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> list[str]:
+    """Return the line items whose latest `limit` values as of end_date are not fully cached."""
+    cached_data = _cache.get_line_items(ticker, period, end_date) or []
+    report_periods = [row["report_period"][:10] for row in cached_data]
+    return [line_item for line_item in line_items if not _covers_latest(f"line_items/{period}/{line_item}", ticker, report_periods, end_date, limit)]
+
+
+@_coalesce
+def _line_items_flow(
     ticker: str,
+    line_items: list[str],
     end_date: str,
-    start_date: str | None = None,
-    limit: int = 1000,
-) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_insider_trades(ticker):
-        # Filter cached data by date range
-        filtered_data = [InsiderTrade(**trade) for trade in cached_data if (start_date is None or (trade.get("transaction_date") or trade["filing_date"]) >= start_date) and (trade.get("transaction_date") or trade["filing_date"]) <= end_date]
-        filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
-        if filtered_data:
-            return filtered_data
+    period: str = "ttm",
+    limit: int = 10,
+) -> Flow[list[LineItem]]:
+    # Only the missing line items are requested; the rest are already cached for these report periods
+    if missing_items := _missing_line_items(ticker, line_items, end_date, period, limit):
+        search_results = yield from _fetch_line_items([ticker], missing_items, end_date, period, limit)
+        _cache_line_items(ticker, missing_items, search_results, end_date, period, limit)
+
+    # Cached rows up to end_date come back oldest first, so walk them newest first
+    cached_data = (_cache.get_line_items(ticker, period, end_date) or [])[::-1]
+
+    # Return only the requested line items, as the API would
+    base_fields = LineItem.model_fields.keys()
+    return [LineItem(**{field: row[field] for field in base_fields}, **{line_item: row[line_item] for line_item in line_items if line_item in row}) for row in cached_data[:limit]]
 
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
 
+@traced("fetch")
+def search_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Fetch line items from cache or API, requesting only the line items not cached yet."""
+    return _run(_line_items_flow(ticker, line_items, end_date, period=period, limit=limit))
+
+
+@traced("fetch")
+async def asearch_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Async variant of search_line_items."""
+    return await _arun(_line_items_flow(ticker, line_items, end_date, period=period, limit=limit))
+
+
+def _line_items_batch_flow(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str,
+    limit: int,
+    batch_size: int,
+) -> Flow[dict[str, list[LineItem]]]:
+    missing_by_ticker = {ticker: _missing_line_items(ticker, line_items, end_date, period, limit) for ticker in tickers}
+    pending = [ticker for ticker, missing_items in missing_by_ticker.items() if missing_items]
+    chunks = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    def fetch_chunk(chunk: list[str]) -> Flow[None]:
+        missing_items = list(dict.fromkeys(line_item for ticker in chunk for line_item in missing_by_ticker[ticker]))
+        # Ask for enough rows for every ticker in the chunk, whether the API applies the limit per ticker or in total
+        chunk_limit = limit * len(chunk)
+        search_results = yield from _fetch_line_items(chunk, missing_items, end_date, period, chunk_limit)
+        truncated = len(search_results) >= chunk_limit
+
+        results_by_ticker = {ticker: [] for ticker in chunk}
+        for result in search_results:
+            results_by_ticker.setdefault(result.ticker, []).append(result)
+
+        for ticker in chunk:
+            ticker_results = results_by_ticker[ticker]
+            if truncated and len(ticker_results) < limit:
+                # The response may have been cut off before this ticker's older rows, so nothing is known to be complete
+                if ticker_results:
+                    _cache.set_line_items(ticker, period, [result.model_dump() for result in ticker_results])
+                continue
+            _cache_line_items(ticker, missing_items, ticker_results, end_date, period, limit)
+
+    results = yield _Parallel([fetch_chunk(chunk) for chunk in chunks])
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            # Tickers in a failed chunk are fetched one by one below
+            print(f"Error fetching line items for {', '.join(chunk)}: {result}")
+
+    line_items_by_ticker = {}
+    for ticker in tickers:
+        line_items_by_ticker[ticker] = yield from _line_items_flow(ticker, line_items, end_date, period=period, limit=limit)
+    return line_items_by_ticker
+
+
+@traced("fetch")
+def search_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+    batch_size: int = LINE_ITEMS_BATCH_SIZE,
+) -> dict[str, list[LineItem]]:
+    """Fetch line items for many tickers at once, sending one request per chunk of `batch_size` tickers.
+
+    Tickers whose line items are already cached are skipped, and chunks are fetched
+    in parallel. Returns the same results as search_line_items, keyed by ticker.
+    """
+    return _run(_line_items_batch_flow(tickers, line_items, end_date, period, limit, batch_size))
+
+
+@traced("fetch")
+async def asearch_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+    batch_size: int = LINE_ITEMS_BATCH_SIZE,
+) -> dict[str, list[LineItem]]:
+    """Async variant of search_line_items_batch."""
+    return await _arun(_line_items_batch_flow(tickers, line_items, end_date, period, limit, batch_size))
+
+
+def _fetch_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int) -> Flow[list[InsiderTrade]]:
+    """Fetch insider trades from the API, paginating back to start_date when it is given."""
     all_trades = []
     current_end_date = end_date
 
@@ -155,7 +598,7 @@ def get_insider_trades(
             url += f"&filing_date_gte={start_date}"
         url += f"&limit={limit}"
 
-        response = requests.get(url, headers=headers)
+        response = yield _Request("GET", url)
         if response.status_code != 200:
             raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
@@ -179,6 +622,37 @@ def get_insider_trades(
         if current_end_date <= start_date:
             break
 
+    return all_trades
+
+
+@_coalesce
+def _insider_trades_flow(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> Flow[list[InsiderTrade]]:
+    if start_date:
+        for gap_start, gap_end in _cache.get_missing_ranges("insider_trades", ticker, start_date, end_date):
+            trades = yield from _fetch_insider_trades(ticker, gap_end, gap_start, limit)
+            if trades:
+                # Cache the results
+                _cache.set_insider_trades(ticker, [trade.model_dump() for trade in trades])
+            _cache.add_coverage("insider_trades", ticker, gap_start, gap_end)
+
+    # Cached trades in the date range come back oldest first, so walk them newest first
+    cached_data = _cache.get_insider_trades(ticker, start_date, end_date, model=InsiderTrade) or []
+    if start_date:
+        return cached_data[::-1]
+
+    # Without a start date the API returns the latest `limit` trades, so the cache must cover that window
+    filing_dates = [trade.filing_date[:10] for trade in cached_data if trade.filing_date[:10] <= end_date]
+    if _covers_latest("insider_trades", ticker, filing_dates, end_date, limit):
+        return cached_data[::-1][:limit]
+
+    all_trades = yield from _fetch_insider_trades(ticker, end_date, None, limit)
+    _add_latest_coverage("insider_trades", ticker, [trade.filing_date[:10] for trade in all_trades], end_date, limit)
+
     if not all_trades:
         return []
 
@@ -187,26 +661,30 @@ def get_insider_trades(
     return all_trades
 
 
-def get_company_news(
+@traced("fetch")
+def get_insider_trades(
     ticker: str,
     end_date: str,
     start_date: str | None = None,
     limit: int = 1000,
-) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_company_news(ticker):
-        # Filter cached data by date range
-        filtered_data = [CompanyNews(**news) for news in cached_data if (start_date is None or news["date"] >= start_date) and news["date"] <= end_date]
-        filtered_data.sort(key=lambda x: x.date, reverse=True)
-        if filtered_data:
-            return filtered_data
+) -> list[InsiderTrade]:
+    """Fetch insider trades from cache or API, requesting only the date ranges not cached yet."""
+    return _run(_insider_trades_flow(ticker, end_date, start_date=start_date, limit=limit))
 
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
 
+@traced("fetch")
+async def aget_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[InsiderTrade]:
+    """Async variant of get_insider_trades."""
+    return await _arun(_insider_trades_flow(ticker, end_date, start_date=start_date, limit=limit))
+
+
+def _fetch_company_news(ticker: str, end_date: str, start_date: str | None, limit: int) -> Flow[list[CompanyNews]]:
+    """Fetch company news from the API, paginating back to start_date when it is given."""
     all_news = []
     current_end_date = end_date
 
@@ -216,7 +694,7 @@ def get_company_news(
             url += f"&start_date={start_date}"
         url += f"&limit={limit}"
 
-        response = requests.get(url, headers=headers)
+        response = yield _Request("GET", url)
         if response.status_code != 200:
             raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
@@ -240,6 +718,36 @@ def get_company_news(
         if current_end_date <= start_date:
             break
 
+    return all_news
+
+
+@_coalesce
+def _company_news_flow(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> Flow[list[CompanyNews]]:
+    if start_date:
+        for gap_start, gap_end in _cache.get_missing_ranges("company_news", ticker, start_date, end_date):
+            news = yield from _fetch_company_news(ticker, gap_end, gap_start, limit)
+            if news:
+                # Cache the results
+                _cache.set_company_news(ticker, [item.model_dump() for item in news])
+            _cache.add_coverage("company_news", ticker, gap_start, gap_end)
+
+    # Cached news in the date range comes back oldest first, so walk it newest first
+    cached_data = _cache.get_company_news(ticker, start_date, end_date, model=CompanyNews) or []
+    if start_date:
+        return cached_data[::-1]
+
+    # Without a start date the API returns the latest `limit` articles, so the cache must cover that window
+    if _covers_latest("company_news", ticker, [news.date[:10] for news in cached_data], end_date, limit):
+        return cached_data[::-1][:limit]
+
+    all_news = yield from _fetch_company_news(ticker, end_date, None, limit)
+    _add_latest_coverage("company_news", ticker, [news.date[:10] for news in all_news], end_date, limit)
+
     if not all_news:
         return []
 
@@ -248,29 +756,52 @@ def get_company_news(
     return all_news
 
 
-def get_market_cap(
+@traced("fetch")
+def get_company_news(
     ticker: str,
     end_date: str,
-) -> float | None:
-    """Fetch market cap from the API."""
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[CompanyNews]:
+    """Fetch company news from cache or API, requesting only the date ranges not cached yet."""
+    return _run(_company_news_flow(ticker, end_date, start_date=start_date, limit=limit))
+
+
+@traced("fetch")
+async def aget_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[CompanyNews]:
+    """Async variant of get_company_news."""
+    return await _arun(_company_news_flow(ticker, end_date, start_date=start_date, limit=limit))
+
+
+@_coalesce
+def _market_cap_flow(
+    ticker: str,
+    end_date: str,
+) -> Flow[float | None]:
     # Check if end_date is today
     if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
-        # Get the market cap from company facts API
-        headers = {}
-        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-            headers["X-API-KEY"] = api_key
+        found, market_cap = _cache.get_market_cap(ticker, max_age=MARKET_CAP_MAX_AGE)
+        if found:
+            return market_cap
 
+        # Get the market cap from company facts API
         url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = requests.get(url, headers=headers)
+        response = yield _Request("GET", url)
         if response.status_code != 200:
             print(f"Error fetching company facts: {ticker} - {response.status_code}")
             return None
 
         data = response.json()
         response_model = CompanyFactsResponse(**data)
+        _cache.set_market_cap(ticker, response_model.company_facts.market_cap)
         return response_model.company_facts.market_cap
 
-    financial_metrics = get_financial_metrics(ticker, end_date)
+    financial_metrics = yield from _financial_metrics_flow(ticker, end_date)
     if not financial_metrics:
         return None
 
@@ -282,19 +813,194 @@ def get_market_cap(
     return market_cap
 
 
-def prices_to_df(prices: list[Price]) -> pd.DataFrame:
-    """Convert prices to a DataFrame."""
-    df = pd.DataFrame([p.model_dump() for p in prices])
-    df["Date"] = pd.to_datetime(df["time"])
-    df.set_index("Date", inplace=True)
-    numeric_cols = ["open", "close", "high", "low", "volume"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    df.sort_index(inplace=True)
-    return df
+@traced("fetch")
+def get_market_cap(
+    ticker: str,
+    end_date: str,
+) -> float | None:
+    """Fetch market cap from the API."""
+    return _run(_market_cap_flow(ticker, end_date))
+
+
+@traced("fetch")
+async def aget_market_cap(
+    ticker: str,
+    end_date: str,
+) -> float | None:
+    """Async variant of get_market_cap."""
+    return await _arun(_market_cap_flow(ticker, end_date))
+
+
+# Datasets that prefetch() knows how to warm, in the order they are scheduled
+PREFETCH_DATASETS = ("prices", "financial_metrics", "insider_trades", "company_news")
+
+
+def _prefetch_dataset(ticker: str, dataset: str, start_date: str, end_date: str) -> Flow[None]:
+    """Warm the cache for one ticker and dataset with the same queries the agents make."""
+    if dataset == "prices":
+        yield from _fill_price_gaps(ticker, start_date, end_date)
+    elif dataset == "financial_metrics":
+        yield from _financial_metrics_flow(ticker, end_date, limit=10)
+    elif dataset == "insider_trades":
+        yield from _insider_trades_flow(ticker, end_date, start_date=start_date, limit=1000)
+    elif dataset == "company_news":
+        yield from _company_news_flow(ticker, end_date, start_date=start_date, limit=1000)
+    else:
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+
+def _collect_errors(keys: list[tuple[str, str]], results: list) -> dict[tuple[str, str], Exception]:
+    """Report the prefetch tasks that failed, keyed by (ticker, dataset)."""
+    errors = {}
+    for (ticker, dataset), result in zip(keys, results):
+        if isinstance(result, Exception):
+            print(f"Error prefetching {dataset} for {ticker}: {result}")
+            errors[(ticker, dataset)] = result
+    return errors
+
+
+def _prefetch_flow(
+    tickers: list[str],
+    datasets: list[str] | tuple[str, ...],
+    start_date: str | None,
+    end_date: str | None,
+    max_workers: int | None,
+) -> Flow[dict[tuple[str, str], Exception]]:
+    end_date = end_date or datetime.datetime.now().strftime("%Y-%m-%d")
+    if start_date is None:
+        start_date = (datetime.datetime.strptime(end_date, "%Y-%m-%d") - datetime.timedelta(days=365)).strftime("%Y-%m-%d")
+
+    keys = [(ticker, dataset) for ticker in tickers for dataset in datasets]
+    results = yield _Parallel([_prefetch_dataset(ticker, dataset, start_date, end_date) for ticker, dataset in keys], max_workers)
+    return _collect_errors(keys, results)
+
+
+@traced("fetch")
+def prefetch(
+    tickers: list[str],
+    datasets: list[str] | tuple[str, ...] = PREFETCH_DATASETS,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int | None = None,
+) -> dict[tuple[str, str], Exception]:
+    """Fetch several datasets for many tickers in parallel and store them in the cache.
+
+    Requests share one pooled HTTP session. At most `max_workers` fetches run at
+    once, and at most FINANCIAL_DATASETS_MAX_CONCURRENCY requests are in flight
+    (also the default for `max_workers`). Failures do not stop the
+    other fetches; they are returned keyed by (ticker, dataset).
+    """
+    return _run(_prefetch_flow(tickers, datasets, start_date, end_date, max_workers))
+
+
+@traced("fetch")
+async def aprefetch(
+    tickers: list[str],
+    datasets: list[str] | tuple[str, ...] = PREFETCH_DATASETS,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int | None = None,
+) -> dict[tuple[str, str], Exception]:
+    """Async variant of prefetch."""
+    return await _arun(_prefetch_flow(tickers, datasets, start_date, end_date, max_workers))
+
+
+def _prefetch_request(ticker: str, request: DataRequest, start_date: str, end_date: str) -> Flow[None]:
+    """Warm the cache for one ticker with the same query an agent makes for a data request."""
+    if request.lookback_days is not None:
+        since = (datetime.datetime.strptime(end_date, "%Y-%m-%d") - datetime.timedelta(days=request.lookback_days)).strftime("%Y-%m-%d")
+    else:
+        since = start_date if request.since_run_start else None
+
+    if request.dataset == "prices":
+        yield from _fill_price_gaps(ticker, start_date, end_date)
+    elif request.dataset == "financial_metrics":
+        yield from _financial_metrics_flow(ticker, end_date, period=request.period, limit=request.limit)
+    elif request.dataset == "line_items":
+        yield from _line_items_flow(ticker, list(request.line_items), end_date, period=request.period, limit=request.limit)
+    elif request.dataset == "insider_trades":
+        yield from _insider_trades_flow(ticker, end_date, start_date=since, limit=request.limit)
+    elif request.dataset == "company_news":
+        yield from _company_news_flow(ticker, end_date, start_date=since, limit=request.limit)
+    elif request.dataset == "market_cap":
+        yield from _market_cap_flow(ticker, end_date)
+    else:
+        raise ValueError(f"Unknown dataset: {request.dataset}")
+
+
+def merge_requests(requests: list[DataRequest]) -> list[DataRequest]:
+    """Combine data requests that read the same dataset the same way, keeping the largest limit and all line items."""
+    merged: dict[tuple, DataRequest] = {}
+    for request in requests:
+        key = (request.dataset, request.period, request.since_run_start, request.lookback_days)
+        if existing := merged.get(key):
+            request = dataclasses.replace(
+                existing,
+                limit=max(existing.limit, request.limit),
+                line_items=tuple(dict.fromkeys(existing.line_items + request.line_items)),
+            )
+        merged[key] = request
+    return list(merged.values())
+
+
+def _prefetch_requests_flow(
+    tickers: list[str],
+    requests: list[DataRequest],
+    start_date: str,
+    end_date: str,
+    max_workers: int | None,
+) -> Flow[dict[tuple[str, str], Exception]]:
+    keys, flows = [], []
+    for request in merge_requests(requests):
+        if request.dataset == "line_items":
+            # Batched per chunk of tickers; tickers whose chunk failed are retried one by one by the agents
+            keys.append((", ".join(tickers), request.dataset))
+            flows.append(_line_items_batch_flow(tickers, list(request.line_items), end_date, request.period, request.limit, LINE_ITEMS_BATCH_SIZE))
+            continue
+        for ticker in tickers:
+            keys.append((ticker, request.dataset))
+            flows.append(_prefetch_request(ticker, request, start_date, end_date))
+
+    results = yield _Parallel(flows, max_workers)
+    return _collect_errors(keys, results)
+
+
+@traced("fetch")
+def prefetch_requests(
+    tickers: list[str],
+    requests: list[DataRequest],
+    start_date: str,
+    end_date: str,
+    max_workers: int | None = None,
+) -> dict[tuple[str, str], Exception]:
+    """Fetch the union of several agents' data requests for many tickers in parallel and store it in the cache.
+
+    Afterwards the agents' own calls with the same arguments are answered from
+    memory. Line items are fetched in multi-ticker batches. Failures do not stop
+    the other fetches; they are returned keyed by (ticker, dataset).
+    """
+    return _run(_prefetch_requests_flow(tickers, requests, start_date, end_date, max_workers))
+
+
+@traced("fetch")
+async def aprefetch_requests(
+    tickers: list[str],
+    requests: list[DataRequest],
+    start_date: str,
+    end_date: str,
+    max_workers: int | None = None,
+) -> dict[tuple[str, str], Exception]:
+    """Async variant of prefetch_requests."""
+    return await _arun(_prefetch_requests_flow(tickers, requests, start_date, end_date, max_workers))
+
+
+def prices_to_df(prices: PriceSeries | list[Price]) -> pd.DataFrame:
+    """Convert prices to a DataFrame indexed by date, oldest first."""
+    if not isinstance(prices, PriceSeries):
+        prices = PriceSeries.from_prices(prices)
+    return prices.to_df()
 
 
 # Update the get_price_data function to use the new functions
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    return get_price_series(ticker, start_date, end_date).to_df()
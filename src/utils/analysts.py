@@ -1,90 +1,99 @@
 """Constants and utilities related to analysts configuration."""
 
-from src.agents.ben_graham import ben_graham_agent
-from src.agents.bill_ackman import bill_ackman_agent
-from src.agents.cathie_wood import cathie_wood_agent
-from src.agents.charlie_munger import charlie_munger_agent
-from src.agents.fundamentals import fundamentals_agent
-from src.agents.michael_burry import michael_burry_agent
-from src.agents.phil_fisher import phil_fisher_agent
-from src.agents.peter_lynch import peter_lynch_agent
-from src.agents.sentiment import sentiment_agent
-from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
-from src.agents.technicals import technical_analyst_agent
-from src.agents.valuation import valuation_agent
-from src.agents.warren_buffett import warren_buffett_agent
-from src.agents.macro_economic_agent import macro_economic_agent
+import functools
+import importlib
+from typing import Callable
 
-# Define analyst configuration - single source of truth
+from src.data.requirements import PRICES, DataRequest
+
+# Define analyst configuration - single source of truth.
+# Agents are referenced by module and function name, and imported on first use,
+# so a run only imports the analysts it selects.
 ANALYST_CONFIG = {
     "ben_graham": {
         "display_name": "Ben Graham",
-        "agent_func": ben_graham_agent,
+        "module": "src.agents.ben_graham",
+        "function": "ben_graham_agent",
         "order": 0,
     },
     "bill_ackman": {
         "display_name": "Bill Ackman",
-        "agent_func": bill_ackman_agent,
+        "module": "src.agents.bill_ackman",
+        "function": "bill_ackman_agent",
         "order": 1,
     },
     "cathie_wood": {
         "display_name": "Cathie Wood",
-        "agent_func": cathie_wood_agent,
+        "module": "src.agents.cathie_wood",
+        "function": "cathie_wood_agent",
         "order": 2,
     },
     "charlie_munger": {
         "display_name": "Charlie Munger",
-        "agent_func": charlie_munger_agent,
+        "module": "src.agents.charlie_munger",
+        "function": "charlie_munger_agent",
         "order": 3,
     },
     "michael_burry": {
         "display_name": "Michael Burry",
-        "agent_func": michael_burry_agent,
+        "module": "src.agents.michael_burry",
+        "function": "michael_burry_agent",
         "order": 4,
     },
     "peter_lynch": {
         "display_name": "Peter Lynch",
-        "agent_func": peter_lynch_agent,
+        "module": "src.agents.peter_lynch",
+        "function": "peter_lynch_agent",
         "order": 5,
     },
     "phil_fisher": {
         "display_name": "Phil Fisher",
-        "agent_func": phil_fisher_agent,
+        "module": "src.agents.phil_fisher",
+        "function": "phil_fisher_agent",
         "order": 6,
     },
     "stanley_druckenmiller": {
         "display_name": "Stanley Druckenmiller",
-        "agent_func": stanley_druckenmiller_agent,
+        "module": "src.agents.stanley_druckenmiller",
+        "function": "stanley_druckenmiller_agent",
         "order": 7,
     },
     "warren_buffett": {
         "display_name": "Warren Buffett",
-        "agent_func": warren_buffett_agent,
+        "module": "src.agents.warren_buffett",
+        "function": "warren_buffett_agent",
         "order": 8,
     },
     "technical_analyst": {
         "display_name": "Technical Analyst",
-        "agent_func": technical_analyst_agent,
+        "module": "src.agents.technicals",
+        "function": "technical_analyst_agent",
         "order": 9,
     },
     "fundamentals_analyst": {
         "display_name": "Fundamentals Analyst",
-        "agent_func": fundamentals_agent,
+        "module": "src.agents.fundamentals",
+        "function": "fundamentals_agent",
         "order": 10,
     },
     "sentiment_analyst": {
         "display_name": "Sentiment Analyst",
-        "agent_func": sentiment_agent,
+        "module": "src.agents.sentiment",
+        "function": "sentiment_agent",
         "order": 11,
     },
     "valuation_analyst": {
         "display_name": "Valuation Analyst",
-        "agent_func": valuation_agent,
+        "module": "src.agents.valuation",
+        "function": "valuation_agent",
         "order": 12,
     },
     "macro_economic_analyst": {
         "display_name": "Macro Economic Analyst",
-        "agent_func": macro_economic_agent,
+        "module": "src.agents.macro_economic_agent",
+        "function": "macro_economic_agent",
+        # Reads economic indicators from its own sources rather than the financial data API
+        "data_requirements": [],
         "order": 13,
     },
 }
@@ -93,6 +102,33 @@ ANALYST_CONFIG = {
 ANALYST_ORDER = [(config["display_name"], key) for key, config in sorted(ANALYST_CONFIG.items(), key=lambda x: x[1]["order"])]
 
 
+@functools.lru_cache(maxsize=None)
+def get_agent_func(analyst_key: str) -> Callable:
+    """Get an analyst's agent function, importing its module on first use."""
+    config = ANALYST_CONFIG[analyst_key]
+    return getattr(importlib.import_module(config["module"]), config["function"])
+
+
+def get_analyst_data_requirements(analyst_key: str) -> list[DataRequest]:
+    """Get the data an analyst reads for every ticker, as declared by its module's DATA_REQUIREMENTS."""
+    config = ANALYST_CONFIG[analyst_key]
+    if "data_requirements" in config:
+        return config["data_requirements"]
+    return importlib.import_module(config["module"]).DATA_REQUIREMENTS
+
+
+def get_analyst_node(analyst_key: str) -> tuple[str, Callable]:
+    """Get the (node_name, agent_func) tuple of an analyst; only that analyst's module is imported."""
+    return f"{analyst_key}_agent", get_agent_func(analyst_key)
+
+
 def get_analyst_nodes():
-    """Get the mapping of analyst keys to their (node_name, agent_func) tuples."""
-    return {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+    """Get the mapping of analyst keys to their (node_name, agent_func) tuples. Imports every analyst's module."""
+    return {key: get_analyst_node(key) for key in ANALYST_CONFIG}
+
+
+def get_data_requirements(selected_analysts: list[str] | None = None) -> list[DataRequest]:
+    """Get the data requests of the selected analysts (all by default), plus the prices read by the risk manager."""
+    if selected_analysts is None:
+        selected_analysts = list(ANALYST_CONFIG.keys())
+    return [request for key in selected_analysts for request in get_analyst_data_requirements(key)] + [PRICES]
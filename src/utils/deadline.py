@@ -0,0 +1,145 @@
+"""Run deadlines: a time budget that bounds every data request and LLM call made under it"""
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from typing import Callable, Iterator, TypeVar
+
+from src.utils.degradation import track_degradation
+from src.utils.progress import progress
+from src.utils.tracing import annotate
+
+T = TypeVar("T")
+
+# Default time budget (seconds) of a hedge fund run; unset or empty means no deadline
+DEFAULT_RUN_TIMEOUT = float(os.environ["HEDGE_FUND_RUN_TIMEOUT"]) if os.environ.get("HEDGE_FUND_RUN_TIMEOUT") else None
+
+# Share of the run's budget the data prefetch and analysts may use; the rest is kept for risk and portfolio management
+ANALYST_BUDGET_SHARE = 0.8
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting work once the deadline has passed."""
+
+
+# Deadline (a time.time() timestamp) of the running code, if any
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("deadline", default=None)
+
+
+def run_deadlines(timeout: float | None) -> dict[str, float | None]:
+    """Deadlines of a run starting now with the given budget in seconds, as stored in the state's metadata."""
+    if timeout is None:
+        return {"deadline": None, "analyst_deadline": None}
+    now = time.time()
+    return {"deadline": now + timeout, "analyst_deadline": now + timeout * ANALYST_BUDGET_SHARE}
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: float | None) -> Iterator[None]:
+    """Bound the code inside this block by a deadline; a nested scope can only bring it forward."""
+    current = _deadline.get()
+    if deadline is None or (current is not None and current < deadline):
+        deadline = current
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the code inside this block without a deadline, e.g. work shared with runs that have other deadlines."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left until the current deadline (at least 0), or None without a deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.time())
+
+
+def expired() -> bool:
+    """Whether the current deadline has passed."""
+    return remaining() == 0.0
+
+
+def bounded_timeout(timeout: float | None) -> float | None:
+    """The timeout for an operation that should also end by the current deadline.
+
+    Raises DeadlineExceeded if the deadline has already passed.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left == 0.0:
+        raise DeadlineExceeded("Run deadline exceeded")
+    return left if timeout is None else min(timeout, left)
+
+
+def call_by_deadline(call: Callable[[], T]) -> T:
+    """Make a blocking call, giving up on it if it has not returned by the current deadline.
+
+    Without a deadline the call runs in the calling thread. With one it runs in
+    a daemon thread (in a copy of the caller's context) that is abandoned on
+    timeout, and DeadlineExceeded is raised instead.
+    """
+    timeout = bounded_timeout(None)
+    if timeout is None:
+        return call()
+
+    outcome: dict[str, object] = {}
+
+    def run():
+        try:
+            outcome["result"] = call()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise DeadlineExceeded("Run deadline exceeded")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def skip_on_deadline(name: str, node: Callable, deadline_key: str = "analyst_deadline"):
+    """Wrap a graph node so that it is skipped if it does not finish by the run's deadline.
+
+    The deadline is read from state["metadata"][deadline_key]. A skipped node
+    adds nothing to the analyst signals and is recorded in data["skipped_agents"],
+    so later nodes carry on with the signals that did arrive. Its work is marked
+    degraded, so no signal it completes afterwards is stored for reuse.
+    """
+
+    async def run_node(state):
+        deadline = state["metadata"].get(deadline_key)
+        if deadline is None:
+            return await node(state) if asyncio.iscoroutinefunction(node) else await asyncio.to_thread(node, state)
+
+        try:
+            with deadline_scope(deadline), track_degradation() as degradation:
+                work = node(state) if asyncio.iscoroutinefunction(node) else asyncio.to_thread(node, state)
+                return await asyncio.wait_for(work, timeout=max(0.0, deadline - time.time()))
+        except Exception:
+            # Timeouts surface as whatever the timed-out call raises, so judge by the clock
+            if time.time() < deadline:
+                raise
+
+        # A blocking node's thread may still be running; whatever it produces now is not to be stored
+        degradation.mark("deadline exceeded")
+        progress.update_status(name, None, "Skipped (deadline exceeded)")
+        annotate(skipped="deadline exceeded")
+        return {"data": {"skipped_agents": {name: "deadline exceeded"}}}
+
+    return run_node
@@ -0,0 +1,88 @@
+"""Rule-based decisions: skip the LLM for tickers whose score settles the signal on its own"""
+
+import os
+import re
+
+from src.utils.progress import progress
+from src.utils.tracing import annotate, count
+
+# How far past a bullish or bearish threshold a score must be, as a share of the maximum score,
+# for the agent to emit its signal without asking the LLM; 0 or unset always asks the LLM
+LLM_SKIP_MARGIN = float(os.environ.get("LLM_SKIP_MARGIN") or 0)
+
+# Wording the agents' sub-analyses use for a factor they could not score for lack of data;
+# such a factor scores 0, which would otherwise read as a weak (bearish) ticker
+_MISSING_DATA = re.compile(r"insufficient|not enough|unavailable|missing|cannot compute|unable to compute|\bno\b[^.;]*\bdata\b", re.IGNORECASE)
+
+
+def _sub_analysis_details(analysis: dict) -> list[str]:
+    """The "details" text of every sub-analysis, whether given as one string or a list of them."""
+    details = []
+    for sub in analysis.values():
+        if not isinstance(sub, dict):
+            continue
+        if isinstance(sub.get("details"), str):
+            details.append(sub["details"])
+        elif isinstance(sub.get("details"), list):
+            details.extend(item for item in sub["details"] if isinstance(item, str))
+    return [detail for detail in details if detail]
+
+
+def _reports_missing_data(analysis: dict) -> bool:
+    """Whether any of the ticker's sub-analyses says it lacked the data to score its factor."""
+    return any(_MISSING_DATA.search(detail) for detail in _sub_analysis_details(analysis))
+
+
+def decisive_signal(
+    agent_name: str,
+    ticker: str,
+    analysis: dict,
+    bullish_at: float,
+    bearish_at: float,
+    margin: float | None = None,
+    complete: bool = True,
+) -> dict | None:
+    """Return the agent's signal for a clear-cut ticker, with template reasoning, or None to ask the LLM.
+
+    analysis is the ticker's analysis data with its preliminary "signal", its
+    "score" and "max_score", and the sub-analyses whose "details" make up the
+    reasoning. A bullish or bearish signal is decisive when the score is at
+    least margin * max_score beyond the threshold it crossed (score >= bullish_at
+    or score <= bearish_at); neutral signals always go to the LLM. So do tickers
+    whose inputs were incomplete: pass complete=False when the agent's own data
+    fetches came back empty, and any sub-analysis reporting insufficient data
+    counts the same, since its zero score says nothing about the ticker. The signal
+    records "decision_path": "rules", where LLM-made ones record "llm".
+    """
+    margin = LLM_SKIP_MARGIN if margin is None else margin
+    signal, score, max_score = analysis["signal"], analysis["score"], analysis["max_score"]
+    if not margin or not max_score or not complete or _reports_missing_data(analysis):
+        return None
+
+    if signal == "bullish":
+        threshold, distance = bullish_at, score - bullish_at
+    elif signal == "bearish":
+        threshold, distance = bearish_at, bearish_at - score
+    else:
+        return None
+    if distance < margin * max_score:
+        return None
+
+    details = [
+        sub["details"]
+        for sub in analysis.values()
+        if isinstance(sub, dict) and isinstance(sub.get("details"), str) and sub["details"]
+    ]
+    reasoning = f"Clearly {signal}: scored {score:.1f} of {max_score:g}, well past the {threshold:g} threshold."
+    if details:
+        reasoning += " " + "; ".join(details)
+
+    progress.update_status(agent_name, ticker, "Done (rule-based)")
+    annotate(decision_path="rules")
+    count("llm_calls_skipped")
+    return {
+        "signal": signal,
+        "confidence": round(min(100.0, 50.0 + 100.0 * distance / max_score), 1),
+        "reasoning": reasoning,
+        "decision_path": "rules",
+    }
@@ -0,0 +1,49 @@
+"""Degraded results: work that fell back to defaults, so its output must not be stored for reuse"""
+
+import contextlib
+import contextvars
+from typing import Iterator
+
+from src.utils.tracing import annotate
+
+
+class Degradation:
+    """Whether the work tracked by it (or by the enclosing tracker) had to fall back, and why."""
+
+    def __init__(self, parent: "Degradation | None" = None):
+        self.parent = parent
+        self.reasons: list[str] = []
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.reasons) or (self.parent is not None and self.parent.degraded)
+
+    def mark(self, reason: str):
+        self.reasons.append(reason)
+
+
+# Tracker of the running work, if any; tasks and threads started from it share it
+_current: contextvars.ContextVar[Degradation | None] = contextvars.ContextVar("degradation", default=None)
+
+
+@contextlib.contextmanager
+def track_degradation(degradation: Degradation | None = None) -> Iterator[Degradation]:
+    """Track fallbacks of the code inside this block, in a new tracker nested in the current one (or the given one)."""
+    degradation = degradation or Degradation(parent=_current.get())
+    token = _current.set(degradation)
+    try:
+        yield degradation
+    finally:
+        _current.reset(token)
+
+
+def current_degradation() -> Degradation | None:
+    """The tracker that fallbacks made here are recorded in, if any."""
+    return _current.get()
+
+
+def mark_degraded(reason: str):
+    """Record that the running work fell back to a default, e.g. after an LLM or data error."""
+    if (degradation := _current.get()) is not None:
+        degradation.mark(reason)
+    annotate(degraded=reason)
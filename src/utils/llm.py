@@ -1,12 +1,23 @@
 """Helper functions for LLM"""
 
+import asyncio
 import json
 from typing import TypeVar, Type, Optional, Any
+from langchain_core.callbacks import BaseCallbackHandler
 from pydantic import BaseModel
+from src.data.llm_cache import get_llm_cache
+from src.llm.limits import get_llm_limiter
+from src.utils.llm_batch import current_batch
+from src.utils.deadline import call_by_deadline, expired, remaining
+from src.utils.degradation import mark_degraded
 from src.utils.progress import progress
+from src.utils.tracing import Span, annotate, count, span
 
 T = TypeVar('T', bound=BaseModel)
 
+# Opt-in cache of parsed responses (see LLM_CACHE_DIR)
+_llm_cache = get_llm_cache()
+
 def call_llm(
     prompt: Any,
     model_name: str,
@@ -31,45 +42,182 @@ def call_llm(
     Returns:
         An instance of the specified Pydantic model
     """
-    from src.llm.models import get_model, get_model_info
-    
+    with span("llm", "llm", model=model_name, provider=model_provider) as llm_span:
+        # Answer from the response cache when it is on and has seen this prompt
+        cache_key = _cached_response_key(prompt, model_name, model_provider, pydantic_model)
+        if cache_key and (cached := _llm_cache.get(cache_key, pydantic_model)) is not None:
+            annotate(llm_cache="hit")
+            return cached
+
+        llm, model_info = _prepare_llm(model_name, model_provider, pydantic_model)
+        limiter = get_llm_limiter(model_provider, model_name)
+        config = _trace_config(llm_span)
+
+        # Call the LLM with retries
+        for attempt in range(max_retries):
+            # Give up once the run's deadline has passed rather than start another attempt
+            if expired():
+                print("LLM call skipped: run deadline exceeded")
+                return _fallback_response(pydantic_model, default_factory, "LLM call skipped: deadline exceeded")
+
+            try:
+                # Call the LLM, waiting for the provider's concurrency and rate limits, and cut it off at the run's deadline, if there is one
+                count("llm_calls")
+                result = call_by_deadline(lambda: limiter.run(lambda: llm.invoke(prompt, config=config)))
+
+                parsed_result = _parse_result(result, model_info, pydantic_model)
+                if parsed_result is not None:
+                    if cache_key:
+                        _llm_cache.put(cache_key, parsed_result)
+                    return parsed_result
+
+            except Exception as e:
+                if agent_name:
+                    progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+
+                if attempt == max_retries - 1:
+                    print(f"Error in LLM call after {max_retries} attempts: {e}")
+                    return _fallback_response(pydantic_model, default_factory, "LLM call failed")
+
+    # Reached when no attempt returned a parsable response
+    return _fallback_response(pydantic_model, default_factory, "LLM response unparsable")
+
+
+async def acall_llm(
+    prompt: Any,
+    model_name: str,
+    model_provider: str,
+    pydantic_model: Type[T],
+    agent_name: Optional[str] = None,
+    max_retries: int = 3,
+    default_factory = None
+) -> T:
+    """
+    Async variant of call_llm: awaits the model instead of blocking a thread on it,
+    so many calls can be in flight on one event loop. Takes the same arguments and
+    retries and falls back the same way.
+
+    Inside a ticker analysis run with batched LLM calls (see arun_per_ticker),
+    the call joins the agent's batch and may be answered by a request shared
+    with other tickers.
+    """
+    if (batch_slot := current_batch()) is not None:
+        batch, ticker = batch_slot
+        return await batch.call(
+            ticker,
+            prompt,
+            model_name=model_name,
+            model_provider=model_provider,
+            pydantic_model=pydantic_model,
+            agent_name=agent_name,
+            max_retries=max_retries,
+            default_factory=default_factory,
+        )
+
+    with span("llm", "llm", model=model_name, provider=model_provider) as llm_span:
+        # Answer from the response cache when it is on and has seen this prompt
+        cache_key = _cached_response_key(prompt, model_name, model_provider, pydantic_model)
+        if cache_key and (cached := _llm_cache.get(cache_key, pydantic_model)) is not None:
+            annotate(llm_cache="hit")
+            return cached
+
+        llm, model_info = _prepare_llm(model_name, model_provider, pydantic_model, for_async=True)
+        limiter = get_llm_limiter(model_provider, model_name)
+        config = _trace_config(llm_span)
+
+        # Call the LLM with retries
+        for attempt in range(max_retries):
+            try:
+                count("llm_calls")
+                # Each attempt waits for the provider's limits and is cut off at the run's deadline, if there is one
+                call = limiter.arun(lambda: llm.ainvoke(prompt, config=config))
+                result = await asyncio.wait_for(call, timeout=remaining())
+
+                parsed_result = _parse_result(result, model_info, pydantic_model)
+                if parsed_result is not None:
+                    if cache_key:
+                        _llm_cache.put(cache_key, parsed_result)
+                    return parsed_result
+
+            except Exception as e:
+                if agent_name:
+                    progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+
+                if attempt == max_retries - 1 or expired():
+                    print(f"Error in LLM call after {attempt + 1} attempts: {str(e) or type(e).__name__}")
+                    return _fallback_response(pydantic_model, default_factory, "LLM call failed")
+
+    # Reached when no attempt returned a parsable response
+    return _fallback_response(pydantic_model, default_factory, "LLM response unparsable")
+
+
+def _fallback_response(pydantic_model: Type[T], default_factory, reason: str) -> T:
+    """The default response for a failed call, recorded as a fallback so it is not stored as a real signal."""
+    mark_degraded(reason)
+    # Use default_factory if provided, otherwise create a basic default
+    if default_factory:
+        return default_factory()
+    return create_default_response(pydantic_model)
+
+
+def _prepare_llm(model_name: str, model_provider: str, pydantic_model: Type[T], for_async: bool = False):
+    """Returns the pooled chat model to call (with structured output where the model supports JSON mode) and its model info."""
+    from src.llm.models import get_model_info, get_pooled_model
+
     model_info = get_model_info(model_name)
-    llm = get_model(model_name, model_provider)
-    
+
     # For non-JSON support models, we can use structured output
     if not (model_info and not model_info.has_json_mode()):
-        llm = llm.with_structured_output(
-            pydantic_model,
-            method="json_mode",
-        )
-    
-    # Call the LLM with retries
-    for attempt in range(max_retries):
-        try:
-            # Call the LLM
-            result = llm.invoke(prompt)
-            
-            # For non-JSON support models, we need to extract and parse the JSON manually
-            if model_info and not model_info.has_json_mode():
-                parsed_result = extract_json_from_response(result.content)
-                if parsed_result:
-                    return pydantic_model(**parsed_result)
-            else:
-                return result
-                
-        except Exception as e:
-            if agent_name:
-                progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
-            
-            if attempt == max_retries - 1:
-                print(f"Error in LLM call after {max_retries} attempts: {e}")
-                # Use default_factory if provided, otherwise create a basic default
-                if default_factory:
-                    return default_factory()
-                return create_default_response(pydantic_model)
-
-    # This should never be reached due to the retry logic above
-    return create_default_response(pydantic_model)
+        return get_pooled_model(model_name, model_provider, pydantic_model, for_async=for_async), model_info
+    return get_pooled_model(model_name, model_provider, for_async=for_async), model_info
+
+
+def _cached_response_key(prompt: Any, model_name: str, model_provider: str, pydantic_model: Type[T]) -> Optional[str]:
+    """Key of the prompt's response in the LLM response cache, or None when the cache is off."""
+    if not _llm_cache.enabled:
+        return None
+    return _llm_cache.make_key(prompt, model_name, model_provider, pydantic_model)
+
+
+class _TokenUsage(BaseCallbackHandler):
+    """Adds the token usage reported with each model response to a span."""
+
+    run_inline = True
+
+    def __init__(self, llm_span: Span):
+        self.span = llm_span
+
+    def on_llm_end(self, response, **kwargs):
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+        if not (input_tokens or output_tokens) and response.llm_output:
+            # Providers that report usage the older way
+            usage = response.llm_output.get("token_usage") or {}
+            input_tokens = usage.get("prompt_tokens", 0)
+            output_tokens = usage.get("completion_tokens", 0)
+        attributes = self.span.attributes
+        attributes["input_tokens"] = attributes.get("input_tokens", 0) + input_tokens
+        attributes["output_tokens"] = attributes.get("output_tokens", 0) + output_tokens
+
+
+def _trace_config(llm_span: Optional[Span]) -> Optional[dict]:
+    """Run config that records token usage on the span when the run is traced."""
+    return {"callbacks": [_TokenUsage(llm_span)]} if llm_span else None
+
+
+def _parse_result(result: Any, model_info, pydantic_model: Type[T]) -> Optional[T]:
+    """Turns an LLM result into the Pydantic model, or None if no JSON could be extracted."""
+    # For non-JSON support models, we need to extract and parse the JSON manually
+    if model_info and not model_info.has_json_mode():
+        parsed_result = extract_json_from_response(result.content)
+        if parsed_result:
+            return pydantic_model(**parsed_result)
+        return None
+    return result
 
 def create_default_response(model_class: Type[T]) -> T:
     """Creates a safe default response based on the model's fields."""
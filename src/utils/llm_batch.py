@@ -0,0 +1,196 @@
+"""Batched prompting: one LLM request answering the same question for several tickers"""
+
+import asyncio
+import contextvars
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Optional, Type
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, create_model
+
+from src.utils.degradation import Degradation, current_degradation, track_degradation
+
+# Tickers an agent may ask about in one LLM request; 0 or 1 turns batching off
+LLM_BATCH_SIZE = int(os.environ.get("LLM_BATCH_SIZE", "0"))
+
+
+@dataclass
+class _Request:
+    """An acall_llm call for one ticker, waiting to be sent in a batch."""
+
+    ticker: str
+    prompt: Any
+    kwargs: dict
+    future: asyncio.Future = field(repr=False)
+    # Where the ticker's analysis records fallbacks; the request is answered in another task
+    degradation: Degradation | None = field(default=None, repr=False)
+
+
+def _split_prompt(prompt: Any) -> tuple[tuple[str, ...], str]:
+    """Split a prompt into its leading system messages and the text of the rest."""
+    messages = prompt.to_messages() if hasattr(prompt, "to_messages") else prompt
+    if isinstance(messages, str):
+        return (), messages
+    system = []
+    for message in messages:
+        if message.type != "system":
+            break
+        system.append(message.content)
+    rest = messages[len(system):]
+    return tuple(system), "\n\n".join(str(message.content) for message in rest)
+
+
+@lru_cache(maxsize=None)
+def _batch_model(pydantic_model: Type[BaseModel]) -> Type[BaseModel]:
+    """The output schema of a batched request: one answer per ticker."""
+    return create_model(f"{pydantic_model.__name__}Batch", signals=(dict[str, pydantic_model], ...))
+
+
+class LLMBatch:
+    """Coalesces the acall_llm calls made while analyzing several tickers into batched requests.
+
+    Calls that share a model, output schema and system prompt are sent together,
+    up to batch_size tickers per request, with each ticker's own question under
+    a heading and one answer per ticker asked for. A request is sent once it is
+    full or once every ticker not yet analyzed is waiting on an answer, so the
+    tickers must be analyzed at least batch_size at a time.
+    Tickers the batched answer is missing (or that fail to parse) fall back to
+    their own acall_llm call.
+    """
+
+    def __init__(self, batch_size: int, tickers: int):
+        self.batch_size = batch_size
+        # Tickers whose analysis has not finished yet, started or not
+        self._unfinished = tickers
+        self._in_flight = 0
+        self._pending: list[_Request] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def finish(self):
+        """Note that a ticker's analysis has finished, so requests need not wait for it."""
+        self._unfinished -= 1
+        self._flush()
+
+    async def call(self, ticker: str, prompt: Any, **kwargs) -> Any:
+        """Queue a ticker's acall_llm call and wait for its answer."""
+        request = _Request(ticker, prompt, kwargs, asyncio.get_running_loop().create_future(), current_degradation())
+        self._pending.append(request)
+        self._flush()
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            if request in self._pending:
+                self._pending.remove(request)
+            raise
+
+    def _flush(self):
+        """Send every full batch, and everything queued once no ticker could add to it."""
+        groups: dict[tuple, list[_Request]] = {}
+        for request in self._pending:
+            system, _ = _split_prompt(request.prompt)
+            key = (system, request.kwargs["model_name"], str(request.kwargs["model_provider"]), request.kwargs["pydantic_model"])
+            groups.setdefault(key, []).append(request)
+
+        all_waiting = self._unfinished <= len(self._pending) + self._in_flight
+        for requests in groups.values():
+            while len(requests) >= self.batch_size or (requests and all_waiting):
+                batch, requests = requests[:self.batch_size], requests[self.batch_size:]
+                for request in batch:
+                    self._pending.remove(request)
+                self._in_flight += len(batch)
+                # Sent outside any batch, so the calls it makes are not queued again
+                context = contextvars.copy_context()
+                context.run(_current.set, None)
+                task = asyncio.get_running_loop().create_task(self._send(batch), context=context)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[_Request]):
+        from src.utils.llm import acall_llm
+
+        try:
+            answers = {}
+            if len(batch) > 1:
+                # A failed batched request is not a fallback of any ticker, which are asked again on their own
+                with track_degradation(Degradation()):
+                    answers = await self._ask_batch(batch)
+
+            async def answer(request: _Request):
+                if request.ticker in answers:
+                    return answers[request.ticker]
+                with track_degradation(request.degradation or Degradation()):
+                    return await acall_llm(request.prompt, **request.kwargs)
+
+            results = await asyncio.gather(*(answer(request) for request in batch), return_exceptions=True)
+        except BaseException as e:
+            results = [e] * len(batch)
+        finally:
+            self._in_flight -= len(batch)
+
+        for request, result in zip(batch, results):
+            if request.future.done():
+                continue
+            if isinstance(result, BaseException):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+        self._flush()
+
+    async def _ask_batch(self, batch: list[_Request]) -> dict[str, Any]:
+        """Ask for all of a batch's tickers in one request; returns the answers that came back."""
+        from src.utils.llm import acall_llm
+
+        kwargs = batch[0].kwargs
+        system, _ = _split_prompt(batch[0].prompt)
+        tickers = [request.ticker for request in batch]
+        questions = "\n\n".join(f"### {request.ticker}\n{_split_prompt(request.prompt)[1]}" for request in batch)
+        messages = [
+            *(SystemMessage(content=content) for content in system),
+            HumanMessage(
+                content=f"Answer the following {len(batch)} requests, one per ticker. Treat each one on its own, "
+                f"exactly as if it had been asked alone.\n\n{questions}\n\n"
+                'Return a single JSON object of the form {"signals": {"<ticker>": <the JSON object requested for that ticker>}}, '
+                f"with one entry for each of: {', '.join(tickers)}."
+            ),
+        ]
+
+        response = await acall_llm(
+            prompt=messages,
+            model_name=kwargs["model_name"],
+            model_provider=kwargs["model_provider"],
+            pydantic_model=_batch_model(kwargs["pydantic_model"]),
+            agent_name=kwargs.get("agent_name"),
+            max_retries=1,
+            default_factory=lambda: None,
+        )
+        if response is None:
+            return {}
+        signals = {ticker.upper(): signal for ticker, signal in response.signals.items()}
+        return {ticker: signals[ticker.upper()] for ticker in tickers if ticker.upper() in signals}
+
+
+# The batch and ticker of the analysis running, if its LLM calls are batched
+_current: contextvars.ContextVar[Optional[tuple[LLMBatch, str]]] = contextvars.ContextVar("llm_batch", default=None)
+
+
+def current_batch() -> Optional[tuple[LLMBatch, str]]:
+    """The batch that acall_llm calls made here should join, and the ticker they are for."""
+    return _current.get()
+
+
+def batched(batch: Optional[LLMBatch], ticker: str, analyze: Callable) -> Callable:
+    """Wrap a ticker's analysis so that the acall_llm calls it makes join the batch (if any)."""
+    if batch is None:
+        return analyze
+
+    async def run(*args, **kwargs):
+        token = _current.set((batch, ticker))
+        try:
+            return await analyze(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            batch.finish()
+
+    return run
@@ -0,0 +1,92 @@
+"""Concurrent execution helpers for agents"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Coroutine, TypeVar
+
+from src.utils.llm_batch import LLM_BATCH_SIZE, LLMBatch, batched
+from src.utils.tracing import span
+
+T = TypeVar("T")
+
+# Upper bound on tickers an agent analyzes at once, overridable per call
+MAX_TICKER_WORKERS = int(os.environ.get("AGENT_MAX_TICKER_WORKERS", "4"))
+
+
+async def arun_per_ticker(
+    analyze: Callable[[str], Awaitable[T]],
+    tickers: list[str],
+    max_workers: int | None = None,
+    batch_llm_calls: bool = False,
+) -> list[T]:
+    """Await analyze(ticker) for every ticker on the event loop, at most max_workers at a time.
+
+    Results come back in the same order as tickers, whatever order the work
+    finishes in. The first exception raised (in ticker order) is re-raised,
+    as it would be from a plain loop, once the other tickers are done. Each
+    ticker's analysis is recorded as a ticker span when the run is traced.
+
+    With batch_llm_calls, and LLM_BATCH_SIZE above 1, the acall_llm calls of
+    the tickers being analyzed are sent in batches of up to LLM_BATCH_SIZE
+    tickers (see LLMBatch); enough tickers are then analyzed at once to fill a batch.
+    """
+    max_workers = max_workers or MAX_TICKER_WORKERS
+    batch = None
+    if batch_llm_calls and LLM_BATCH_SIZE > 1 and len(tickers) > 1:
+        batch = LLMBatch(LLM_BATCH_SIZE, len(tickers))
+        max_workers = max(max_workers, LLM_BATCH_SIZE)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run_one(ticker: str) -> T:
+        async with semaphore:
+            with span(ticker, "ticker", ticker=ticker):
+                return await batched(batch, ticker, analyze)(ticker)
+
+    results = await asyncio.gather(*(run_one(ticker) for ticker in tickers), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+# Coroutine functions that release what the running event loop holds (e.g. pooled HTTP clients), see register_loop_cleanup
+_loop_cleanups: list[Callable[[], Awaitable[None]]] = []
+
+
+def register_loop_cleanup(cleanup: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Have run_sync await cleanup() before shutting down each event loop it starts.
+
+    For modules that keep per-loop resources, such as async HTTP clients,
+    which would otherwise outlive their loop. Usable as a decorator.
+    """
+    _loop_cleanups.append(cleanup)
+    return cleanup
+
+
+async def _run_and_clean_up(coroutine: Coroutine[Any, Any, T]) -> T:
+    try:
+        return await coroutine
+    finally:
+        for cleanup in _loop_cleanups:
+            try:
+                await cleanup()
+            except Exception as e:
+                print(f"Warning: event loop cleanup failed: {e}")
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code and return its result.
+
+    Uses a fresh event loop, on a helper thread if this thread is already
+    running one (e.g. a blocking call made from inside an async server handler).
+    The loop's pooled resources are released before it shuts down (see
+    register_loop_cleanup).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_run_and_clean_up(coroutine))
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-sync") as executor:
+        return executor.submit(asyncio.run, _run_and_clean_up(coroutine)).result()
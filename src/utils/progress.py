@@ -1,3 +1,5 @@
+import threading
+
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
@@ -17,6 +19,8 @@ class AgentProgress:
         self.live = Live(self.table, console=console, refresh_per_second=4)
         self.started = False
         self.update_handlers: List[Callable[[str, Optional[str], str], None]] = []
+        # Agents and their per-ticker workers report from several threads at once
+        self._lock = threading.RLock()
 
     def register_handler(self, handler: Callable[[str, Optional[str], str], None]):
         """Register a handler to be called when agent status updates."""
@@ -42,19 +46,20 @@ class AgentProgress:
 
     def update_status(self, agent_name: str, ticker: Optional[str] = None, status: str = ""):
         """Update the status of an agent."""
-        if agent_name not in self.agent_status:
-            self.agent_status[agent_name] = {"status": "", "ticker": None}
+        with self._lock:
+            if agent_name not in self.agent_status:
+                self.agent_status[agent_name] = {"status": "", "ticker": None}
 
-        if ticker:
-            self.agent_status[agent_name]["ticker"] = ticker
-        if status:
-            self.agent_status[agent_name]["status"] = status
+            if ticker:
+                self.agent_status[agent_name]["ticker"] = ticker
+            if status:
+                self.agent_status[agent_name]["status"] = status
 
-        # Notify all registered handlers
-        for handler in self.update_handlers:
-            handler(agent_name, ticker, status)
+            # Notify all registered handlers
+            for handler in self.update_handlers:
+                handler(agent_name, ticker, status)
 
-        self._refresh_display()
+            self._refresh_display()
 
     def get_all_status(self):
         """Get the current status of all agents as a dictionary."""
@@ -0,0 +1,102 @@
+"""Coalescing of concurrent duplicate calls"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Runs a function at most once at a time per key.
+
+    Callers that arrive while a call with the same key is in flight wait for it
+    and receive the same result (or exception) instead of running it again.
+    If wait_timeout is given, it is called for the number of seconds (or None
+    for no limit) a caller may wait for a call someone else is running, after
+    which the caller gets a TimeoutError; the call itself carries on.
+    """
+
+    def __init__(self, wait_timeout: Callable[[], float | None] | None = None):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._wait_timeout = wait_timeout or (lambda: None)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn(*args, **kwargs), or join an identical call that is already running."""
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result(timeout=self._wait_timeout())
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # Later callers start a fresh call (and will usually hit the cache)
+            with self._lock:
+                del self._calls[key]
+
+
+class _Flight:
+    """A shared call of AsyncSingleFlight: the task running it and how many callers await it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutine functions.
+
+    The call runs as its own task, which every caller awaits through a shield,
+    so a cancelled caller never cancels the call for the others; it is only
+    cancelled once no caller is left waiting for it. Calls are only shared
+    between tasks of the same event loop, since an asyncio task cannot be
+    awaited from another loop. wait_timeout bounds each caller's wait as it
+    does for SingleFlight.
+    """
+
+    def __init__(self, wait_timeout: Callable[[], float | None] | None = None):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Flight] = {}
+        self._wait_timeout = wait_timeout or (lambda: None)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs), or join an identical call already running on this event loop."""
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        with self._lock:
+            flight = self._calls.get(key)
+            if flight is None:
+                flight = self._calls[key] = _Flight(loop.create_task(fn(*args, **kwargs)))
+                flight.task.add_done_callback(functools.partial(self._finish, key, flight))
+            flight.waiters += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.task), timeout=self._wait_timeout())
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0 and not flight.task.done()
+            if abandoned:
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight, task: asyncio.Task):
+        # Later callers start a fresh call (and will usually hit the cache)
+        with self._lock:
+            if self._calls.get(key) is flight:
+                del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled before it
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,228 @@
+"""Timing spans for hedge fund runs: graph node → ticker → phase (fetch, llm)"""
+
+import contextlib
+import contextvars
+import dataclasses
+import datetime
+import functools
+import inspect
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Span kinds whose time counts as a phase of the enclosing node or ticker; the rest is compute
+PHASE_KINDS = ("fetch", "llm")
+
+# Numeric attributes summed into the node and ticker totals
+COUNTERS = ("http_requests", "llm_calls", "llm_calls_skipped", "input_tokens", "output_tokens")
+
+
+@dataclasses.dataclass
+class Span:
+    """A timed section of a run. Spans nest: run → node → ticker → fetch/llm."""
+
+    name: str
+    kind: str
+    start: float
+    node: str | None = None
+    ticker: str | None = None
+    end: float | None = None
+    attributes: dict = dataclasses.field(default_factory=dict)
+    children: list["Span"] = dataclasses.field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def totals(self) -> dict:
+        """Time spent fetching data, calling the LLM and computing, with call and token counts.
+
+        compute_ms is the time not covered by child spans, so it is approximate
+        where children overlap (e.g. the tickers of a node, which run concurrently).
+        """
+        totals = {"fetch_ms": 0.0, "llm_ms": 0.0, "compute_ms": 0.0, "fetch_cache_hits": 0}
+        totals.update({counter: 0 for counter in COUNTERS})
+        covered_ms = 0.0
+        for child in self.children:
+            covered_ms += child.duration_ms
+            if child.kind in PHASE_KINDS:
+                totals[f"{child.kind}_ms"] += child.duration_ms
+                totals["fetch_cache_hits"] += child.kind == "fetch" and not child.attributes.get("http_requests")
+                for counter in COUNTERS:
+                    totals[counter] += child.attributes.get(counter, 0)
+            else:
+                for key, value in child.totals().items():
+                    totals[key] += value
+        for counter in COUNTERS:
+            totals[counter] += self.attributes.get(counter, 0)
+        totals["compute_ms"] += max(0.0, self.duration_ms - covered_ms)
+        return {key: round(value, 3) if isinstance(value, float) else value for key, value in totals.items()}
+
+    def to_dict(self, origin: float) -> dict:
+        """The span and its children, with times in milliseconds since origin."""
+        result = {
+            "name": self.name,
+            "kind": self.kind,
+            "node": self.node,
+            "ticker": self.ticker,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": dict(self.attributes),
+        }
+        if self.kind == "fetch":
+            # Served without a request of its own, from the cache or a concurrent identical call
+            result["cache_hit"] = not self.attributes.get("http_requests")
+        if self.kind not in PHASE_KINDS:
+            result["totals"] = self.totals()
+        result["children"] = [child.to_dict(origin) for child in self.children]
+        return result
+
+
+class Tracer:
+    """Collects the spans of one run.
+
+    Spans are recorded by code running inside activate(), including the tasks
+    and threads it starts with a copy of its context. Handlers are called with
+    each span as it ends.
+    """
+
+    def __init__(self, name: str = "run"):
+        self.started_at = datetime.datetime.now().isoformat()
+        self.root = Span(name, "run", time.perf_counter())
+        self.handlers: list[Callable[[Span], None]] = []
+        # Spans of a run end on the event loop and on helper threads alike
+        self._lock = threading.Lock()
+
+    def register_handler(self, handler: Callable[[Span], None]):
+        """Register a handler to be called when a span ends."""
+        self.handlers.append(handler)
+        return handler
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Record the spans of the code run inside this block."""
+        token = _current.set((self, self.root))
+        try:
+            yield self
+        finally:
+            self.root.end = time.perf_counter()
+            _current.reset(token)
+
+    def to_dict(self) -> dict:
+        """The run's spans, with per-node totals, as JSON-serializable data."""
+        with self._lock:
+            nodes = [span for span in self.root.children if span.kind == "node"]
+            return {
+                "started_at": self.started_at,
+                "duration_ms": round(self.root.duration_ms, 3),
+                "nodes": {span.name: {"duration_ms": round(span.duration_ms, 3), **span.totals()} for span in nodes},
+                "spans": [span.to_dict(self.root.start) for span in self.root.children],
+            }
+
+    def _add(self, parent: Span, span: Span):
+        with self._lock:
+            parent.children.append(span)
+
+    def _finish(self, span: Span):
+        span.end = time.perf_counter()
+        for handler in self.handlers:
+            handler(span)
+
+
+# The tracer of the running code and its innermost open span
+_current: contextvars.ContextVar[tuple[Tracer, Span] | None] = contextvars.ContextVar("tracing_span", default=None)
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str, ticker: str | None = None, **attributes) -> Iterator[Span | None]:
+    """Time the code inside this block as a child of the current span.
+
+    Yields the new span, or None (and records nothing) when no tracer is active.
+    """
+    current = _current.get()
+    if current is None:
+        yield None
+        return
+
+    tracer, parent = current
+    new_span = Span(
+        name,
+        kind,
+        time.perf_counter(),
+        node=name if kind == "node" else parent.node,
+        ticker=ticker or parent.ticker,
+        attributes=attributes,
+    )
+    tracer._add(parent, new_span)
+    token = _current.set((tracer, new_span))
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        tracer._finish(new_span)
+
+
+def annotate(**attributes):
+    """Set attributes on the current span, if any."""
+    if (current := _current.get()) is not None:
+        current[1].attributes.update(attributes)
+
+
+def count(counter: str, amount: int = 1):
+    """Add to a counter attribute (e.g. http_requests) of the current span, if any."""
+    if (current := _current.get()) is not None:
+        tracer, current_span = current
+        with tracer._lock:
+            current_span.attributes[counter] = current_span.attributes.get(counter, 0) + amount
+
+
+def traced(kind: str):
+    """Decorator that records each call of a function, sync or async, as a span named after it."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(func.__name__, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(func.__name__, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_node(name: str, node: Callable):
+    """Wrap a graph node so that each run of it is recorded as a node span."""
+    # Not functools.wraps: LangGraph inspects the node's signature to decide what to pass it
+    if inspect.iscoroutinefunction(node):
+
+        async def run_async_node(state):
+            with span(name, "node"):
+                return await node(state)
+
+        return run_async_node
+
+    def run_node(state):
+        with span(name, "node"):
+            return node(state)
+
+    return run_node
+
+
+def save_trace(trace: dict, path: str | Path):
+    """Write a trace returned by Tracer.to_dict to a JSON file."""
+    Path(path).write_text(json.dumps(trace, indent=2))
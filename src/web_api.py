@@ -17,7 +17,12 @@ from src.config.trading_config import get_config, save_config, ConfigManager
 from src.brokers.factory import BrokerFactory
 from src.execution.trading_engine import TradingEngine, RiskLimits
 from src.risk_management.risk_monitor import RiskMonitor
-from src.main import run_hedge_fund
+from src.main import arun_hedge_fund
+from src.llm.limits import configure_llm_limits
+from src.utils.deadline import DEFAULT_RUN_TIMEOUT
+from src.data.cache import get_cache
+from src.data.signal_store import get_signal_store
+from src.data.llm_cache import get_llm_cache
 from src.websocket_manager import manager, RealTimeMonitor, handle_websocket_message, real_time_monitor
 from src.auth import AuthManager, get_current_user, get_current_user_optional, init_auth, get_login_info, ACCESS_TOKEN_EXPIRE_MINUTES
 from src.tools.economic_indicators import get_economic_indicators, get_market_condition
@@ -67,6 +72,14 @@ class SystemStatus(BaseModel):
     last_update: str
 
 
+def _apply_llm_limits(config):
+    """AI 설정의 LLM 동시 호출/요청 속도 제한 적용"""
+    configure_llm_limits(
+        max_concurrency=config.ai.max_concurrent_llm_calls,
+        requests_per_minute=config.ai.llm_requests_per_minute,
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 시작/종료 시 실행"""
@@ -74,6 +87,7 @@ async def lifespan(app: FastAPI):
     try:
         app_state["config"] = get_config()
         logger.info("설정 로드 완료")
+        _apply_llm_limits(app_state["config"])
         
         # 인증 시스템 초기화
         init_auth()
@@ -262,6 +276,12 @@ async def initialize_system(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=f"초기화 실패: {str(e)}")
 
 
+@app.get("/api/cache-stats")
+async def get_cache_stats(current_user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+    """금융 데이터 캐시 사용량 조회"""
+    return {**get_cache().get_stats(), "signals": get_signal_store().get_stats(), "llm": get_llm_cache().get_stats()}
+
+
 @app.get("/api/config")
 async def get_config_api():
     """현재 설정 조회"""
@@ -314,6 +334,8 @@ async def update_config(update: ConfigUpdate):
         # 저장
         save_config(config)
         app_state["config"] = config
+        if update.section == "ai":
+            _apply_llm_limits(config)
         
         return {"success": True, "message": "설정 업데이트 완료"}
         
@@ -356,7 +378,7 @@ async def run_analysis(request: TradingRequest):
         config = app_state["config"]
         
         # AI 분석 실행
-        result = run_hedge_fund(
+        result = await arun_hedge_fund(
             tickers=request.tickers,
             start_date=start_date,
             end_date=end_date,
@@ -364,7 +386,8 @@ async def run_analysis(request: TradingRequest):
             show_reasoning=config.ai.show_reasoning,
             selected_analysts=config.ai.selected_analysts or [],
             model_name=config.ai.model_name,
-            model_provider=config.ai.model_provider
+            model_provider=config.ai.model_provider,
+            timeout=config.ai.run_timeout or DEFAULT_RUN_TIMEOUT
         )
         
         # 결과 저장
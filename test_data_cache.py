@@ -0,0 +1,67 @@
+"""Tests for the in-memory financial data cache (src/data/cache.py)."""
+
+from src.data.cache import Cache
+from src.data.models import Price
+
+
+def _trade(name: str, shares: float, filing_date: str = "2024-03-01") -> dict:
+    return {
+        "ticker": "AAPL",
+        "issuer": "Apple Inc",
+        "name": name,
+        "title": None,
+        "is_board_director": None,
+        "transaction_date": filing_date,
+        "transaction_shares": shares,
+        "transaction_price_per_share": None,
+        "transaction_value": None,
+        "shares_owned_before_transaction": None,
+        "shares_owned_after_transaction": None,
+        "security_title": "Common Stock",
+        "filing_date": filing_date,
+    }
+
+
+def _news(title: str, date: str = "2024-03-01T14:00:00Z") -> dict:
+    return {"ticker": "AAPL", "title": title, "author": "", "source": "", "date": date, "url": f"https://example.com/{title}"}
+
+
+def test_refetched_day_adds_same_day_insider_trades():
+    cache = Cache()
+    cache.set_insider_trades("AAPL", [_trade("A", 100)])
+
+    # The day is fetched again once it has ended and now has more filings on it
+    cache.set_insider_trades("AAPL", [_trade("A", 100), _trade("B", 200), _trade("C", -50), _trade("D", 10, "2024-03-02")])
+
+    trades = cache.get_insider_trades("AAPL", "2024-03-01", "2024-03-02")
+    assert sorted(trade["name"] for trade in trades) == ["A", "B", "C", "D"]
+
+
+def test_refetched_day_adds_same_day_company_news():
+    cache = Cache()
+    cache.set_company_news("AAPL", [_news("first")])
+
+    cache.set_company_news("AAPL", [_news("first"), _news("second"), _news("third", "2024-03-01T21:30:00Z")])
+
+    news = cache.get_company_news("AAPL", "2024-03-01", "2024-03-01")
+    assert sorted(item["title"] for item in news) == ["first", "second", "third"]
+
+
+def _price(time: str, close: float) -> dict:
+    return {"open": close, "close": close, "high": close, "low": close, "volume": 100, "time": time}
+
+
+def test_validated_models_count_towards_the_budget_and_survive_updates():
+    cache = Cache()
+    cache.set_prices("AAPL", [_price(f"2024-01-{day:02d}", day) for day in range(2, 20)])
+    rows_bytes = cache.get_stats()["bytes"]
+
+    first = cache.get_prices("AAPL", model=Price)
+    assert cache.get_stats()["bytes"] > rows_bytes
+
+    # An incremental update keeps the models already validated, in date order
+    cache.set_prices("AAPL", [_price("2024-01-01", 1.0), _price("2024-01-20", 20.0)])
+    prices = cache.get_prices("AAPL", model=Price)
+    assert [price.close for price in prices] == [float(day) for day in range(1, 21)]
+    assert prices[1] is first[0]
+    assert cache.get_stats()["bytes"] == cache._datasets["prices"]["AAPL"].nbytes
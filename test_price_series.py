@@ -0,0 +1,34 @@
+"""Tests for the NumPy-backed price series (src/data/price_series.py)."""
+
+import pandas as pd
+
+from src.data.cache import Cache
+from src.data.price_series import PriceSeries
+
+
+def _bar(time: str, close: float) -> dict:
+    return {"open": close, "close": close, "high": close, "low": close, "volume": 100, "time": time}
+
+
+ROWS = [
+    _bar("2024-01-02T00:00:00-05:00", 1.0),
+    _bar("2024-01-02T21:00:00-05:00", 2.0),  # Already 2024-01-03 in UTC
+    _bar("2024-01-03T00:00:00-05:00", 3.0),
+]
+
+
+def test_index_keeps_offset_timestamps():
+    index = PriceSeries.from_rows(ROWS).index()
+    assert list(index) == [pd.Timestamp(row["time"]) for row in ROWS]
+    assert index[0].isoformat() == "2024-01-02T00:00:00-05:00"
+
+
+def test_between_splits_days_like_the_row_cache():
+    cache = Cache()
+    cache.set_prices("AAPL", ROWS)
+
+    series = cache.get_price_series("AAPL", "2024-01-02", "2024-01-02")
+    rows = cache.get_prices("AAPL", "2024-01-02", "2024-01-02")
+    assert list(series.close) == [row["close"] for row in rows] == [1.0, 2.0]
+
+    assert list(cache.get_price_series("AAPL", "2024-01-03").close) == [3.0]